@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import io
+import gzip
+import tarfile
+import tempfile
+import zipfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import generate_zip, generate_tar, generate_tgz, iter_chunks
+
+def read_members(file_type, data):
+    """List an archive with the standard library and read every member back"""
+    if file_type == 'zip':
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            if archive.testzip() is not None:
+                return None
+            return [(info.filename, len(archive.read(info))) for info in archive.infolist()]
+    if file_type == 'tgz':
+        data = gzip.decompress(data)
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:') as archive:
+        return [(member.name, len(archive.extractfile(member).read())) for member in archive.getmembers()]
+
+def test_archives():
+    """Test ZIP, TAR and tar.gz generation"""
+    print("Testing archive generation")
+    print("=" * 60)
+    
+    generators = {'zip': generate_zip, 'tar': generate_tar, 'tgz': generate_tgz}
+    
+    # Test 1: Archives are exactly the target size and readable by zipfile, tarfile and gzip
+    print("\n1. Testing exact sizes and member lists...")
+    ok = True
+    with tempfile.TemporaryDirectory() as out_dir:
+        for file_type, generator in generators.items():
+            for size_kb, members in ((10.3, 3), (2500, None), (1536, 1000)):
+                path = generator(os.path.join(out_dir, f"test.{file_type}"), size_kb, members=members, seed=1,
+                                 verbose=False)
+                with open(path, 'rb') as f:
+                    data = f.read()
+                listed = read_members(file_type, data)
+                expected_members = members or max(int(size_kb * 1024) // (1024 * 1024), 1)
+                exact = len(data) == int(size_kb * 1024)
+                valid = listed is not None and len(listed) == expected_members
+                print(f"  {file_type} {size_kb} KB, {expected_members} members: {len(data)} bytes, "
+                      f"{len(listed) if listed else 'unreadable'} listed")
+                ok = ok and exact and valid
+    print("✓ PASS" if ok else "✗ FAIL")
+    
+    # Test 2: Many members switch ZIP to ZIP64 records
+    print("\n2. Testing ZIP64...")
+    data = b"".join(iter_chunks('zip', 16 * 1024, members=70000, seed=2))
+    listed = read_members('zip', data)
+    print(f"  {len(data)} bytes, {len(listed) if listed else 0} members")
+    print("✓ PASS" if len(data) == 16 * 1024 * 1024 and listed and len(listed) == 70000 else "✗ FAIL")
+    
+    # Test 3: Seeded archives are reproducible and the stream matches the file
+    print("\n3. Testing reproducibility...")
+    ok = True
+    with tempfile.TemporaryDirectory() as out_dir:
+        for file_type, generator in generators.items():
+            path = generator(os.path.join(out_dir, f"seeded.{file_type}"), 300, members=7, seed='s',
+                             verbose=False)
+            with open(path, 'rb') as f:
+                written = f.read()
+            ok = ok and written == b"".join(iter_chunks(file_type, 300, members=7, seed='s'))
+    print("✓ PASS" if ok else "✗ FAIL")
+    
+    # Test 4: Too many members are reduced to what fits; bad counts are rejected
+    print("\n4. Testing member limits...")
+    data = b"".join(iter_chunks('tar', 100, members=1000))
+    listed = read_members('tar', data)
+    errors = 0
+    for members in (0, 2.5, '3'):
+        try:
+            b"".join(iter_chunks('zip', 10, members=members))
+        except ValueError:
+            errors += 1
+    print(f"  100 KB TAR holds {len(listed)} members; {errors} invalid counts rejected")
+    print("✓ PASS" if len(data) == 100 * 1024 and len(listed) == 198 and errors == 3 else "✗ FAIL")
+    
+    # Test 5: Targets too small for a member give empty archives, exact down to the end blocks
+    print("\n5. Testing the smallest TAR and TAR.GZ...")
+    ok = True
+    for file_type, cases in (('tar', ((700, 1024, 0), (1024, 1024, 0), (1535, 1535, 0), (1536, 1536, 1))),
+                             ('tgz', ((1000, 1047, 0), (1047, 1047, 0), (1558, 1558, 0), (1559, 1559, 1)))):
+        for target, expected_bytes, expected_members in cases:
+            data = b"".join(iter_chunks(file_type, target / 1024, seed=3))
+            listed = read_members(file_type, data)
+            print(f"  {file_type} {target} B: {len(data)} bytes, {len(listed)} members")
+            ok = ok and len(data) == expected_bytes and len(listed) == expected_members
+    print("✓ PASS" if ok else "✗ FAIL")
+    
+    print("\nArchive Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_archives()
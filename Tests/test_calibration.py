@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import calibration
+from file_generators import document_generator
+from file_generators.document_generator import generate_docx, DOCX_SIZE_TOLERANCE
+
+def test_calibration():
+    """Test the per-format size-calibration store"""
+    print("Testing size calibration")
+    print("=" * 60)
+    
+    previous_cache_dir = os.environ.get("FILEGEN_CACHE_DIR")
+    original_render = document_generator._render_docx
+    renders = []
+    
+    def counting_render(doc):
+        renders.append(1)
+        return original_render(doc)
+    
+    with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as out_dir:
+        os.environ["FILEGEN_CACHE_DIR"] = cache_dir
+        calibration.clear_models()
+        
+        # Test 1: Samples build a model that predicts the unit count
+        print("\n1. Testing model updates...")
+        calibration.record_sample("test-format", "1.0", 100, 1000, 2100)
+        model = calibration.record_sample("test-format", "1.0", 100, 2000, 4100)
+        units = calibration.predict_units(model, 100 + 2 * 5000)
+        print(f"Model: {model}, predicted units: {units}")
+        print("✓ PASS" if model['samples'] == 2 and units == 5000 else "✗ FAIL")
+        
+        # Test 2: Models are persisted per version
+        print("\n2. Testing on-disk persistence...")
+        calibration.clear_models()
+        reloaded = calibration.get_model("test-format", "1.0")
+        other_version = calibration.get_model("test-format", "2.0")
+        if not calibration.PERSIST_MODELS:
+            print("Persistence disabled by FILEGEN_CALIBRATION_CACHE=0, skipping")
+        else:
+            print("✓ PASS" if reloaded == model and other_version is None else "✗ FAIL")
+        
+        # Test 3: With a stored model a DOCX needs fewer renders
+        print("\n3. Testing DOCX renders with and without a model...")
+        document_generator._render_docx = counting_render
+        try:
+            counts = []
+            for name, size_kb in (("cold.docx", 300), ("warm.docx", 700)):
+                calibration.clear_models()
+                renders.clear()
+                path = generate_docx(os.path.join(out_dir, name), size_kb, verbose=False)
+                error = abs(os.path.getsize(path) - size_kb * 1024) / (size_kb * 1024)
+                counts.append((len(renders), error))
+            print(f"Renders and size error (cold, warm): {counts}")
+            if not calibration.PERSIST_MODELS:
+                print("Persistence disabled by FILEGEN_CALIBRATION_CACHE=0, skipping")
+            else:
+                (cold, cold_error), (warm, warm_error) = counts
+                ok = warm < cold and max(cold_error, warm_error) <= DOCX_SIZE_TOLERANCE
+                print("✓ PASS" if ok else "✗ FAIL")
+        except Exception as e:
+            print(f"✗ FAIL - Exception occurred: {e}")
+        finally:
+            document_generator._render_docx = original_render
+    
+    calibration.clear_models()
+    if previous_cache_dir is None:
+        os.environ.pop("FILEGEN_CACHE_DIR", None)
+    else:
+        os.environ["FILEGEN_CACHE_DIR"] = previous_cache_dir
+    
+    print("\nCalibration Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_calibration()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import subprocess
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import cli
+from utils import parse_size
+
+def test_cli():
+    """Test the non-interactive batch interface"""
+    print("Testing batch CLI")
+    print("=" * 60)
+    
+    # Test 1: Size parsing
+    print("\n1. Testing parse_size...")
+    cases = {"5MB": 5120, "1.5 GB": 1572864, "500kb": 500, "1024": 1024, "512B": 0.5}
+    results = {text: parse_size(text) for text in cases}
+    print(f"Parsed: {results}")
+    print("✓ PASS" if results == cases else "✗ FAIL")
+    
+    try:
+        parse_size("5XB")
+        print("✗ FAIL - Invalid unit accepted")
+    except ValueError:
+        print("✓ PASS - Invalid unit rejected")
+    
+    # Test 2: Batch generation into an output folder
+    print("\n2. Testing 'generate' subcommand...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        exit_code = cli.main(["generate", "--type", "png", "--size", "4KB", "--count", "25", "--out", out_dir])
+        files = sorted(os.listdir(out_dir))
+        sizes = {os.path.getsize(os.path.join(out_dir, name)) for name in files}
+        print(f"Exit code: {exit_code}, files: {len(files)}, sizes: {sizes}")
+        if exit_code == 0 and len(files) == 25 and sizes == {4096} and files[0] == "file_00000.png":
+            print("✓ PASS")
+        else:
+            print("✗ FAIL")
+    
+    # Test 3: Batch runs never load the menu library
+    print("\n3. Testing that batch mode skips the menu import...")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as out_dir:
+        script = ("import sys, cli; cli.main(['generate', '--type', 'txt', '--size', '1', '--out', sys.argv[1]]); "
+                  "print('consolemenu' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", script, out_dir], cwd=root, capture_output=True, text=True)
+    loaded = result.stdout.strip().splitlines()[-1:] == ["True"]
+    print("✓ PASS" if result.returncode == 0 and not loaded else "✗ FAIL - consolemenu was imported")
+    
+    # Test 4: Bad counts and name patterns that repeat are usage errors
+    print("\n4. Testing argument validation...")
+    rejected = 0
+    with tempfile.TemporaryDirectory() as out_dir:
+        base = ["generate", "--type", "txt", "--size", "1KB", "--out", out_dir]
+        for extra in (["--count", "0"], ["--count", "-2"], ["--workers", "0"], ["--count", "3", "--name", "same.txt"],
+                      ["--count", "12", "--name", "f{index!s:.1}.txt"]):
+            try:
+                cli.main(base + extra)
+            except SystemExit as e:
+                rejected += e.code == 2
+        written = os.listdir(out_dir)
+    print(f"Rejected {rejected} of 5, files written: {len(written)}")
+    print("✓ PASS" if rejected == 5 and not written else "✗ FAIL")
+    
+    print("\nCLI Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_cli()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import io
+import zlib
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import iter_random_bytes, iter_random_text, get_random_source, SVG_SAFE_ALPHABET
+from file_generators import iter_txt, iter_svg, iter_png, generate_jpg, write_to
+
+def gzip_ratio(data):
+    """Original size divided by the size zlib level 6 (gzip's default) compresses it to"""
+    return len(data) / len(zlib.compress(data, 6))
+
+def test_compressibility():
+    """Test the compression-ratio knob of the byte and text sources"""
+    print("Testing compressible random data")
+    print("=" * 60)
+    
+    size_bytes = 2 * 1024 * 1024
+    
+    # Test 1: Byte and text sources land close to the requested ratio
+    print("\n1. Testing achieved ratios...")
+    ok = True
+    for ratio in (1.5, 2, 4, 10, 50):
+        data = b"".join(iter_random_bytes(size_bytes, source=get_random_source(1), compress_ratio=ratio))
+        text = b"".join(iter_random_text(size_bytes, SVG_SAFE_ALPHABET, source=get_random_source(1),
+                                         compress_ratio=ratio))
+        byte_ratio, text_ratio = gzip_ratio(data), gzip_ratio(text)
+        print(f"  target {ratio:>4}: bytes {byte_ratio:.2f}, text {text_ratio:.2f}")
+        ok = (ok and len(data) == len(text) == size_bytes and abs(byte_ratio / ratio - 1) < 0.05
+              and abs(text_ratio / ratio - 1) < 0.05 and set(text) <= set(SVG_SAFE_ALPHABET.encode('ascii')))
+    # Ratios below what the plain text reaches give plain random text
+    for ratio in (1, 1.1):
+        text = b"".join(iter_random_text(size_bytes, SVG_SAFE_ALPHABET, source=get_random_source(1),
+                                         compress_ratio=ratio))
+        print(f"  target {ratio:>4}: text {gzip_ratio(text):.2f}")
+        ok = (ok and len(text) == size_bytes and gzip_ratio(text) < 1.5
+              and set(text) <= set(SVG_SAFE_ALPHABET.encode('ascii')))
+    print("✓ PASS" if ok else "✗ FAIL")
+    
+    # Test 2: Generators keep their exact sizes and formats
+    print("\n2. Testing TXT, SVG and image padding...")
+    txt = b"".join(iter_txt(1024, seed=3, compress_ratio=4))
+    svg = b"".join(iter_svg(1024, seed=3, compress_ratio=4))
+    png = b"".join(iter_png(1024, seed=3, compress_ratio=4))
+    for name, data in (("TXT", txt), ("SVG", svg), ("PNG", png)):
+        print(f"  {name}: {len(data)} bytes, ratio {gzip_ratio(data):.2f}")
+    ok = (all(len(data) == 1024 * 1024 and abs(gzip_ratio(data) / 4 - 1) < 0.05 for data in (txt, svg, png))
+          and svg.endswith(b"</svg>") and png.startswith(b"\x89PNG") and png.endswith(b"IEND\xaeB`\x82"))
+    print("✓ PASS" if ok else "✗ FAIL")
+    
+    # Test 3: Seeded files are reproducible and the file writer gives the same bytes
+    print("\n3. Testing reproducibility...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        path = generate_jpg(os.path.join(out_dir, "compressible.jpg"), 300, seed=5, compress_ratio=8,
+                            padding='append', verbose=False)
+        with open(path, 'rb') as f:
+            written = f.read()
+    buffer = io.BytesIO()
+    write_to(buffer, 'jpg', 300, seed=5, compress_ratio=8, padding='append')
+    print("✓ PASS" if written == buffer.getvalue() and len(written) == 300 * 1024 else "✗ FAIL")
+    
+    # Test 4: Invalid ratios and zero fills are rejected
+    print("\n4. Testing invalid requests...")
+    errors = 0
+    for options in ({'compress_ratio': 0.5}, {'compress_ratio': 'high'}, {'compress_ratio': 2, 'fill': 'sparse'}):
+        try:
+            with tempfile.TemporaryDirectory() as out_dir:
+                generate_jpg(os.path.join(out_dir, "bad.jpg"), 10, verbose=False, **options)
+        except ValueError as e:
+            print(f"  {options}: {e}")
+            errors += 1
+    print("✓ PASS" if errors == 3 else "✗ FAIL")
+    
+    print("\nCompressibility Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_compressibility()
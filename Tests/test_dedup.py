@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import hashlib
+import tarfile
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+from file_generators.dedup import generate_copies, clone_file
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def test_dedup():
+    """Test clone-based duplication and per-copy patching"""
+    print("Testing clone-based duplication")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as out_dir:
+        # Test 1: Unpatched copies are identical to the canonical file
+        print("\n1. Testing plain copies...")
+        paths = [os.path.join(out_dir, f"plain_{i}.txt") for i in range(5)]
+        results = generate_copies('txt', paths, 64)
+        digests = {file_digest(path) for path, _ in results}
+        print(f"Methods: {[how for _, how in results]}")
+        print("✓ PASS" if len(results) == 5 and len(digests) == 1 else "✗ FAIL")
+        
+        # Test 2: Patched copies differ and stay valid and exactly sized
+        print("\n2. Testing patched copies...")
+        for file_type, padding in (('png', 'embedded'), ('png', 'append'), ('jpg', 'embedded'),
+                                   ('pdf', None), ('svg', None), ('txt', None)):
+            paths = [os.path.join(out_dir, f"patched_{padding}_{i}.{file_type}") for i in range(4)]
+            options = {'padding': padding} if padding else {}
+            results = generate_copies(file_type, paths, 40, patch=True, **options)
+            distinct = len({file_digest(path) for path, _ in results}) == 4
+            sized = all(os.path.getsize(path) == 40 * 1024 for path, _ in results)
+            valid = True
+            if file_type in ('png', 'jpg'):
+                try:
+                    for path, _ in results:
+                        Image.open(path).verify()
+                except Exception:
+                    valid = False
+            print(f"{file_type} {padding or ''}: {'✓ PASS' if distinct and sized and valid else '✗ FAIL'}")
+        
+        # Test 3: Hardlinks share one inode
+        print("\n3. Testing hardlinks...")
+        paths = [os.path.join(out_dir, f"link_{i}.svg") for i in range(3)]
+        results = generate_copies('svg', paths, 8, method='hardlink')
+        print("✓ PASS" if os.stat(results[0][0]).st_nlink == 3 else "✗ FAIL")
+        
+        # Test 4: Replacing an existing file with a clone
+        print("\n4. Testing clone over an existing file...")
+        clone_file(results[0][0], paths[1] + ".copy", 'copy')
+        how = clone_file(paths[0], paths[1] + ".copy", 'auto')
+        print(f"Method: {how}")
+        print("✓ PASS" if file_digest(paths[1] + ".copy") == file_digest(paths[0]) else "✗ FAIL")
+        
+        # Test 5: Impossible combinations are rejected
+        print("\n5. Testing rejected combinations...")
+        rejected = 0
+        for file_type, method in (('docx', 'auto'), ('txt', 'hardlink')):
+            try:
+                generate_copies(file_type, [os.path.join(out_dir, "x"), os.path.join(out_dir, "y")], 8,
+                                method=method, patch=True)
+            except ValueError:
+                rejected += 1
+        print("✓ PASS" if rejected == 2 else "✗ FAIL")
+    
+        # Test 6: An SVG without room for the stamp in a padding comment is copied unpatched
+        print("\n6. Testing patched copies of tiny SVGs...")
+        ok = True
+        # Whitespace padding only, a comment body of 4 bytes, and one of 8
+        for size_bytes, expected in ((190, False), (197, False), (201, True)):
+            paths = [os.path.join(out_dir, f"tiny_{size_bytes}_{i}.svg") for i in range(3)]
+            results = generate_copies('svg', paths, size_bytes / 1024, patch=True)
+            contents = []
+            for path, _ in results:
+                with open(path, 'rb') as f:
+                    contents.append(f.read())
+            patched = len(set(contents)) == 3
+            valid = all(len(data) == size_bytes and data.endswith(b"-->\n</svg>" if b"<!--" in data else b" </svg>")
+                        for data in contents)
+            print(f"  {size_bytes} B: {'patched' if patched else 'unpatched'}, valid: {valid}")
+            ok = ok and valid and patched == expected
+        print("✓ PASS" if ok else "✗ FAIL")
+    
+        # Test 7: A TAR too small for a member is copied unpatched
+        print("\n7. Testing patched copies of tiny TARs...")
+        ok = True
+        for size_bytes, expected in ((1024, False), (1536, False), (2048, True)):
+            paths = [os.path.join(out_dir, f"tiny_{size_bytes}_{i}.tar") for i in range(3)]
+            results = generate_copies('tar', paths, size_bytes / 1024, patch=True)
+            patched = len({file_digest(path) for path, _ in results}) == 3
+            valid = True
+            try:
+                for path, _ in results:
+                    with tarfile.open(path) as archive:
+                        archive.getmembers()
+            except tarfile.TarError:
+                valid = False
+            sized = all(os.path.getsize(path) == size_bytes for path, _ in results)
+            print(f"  {size_bytes} B: {'patched' if patched else 'unpatched'}, valid: {valid and sized}")
+            ok = ok and valid and sized and patched == expected
+        print("✓ PASS" if ok else "✗ FAIL")
+    
+    print("\nDeduplication Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_dedup()
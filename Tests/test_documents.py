@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import zipfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators.document_generator import generate_pdf, generate_docx, DOCX_SIZE_TOLERANCE
+from docx import Document
+
+def test_documents():
+    """Test size targeting of the document generators"""
+    print("Testing document size targeting")
+    print("=" * 60)
+    
+    generated_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generated")
+    
+    # Test 1: DOCX lands within the stated tolerance
+    print("\n1. Testing DOCX size convergence...")
+    for size_kb in (150, 2048):
+        docx_filename = f"test_converge_{size_kb}.docx"
+        
+        try:
+            generate_docx(docx_filename, size_kb)
+            docx_path = os.path.join(generated_folder, docx_filename)
+            file_size = os.path.getsize(docx_path)
+            expected_bytes = size_kb * 1024
+            deviation = abs(file_size - expected_bytes) / expected_bytes
+            print(f"Expected: {expected_bytes} bytes, Actual: {file_size} bytes ({deviation * 100:.3f}%)")
+            print("✓ PASS - Within tolerance" if deviation <= DOCX_SIZE_TOLERANCE else "✗ FAIL - Outside tolerance")
+            
+            # The result must still be a readable document
+            if zipfile.is_zipfile(docx_path) and len(Document(docx_path).paragraphs) > 1:
+                print("✓ PASS - DOCX opens with python-docx")
+            else:
+                print("✗ FAIL - DOCX could not be read back")
+            os.remove(docx_path)
+        except Exception as e:
+            print(f"✗ FAIL - Exception occurred during DOCX generation: {e}")
+    
+    # Test 2: PDF hits the exact size and keeps a consistent cross-reference table
+    print("\n2. Testing exact-size PDF generation...")
+    for size_kb in (1, 10, 4096):
+        pdf_filename = f"test_exact_{size_kb}.pdf"
+        
+        try:
+            generate_pdf(pdf_filename, size_kb)
+            pdf_path = os.path.join(generated_folder, pdf_filename)
+            file_size = os.path.getsize(pdf_path)
+            print(f"Expected: {size_kb * 1024} bytes, Actual: {file_size} bytes")
+            print("✓ PASS - Exact size" if file_size == size_kb * 1024 else "✗ FAIL - Size mismatch")
+            
+            # startxref must point at the xref table
+            with open(pdf_path, 'rb') as f:
+                header = f.read(8)
+                f.seek(-64, os.SEEK_END)
+                tail = f.read()
+                xref_offset = int(tail.split(b"startxref")[1].split()[0])
+                f.seek(xref_offset)
+                xref = f.read(4)
+            if header.startswith(b'%PDF-1.') and xref == b'xref' and tail.endswith(b'%%EOF\n'):
+                print("✓ PASS - Valid PDF structure")
+            else:
+                print("✗ FAIL - Broken PDF structure")
+            os.remove(pdf_path)
+        except Exception as e:
+            print(f"✗ FAIL - Exception occurred during PDF generation: {e}")
+    
+    print("\nDocument Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_documents()
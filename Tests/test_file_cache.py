@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import file_cache
+from file_generators.scheduler import make_job, run_jobs
+
+def test_file_cache():
+    """Test the content-addressable cache of generated files"""
+    print("Testing the generated-file cache")
+    print("=" * 60)
+    
+    previous = {name: os.environ.get(name) for name in
+                ("FILEGEN_CACHE_DIR", "FILEGEN_FILE_CACHE", "FILEGEN_FILE_CACHE_BUDGET")}
+    
+    with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as out_dir:
+        os.environ["FILEGEN_CACHE_DIR"] = cache_dir
+        file_cache.configure('auto', '1MB')
+        
+        # Test 1: The second request for a seeded file is a hit with the same bytes
+        print("\n1. Testing hits and misses...")
+        first_path, first = file_cache.generate_cached('pdf', os.path.join(out_dir, "a.pdf"), 200, seed=9,
+                                                       verbose=False)
+        second_path, second = file_cache.generate_cached('pdf', os.path.join(out_dir, "b.pdf"), 200, seed='9',
+                                                         verbose=False)
+        with open(first_path, 'rb') as f1, open(second_path, 'rb') as f2:
+            same = f1.read() == f2.read()
+        print(f"  outcomes: {first}, {second}; identical: {same}")
+        print("✓ PASS" if (first, second) == ('miss', 'hit') and same else "✗ FAIL")
+        
+        # Test 2: Unseeded and zero-filled files are never cached
+        print("\n2. Testing uncacheable requests...")
+        outcomes = [file_cache.generate_cached('txt', os.path.join(out_dir, "c.txt"), 10, verbose=False)[1],
+                    file_cache.generate_cached('txt', os.path.join(out_dir, "d.txt"), 10, seed=1, fill='sparse',
+                                               verbose=False)[1]]
+        print("✓ PASS" if outcomes == ['bypassed', 'bypassed'] else "✗ FAIL")
+        
+        # Test 3: The least recently used file is evicted beyond the budget
+        print("\n3. Testing LRU eviction...")
+        for seed in (1, 2, 3):
+            file_cache.generate_cached('txt', os.path.join(out_dir, f"lru_{seed}.txt"), 300, seed=seed,
+                                       verbose=False)
+            time.sleep(0.01)
+        # Using seed 1 again makes seed 2 the oldest
+        file_cache.generate_cached('txt', os.path.join(out_dir, "lru_again.txt"), 300, seed=1, verbose=False)
+        outcome = file_cache.generate_cached('txt', os.path.join(out_dir, "lru_4.txt"), 300, seed=4,
+                                             verbose=False)[1]
+        kept = [file_cache.generate_cached('txt', os.path.join(out_dir, "probe.txt"), 300, seed=seed,
+                                           verbose=False)[1] for seed in (1, 2)]
+        stats = file_cache.stats()
+        print(f"  after eviction: seed 1 {kept[0]}, seed 2 {kept[1]}; {stats['entries']} files, "
+              f"{stats['size_bytes']} of {stats['budget_bytes']} bytes")
+        print("✓ PASS" if outcome == 'miss' and kept == ['hit', 'miss'] and stats['size_bytes'] <= 1024 * 1024
+              else "✗ FAIL")
+        
+        # Test 4: Batch jobs go through the cache, and counters add up
+        print("\n4. Testing scheduled jobs and statistics...")
+        file_cache.clear()
+        jobs = [make_job('docx', os.path.join(out_dir, f"doc_{index}.docx"), 100, seed=5) for index in range(3)]
+        results = run_jobs(jobs, processes=1, threads=1)
+        stats = file_cache.stats()
+        print(f"  hits {stats['hits']}, misses {stats['misses']}, hit rate {stats['hit_rate']:.0%}")
+        print("✓ PASS" if all(r.error is None for r in results) and (stats['hits'], stats['misses']) == (2, 1)
+              else "✗ FAIL")
+    
+        # Test 5: Rewriting a hardlinked output leaves the cache file alone
+        print("\n5. Testing hardlinked outputs...")
+        file_cache.configure('hardlink', '10MB')
+        file_cache.clear()
+        path = os.path.join(out_dir, "linked.txt")
+        outcomes = [file_cache.generate_cached('txt', path, size_kb, seed=1, verbose=False)[1]
+                    for size_kb in (1024, 2048, 1024)]
+        size = os.path.getsize(path)
+        # A cache file damaged some other way is dropped on its next use
+        with open(path, 'ab') as f:
+            f.write(b"x")
+        damaged = file_cache.generate_cached('txt', os.path.join(out_dir, "again.txt"), 1024, seed=1,
+                                             verbose=False)[1]
+        print(f"  outcomes: {outcomes}, final size {size}; after damage: {damaged}")
+        print("✓ PASS" if outcomes == ['miss', 'miss', 'hit'] and size == 1024 * 1024 and damaged == 'miss'
+              else "✗ FAIL")
+    
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    
+    print("\nFile Cache Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_file_cache()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import header_cache
+from file_generators.image_generator import generate_png
+from PIL import Image
+
+def test_header_cache():
+    """Test the process-wide header template cache"""
+    print("Testing header template cache")
+    print("=" * 60)
+    
+    calls = []
+    
+    def builder(size=1):
+        calls.append(size)
+        return b"T" * size
+    
+    header_cache.register_template("test-format", builder, version=lambda: "1.0")
+    previous_cache_dir = os.environ.get("FILEGEN_CACHE_DIR")
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["FILEGEN_CACHE_DIR"] = cache_dir
+        
+        # Test 1: Templates are built once per format and options
+        print("\n1. Testing in-memory caching...")
+        first = header_cache.get_template("test-format", size=4)
+        second = header_cache.get_template("test-format", size=4)
+        other = header_cache.get_template("test-format", size=8)
+        print(f"Builder calls: {calls}")
+        print("✓ PASS" if first is second and other == b"T" * 8 and calls == [4, 8] else "✗ FAIL")
+        
+        # Test 2: A fresh process state reads the persisted template
+        print("\n2. Testing on-disk persistence...")
+        header_cache.clear_templates()
+        reloaded = header_cache.get_template("test-format", size=4)
+        if not header_cache.PERSIST_TEMPLATES:
+            print("Persistence disabled by FILEGEN_TEMPLATE_CACHE=0, skipping")
+        else:
+            print(f"Builder calls: {calls}")
+            print("✓ PASS" if reloaded == first and calls == [4, 8] else "✗ FAIL")
+        
+        # Test 3: Empty or truncated persisted templates are rebuilt
+        print("\n3. Testing damaged persisted templates...")
+        if not header_cache.PERSIST_TEMPLATES:
+            print("Persistence disabled by FILEGEN_TEMPLATE_CACHE=0, skipping")
+        else:
+            ok = True
+            for keep in (0, 10, -1):
+                folder = os.path.join(cache_dir, "templates")
+                for name in os.listdir(folder):
+                    path = os.path.join(folder, name)
+                    with open(path, 'r+b') as f:
+                        f.truncate(os.path.getsize(path) + keep if keep < 0 else keep)
+                header_cache.clear_templates()
+                del calls[:]
+                rebuilt = header_cache.get_template("test-format", size=4)
+                ok = ok and rebuilt == first and calls == [4]
+            # The rebuilt template was written again and is read back
+            header_cache.clear_templates()
+            del calls[:]
+            ok = ok and header_cache.get_template("test-format", size=4) == first and calls == []
+            print("✓ PASS" if ok else "✗ FAIL")
+        
+        # Test 4: Cached PNG header still produces a readable image
+        print("\n4. Testing PNG generation from the cached header...")
+        generated_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generated")
+        try:
+            generate_png("test_cached.png", 2)
+            png_path = os.path.join(generated_folder, "test_cached.png")
+            with Image.open(png_path) as img:
+                print(f"  Image format: {img.format}, size: {img.size}")
+                print("✓ PASS" if img.format == "PNG" else "✗ FAIL")
+            os.remove(png_path)
+        except Exception as e:
+            print(f"✗ FAIL - Exception occurred: {e}")
+    
+    header_cache.clear_templates()
+    if previous_cache_dir is None:
+        os.environ.pop("FILEGEN_CACHE_DIR", None)
+    else:
+        os.environ["FILEGEN_CACHE_DIR"] = previous_cache_dir
+    
+    print("\nHeader Cache Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_header_cache()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import io
+import hashlib
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import image_generator, write_to
+from file_generators.image_generator import generate_png, generate_jpg, _synthesize_pixels
+from utils import get_random_source
+from PIL import Image
+
+def test_image_pixels():
+    """Test real-pixel PNG and JPG images sized to the target"""
+    print("Testing real-pixel images")
+    print("=" * 60)
+    
+    try:
+        import numpy as np
+    except ImportError:
+        print("NumPy is not installed, skipping")
+        return
+    
+    with tempfile.TemporaryDirectory() as out_dir:
+        # Test 1: Exact size and a decodable image larger than the 1x1 template
+        print("\n1. Testing size and decoding...")
+        ok = True
+        for generator, extension in ((generate_png, "png"), (generate_jpg, "jpg")):
+            for size_kb in (2, 64, 3000):
+                path = generator(os.path.join(out_dir, f"pixels_{size_kb}.{extension}"), size_kb,
+                                 padding='pixels', verbose=False)
+                with Image.open(path) as img:
+                    img.load()
+                    width, height = img.size
+                    pixels = width * height
+                exact = os.path.getsize(path) == size_kb * 1024
+                print(f"  {extension.upper()} {size_kb} KB: {width}x{height}, exact size: {exact}")
+                ok = ok and exact and pixels > 1 and img.format in ("PNG", "JPEG")
+        print("✓ PASS" if ok else "✗ FAIL")
+        
+        # Test 2: Seeded pixel images are reproducible
+        print("\n2. Testing seeded pixel images...")
+        digests = []
+        for name, seed in (("a", 5), ("b", 5), ("c", 6)):
+            path = generate_jpg(os.path.join(out_dir, f"seeded_{name}.jpg"), 200, padding='pixels', seed=seed,
+                                verbose=False)
+            with open(path, 'rb') as f:
+                digests.append(hashlib.sha256(f.read()).hexdigest())
+        print("✓ PASS" if digests[0] == digests[1] != digests[2] else "✗ FAIL")
+        
+        # Test 3: Zero fills cannot carry pixels
+        print("\n3. Testing fill modes...")
+        try:
+            generate_png(os.path.join(out_dir, "sparse.png"), 64, padding='pixels', fill='sparse', verbose=False)
+            print("✗ FAIL - Sparse fill accepted")
+        except ValueError:
+            print("✓ PASS")
+    
+    # Test 4: Synthesis is vectorized; 12 megapixels in well under a second
+    print("\n4. Testing synthesis speed...")
+    pixels = np.empty((3000, 4000, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    _synthesize_pixels(pixels, get_random_source(1))
+    elapsed = time.perf_counter() - start
+    print(f"  12 MP in {elapsed:.3f} s, channel means {pixels.reshape(-1, 3).mean(axis=0).round(1)}")
+    print("✓ PASS" if elapsed < 1.0 and pixels.std() > 10 else "✗ FAIL")
+    
+    # Test 5: With the pixel count capped, JPEG quality rises to fill the target
+    print("\n5. Testing JPEG quality at the pixel cap...")
+    
+    def jpeg_quality(data):
+        """Find the quality whose quantization tables the JPEG uses"""
+        tables = Image.open(io.BytesIO(data)).quantization
+        for quality in range(1, 101):
+            probe = io.BytesIO()
+            Image.new('RGB', (8, 8)).save(probe, format='JPEG', quality=quality)
+            if Image.open(io.BytesIO(probe.getvalue())).quantization == tables:
+                return quality
+        return None
+    
+    max_pixels = image_generator.PIXEL_MAX_PIXELS
+    image_generator.PIXEL_MAX_PIXELS = 100_000
+    try:
+        qualities = []
+        ok = True
+        for size_kb in (30, 60, 200):
+            buffer = io.BytesIO()
+            write_to(buffer, 'jpg', size_kb, seed=1, padding='pixels')
+            qualities.append(jpeg_quality(buffer.getvalue()))
+            ok = ok and len(buffer.getvalue()) == size_kb * 1024
+    finally:
+        image_generator.PIXEL_MAX_PIXELS = max_pixels
+    print(f"  qualities at 30, 60 and 200 KB: {qualities}")
+    print("✓ PASS" if ok and qualities[0] == image_generator.JPEG_PIXEL_QUALITY
+          and qualities[0] < qualities[1] < qualities[2] == image_generator.JPEG_PIXEL_MAX_QUALITY else "✗ FAIL")
+    
+    print("\nReal-Pixel Image Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_image_pixels()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import io
+import json
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import instrument, GENERATORS
+from file_generators.scheduler import make_job, run_jobs
+
+def test_instrument():
+    """Test per-file phase timers and batch reports"""
+    print("Testing instrumentation hooks")
+    print("=" * 60)
+    
+    previous = (os.environ.get("FILEGEN_PROFILE"), os.environ.get("FILEGEN_PROFILE_OUT"))
+    
+    # Test 1: Hooks are no-ops while profiling is off
+    print("\n1. Testing disabled hooks...")
+    instrument.configure('0')
+    raw = io.BytesIO()
+    chunks = [b"a", b"b"]
+    ok = (not instrument.enabled() and instrument.timed_file(raw) is raw
+          and instrument.timed_chunks(chunks) is chunks)
+    with instrument.file_record('txt', 'x.txt') as record:
+        ok = ok and record is None
+    print("✓ PASS" if ok else "✗ FAIL")
+    
+    # Test 2: Invalid specs are rejected
+    print("\n2. Testing spec parsing...")
+    try:
+        instrument.parse_spec('summary,bogus')
+        print("✗ FAIL - Unknown option accepted")
+    except ValueError:
+        print("✓ PASS" if instrument.parse_spec('cprofile') == {'cprofile', 'summary'} else "✗ FAIL")
+    
+    with tempfile.TemporaryDirectory() as out_dir:
+        json_path = os.path.join(out_dir, "profile.jsonl")
+        instrument.configure('summary,json,tracemalloc', json_path)
+        
+        # Test 3: Each file gets a JSON line with phases and written bytes
+        print("\n3. Testing per-file records...")
+        jobs = [make_job('txt', os.path.join(out_dir, "a.txt"), 300),
+                make_job('pdf', os.path.join(out_dir, "b.pdf"), 40),
+                make_job('png', os.path.join(out_dir, "c.png"), 20, padding='append')]
+        results = run_jobs(jobs, processes=1, threads=1)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        ok = len(records) == 3 and all(result.error is None for result in results)
+        for record, result in zip(records, results):
+            print(f"  {record['type']}: {record['phases']}")
+            ok = ok and record['bytes_written'] == result.size_bytes == record['size_bytes']
+            ok = ok and 'write' in record['phases'] and 'tracemalloc_peak' in record
+        print("✓ PASS" if ok else "✗ FAIL")
+        
+        # Test 4: The summary covers the whole batch
+        print("\n4. Testing batch summary...")
+        report = io.StringIO()
+        instrument.finish(report)
+        print(report.getvalue())
+        text = report.getvalue()
+        print("✓ PASS" if "Profile of 3 files" in text and "synthesize" in text else "✗ FAIL")
+    
+        # Test 5: With cProfile on, thread jobs are measured one at a time
+        print("\n5. Testing cProfile with several threads...")
+        instrument.configure('json,cprofile', json_path)
+        generator, extension = GENERATORS['txt']
+        active = []
+        overlap = []
+        
+        def tracked(*args, **kwargs):
+            active.append(1)
+            overlap.append(len(active))
+            time.sleep(0.02)
+            try:
+                return generator(*args, **kwargs)
+            finally:
+                active.pop()
+        
+        GENERATORS['txt'] = (tracked, extension)
+        try:
+            jobs = [make_job('txt', os.path.join(out_dir, f"t{index}.txt"), 50) for index in range(6)]
+            results = run_jobs(jobs, processes=1, threads=4)
+        finally:
+            GENERATORS['txt'] = (generator, extension)
+        print(f"  most jobs at once: {max(overlap)}")
+        print("✓ PASS" if max(overlap) == 1 and all(result.error is None for result in results) else "✗ FAIL")
+    
+    instrument.configure('0')
+    for name, value in zip(("FILEGEN_PROFILE", "FILEGEN_PROFILE_OUT"), previous):
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    
+    print("\nInstrumentation Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_instrument()
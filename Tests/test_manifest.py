@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators.manifest import run_manifest, expand_manifest, read_journal, JOURNAL_NAME
+
+def test_manifest():
+    """Test manifest-driven generation and resume from the journal"""
+    print("Testing manifest generation")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        manifest = {
+            "output": "corpus",
+            "seed": 7,
+            "files": [
+                {"type": "txt", "count": 4, "size": {"min": "1KB", "max": "64KB", "distribution": "log-uniform"}},
+                {"type": "png", "count": 3, "size": {"choices": ["2KB", "8KB"]}, "name": "img/{index}.{ext}"},
+                {"type": "svg", "count": 2, "size": "3KB"}
+            ]
+        }
+        manifest_path = os.path.join(work_dir, "manifest.json")
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        out_dir = os.path.join(work_dir, "corpus")
+        
+        # Test 1: Every file is generated at its drawn size
+        print("\n1. Testing first run...")
+        summary = run_manifest(manifest_path)
+        planned = expand_manifest(manifest, out_dir)
+        sizes_ok = all(os.path.getsize(job.file_path) == round(job.size_kb * 1024) for _, job in planned)
+        print(f"Summary: {summary}")
+        print("✓ PASS" if summary['generated'] == 9 and sizes_ok else "✗ FAIL")
+        
+        # Test 2: Sizes are reproducible from the seed
+        print("\n2. Testing seeded sizes...")
+        again = expand_manifest(manifest, out_dir)
+        same = [job.size_kb for _, job in planned] == [job.size_kb for _, job in again]
+        print("✓ PASS" if same else "✗ FAIL")
+        
+        # Test 3: A rerun only regenerates missing or incomplete files
+        print("\n3. Testing resume...")
+        os.remove(os.path.join(out_dir, "img", "1.png"))
+        with open(os.path.join(out_dir, "svg", "svg_00000.svg"), 'r+b') as f:
+            f.truncate(10)
+        with open(os.path.join(out_dir, JOURNAL_NAME), 'a') as f:
+            f.write('{"path": "torn')
+        summary = run_manifest(manifest_path)
+        print(f"Summary: {summary}")
+        print("✓ PASS" if summary['generated'] == 2 and summary['skipped'] == 7 else "✗ FAIL")
+        
+        # Test 4: Nothing is left to do after a complete run
+        print("\n4. Testing completed run...")
+        summary = run_manifest(manifest_path)
+        print("✓ PASS" if summary['generated'] == 0 and len(read_journal(out_dir)) == 9 else "✗ FAIL")
+        
+        # Test 5: Clashing names are rejected
+        print("\n5. Testing duplicate names...")
+        try:
+            expand_manifest({"files": [{"type": "txt", "count": 2, "size": "1KB", "name": "same.txt"}]}, out_dir)
+            print("✗ FAIL - Duplicate name accepted")
+        except ValueError:
+            print("✓ PASS")
+    
+        # Test 6: Files of an edited entry are regenerated, the rest are kept
+        print("\n6. Testing an edited manifest...")
+        manifest["files"][2]["size"] = "4KB"
+        manifest["files"][0]["content_seed"] = 3
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        summary = run_manifest(manifest_path)
+        svg_size = os.path.getsize(os.path.join(out_dir, "svg", "svg_00000.svg"))
+        print(f"Summary: {summary}; SVG size {svg_size}")
+        print("✓ PASS" if summary['generated'] == 6 and summary['skipped'] == 3 and svg_size == 4096 else "✗ FAIL")
+        
+        # Test 7: Adding files to one entry leaves the sizes of the other entries alone
+        print("\n7. Testing a longer entry...")
+        manifest["files"][0]["count"] = 5
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        summary = run_manifest(manifest_path)
+        print(f"Summary: {summary}")
+        print("✓ PASS" if summary['generated'] == 1 and summary['skipped'] == 9 else "✗ FAIL")
+        
+        # Test 8: Names outside the output folder are rejected before anything is written
+        print("\n8. Testing names outside the output folder...")
+        errors = 0
+        for name in ("../escaped.txt", "sub/../../escaped.txt", os.path.join(work_dir, "absolute.txt")):
+            try:
+                expand_manifest({"files": [{"type": "txt", "size": "1KB", "name": name}]}, out_dir)
+            except ValueError as e:
+                print(f"  {e}")
+                errors += 1
+        print("✓ PASS" if errors == 3 and not os.path.exists(os.path.join(work_dir, "escaped.txt")) else "✗ FAIL")
+    
+    print("\nManifest Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_manifest()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators.scheduler import make_job, run_jobs
+
+def test_scheduler():
+    """Test parallel generation with ordered results"""
+    print("Testing parallel scheduler")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as out_dir:
+        # Test 1: Mixed process and thread jobs come back in submission order
+        print("\n1. Testing mixed batch on 2 processes and 2 threads...")
+        specs = [('docx', 100), ('png', 8), ('pdf', 64), ('txt', 4), ('svg', 16), ('jpg', 8)]
+        jobs = [make_job(file_type, os.path.join(out_dir, f"job_{i}.{file_type}"), size_kb)
+                for i, (file_type, size_kb) in enumerate(specs)]
+        results = run_jobs(jobs, processes=2, threads=2)
+        
+        in_order = [result.index for result in results] == list(range(len(jobs)))
+        all_ok = all(result.error is None and os.path.exists(result.full_path) for result in results)
+        print(f"Results: {[(r.job.file_type, r.size_bytes) for r in results]}")
+        print("✓ PASS" if in_order and all_ok else "✗ FAIL")
+        
+        # Test 2: Failures are reported per job and can stop the batch
+        print("\n2. Testing error reporting with stop_on_error...")
+        bad_jobs = [make_job('txt', os.path.join(out_dir, "ok.txt"), 1),
+                    make_job('png', os.path.join(out_dir, "bad.png"), 1, padding='bogus'),
+                    make_job('txt', os.path.join(out_dir, "after.txt"), 1)]
+        results = run_jobs(bad_jobs, processes=1, threads=1, stop_on_error=True)
+        print(f"Errors: {[type(r.error).__name__ if r.error else None for r in results]}")
+        print("✓ PASS" if len(results) == 2 and isinstance(results[1].error, ValueError) else "✗ FAIL")
+        
+        # Test 3: Unknown types are rejected up front
+        print("\n3. Testing unknown file type...")
+        try:
+            make_job('bmp', os.path.join(out_dir, "x.bmp"), 1)
+            print("✗ FAIL - Unknown type accepted")
+        except ValueError:
+            print("✓ PASS")
+    
+    print("\nScheduler Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_scheduler()
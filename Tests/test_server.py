@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import asyncio
+import http.client
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import iter_chunks
+from file_generators.server import start_server
+
+def test_server():
+    """Test streaming generated files over HTTP"""
+    print("Testing the file-serving HTTP server")
+    print("=" * 60)
+    
+    # Run the server on its own event loop in a background thread
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(start_server('127.0.0.1', 0))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    
+    def fetch(path, method='GET', headers=None, connection=None):
+        connection = connection or http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    
+    try:
+        # Test 1: A streamed file matches the library API byte for byte
+        print("\n1. Testing full downloads...")
+        expected = b"".join(iter_chunks('png', 3072, seed='42'))
+        status, headers, body = fetch('/png/3MB?seed=42')
+        print(f"  status {status}, {len(body)} bytes, {headers.get('Content-Type')}")
+        print("✓ PASS" if status == 200 and body == expected else "✗ FAIL")
+        
+        # Test 2: Byte ranges, suffix ranges and unsatisfiable ranges
+        print("\n2. Testing Range requests...")
+        ok = True
+        for range_header, start, end in (("bytes=1000-1999", 1000, 2000),
+                                         ("bytes=3000000-", 3000000, len(expected)),
+                                         ("bytes=-100", len(expected) - 100, len(expected))):
+            status, headers, body = fetch('/png/3MB?seed=42', headers={'Range': range_header})
+            ok = ok and status == 206 and body == expected[start:end]
+            print(f"  {range_header}: {status} {headers.get('Content-Range')}")
+        status, headers, _ = fetch('/png/3MB?seed=42', headers={'Range': "bytes=5000000-"})
+        ok = ok and status == 416 and headers.get('Content-Range') == f"bytes */{len(expected)}"
+        print("✓ PASS" if ok else "✗ FAIL")
+        
+        # Test 3: Unseeded URLs serve the same bytes every time, so ranges line up
+        print("\n3. Testing stable URLs and keep-alive...")
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        first = fetch('/pdf/100KB', connection=connection)
+        second = fetch('/pdf/100KB', connection=connection)
+        head = fetch('/pdf/100KB', method='HEAD', connection=connection)
+        connection.close()
+        ok = (first[2] == second[2] and len(first[2]) == 100 * 1024 and head[2] == b""
+              and head[1]['Content-Length'] == str(100 * 1024) and first[1]['ETag'] == head[1]['ETag'])
+        print("✓ PASS" if ok else "✗ FAIL")
+        
+        # Test 4: Bad requests get error statuses
+        print("\n4. Testing invalid requests...")
+        statuses = [fetch(path)[0] for path in ('/bmp/1KB', '/png/huge', '/txt/1KB?padding=append',
+                                                '/png/4MB?padding=bogus', '/pdf/1KB?compress_ratio=2',
+                                                '/txt/1KB?compress_ratio=high')]
+        statuses.append(fetch('/txt/1KB', method='POST')[0])
+        print(f"  {statuses}")
+        print("✓ PASS" if statuses == [404, 400, 400, 400, 400, 400, 405] else "✗ FAIL")
+        
+        # Test 5: Many clients at once
+        print("\n5. Testing concurrent clients...")
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda index: fetch(f'/txt/2MB?seed={index}'), range(32)))
+        sizes = {len(body) for _, _, body in results}
+        distinct = len({body[:64] for _, _, body in results})
+        print(f"  {len(results)} downloads, sizes {sizes}, {distinct} distinct files")
+        print("✓ PASS" if sizes == {2 * 1024 * 1024} and distinct == 32 else "✗ FAIL")
+        
+        # Test 6: Files above the size limit are refused before anything is generated
+        print("\n6. Testing the size limit...")
+        close = {'Connection': 'close'}
+        statuses = [fetch('/docx/50GB', headers=close)[0],
+                    fetch('/png/2GB?padding=pixels', method='HEAD', headers=close)[0],
+                    fetch('/txt/2GB', headers=dict(close, Range="bytes=-100"))[0]]
+        status, headers, _ = fetch('/txt/1GB', method='HEAD', headers=close)
+        print(f"  above the limit: {statuses}; at the limit: {status} {headers.get('Content-Length')}")
+        print("✓ PASS" if statuses == [413] * 3 and status == 200 and headers.get('Content-Length') == str(1024 ** 3)
+              else "✗ FAIL")
+    finally:
+        async def shutdown():
+            # Cancel handlers still waiting on keep-alive connections before the loop closes
+            server.close()
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+    
+    print("\nHTTP Server Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_server()
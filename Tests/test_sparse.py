@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import struct
+import tempfile
+import time
+import zlib
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators.document_generator import generate_txt, generate_pdf, generate_docx
+from file_generators.image_generator import generate_png, generate_jpg, _crc32_zeros
+from file_generators.vector_generator import generate_svg
+
+def test_sparse():
+    """Test the sparse and preallocated fill modes"""
+    print("Testing sparse and preallocated fill modes")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as out_dir:
+        # Test 1: CRC of a zero run matches zlib
+        print("\n1. Testing arithmetic CRC of zero runs...")
+        ok = all(_crc32_zeros(n, zlib.crc32(b'fpAd')) == zlib.crc32(bytes(n), zlib.crc32(b'fpAd'))
+                 for n in (0, 1, 7, 4096, 1000003))
+        print("✓ PASS" if ok else "✗ FAIL")
+        
+        # Test 2: Exact sizes for every supported format and mode
+        print("\n2. Testing exact sizes...")
+        for generator, extension in ((generate_txt, 'txt'), (generate_pdf, 'pdf'),
+                                     (generate_png, 'png'), (generate_jpg, 'jpg')):
+            for fill in ('sparse', 'allocate'):
+                path = generator(os.path.join(out_dir, f"fill_{fill}.{extension}"), 300, fill=fill, verbose=False)
+                size = os.path.getsize(path)
+                print(f"{extension} {fill}: {size} bytes {'✓ PASS' if size == 300 * 1024 else '✗ FAIL'}")
+        
+        # Test 3: Sparse PNG padding chunks carry valid CRCs and IEND stays last
+        print("\n3. Testing sparse PNG structure...")
+        path = generate_png(os.path.join(out_dir, "structure.png"), 64, fill='sparse', verbose=False)
+        with open(path, 'rb') as f:
+            data = f.read()
+        offset = 8
+        chunk_types = []
+        crcs_ok = True
+        while offset < len(data):
+            length, chunk_type = struct.unpack('>I4s', data[offset:offset + 8])
+            crc, = struct.unpack('>I', data[offset + 8 + length:offset + 12 + length])
+            crcs_ok = crcs_ok and crc == zlib.crc32(data[offset + 4:offset + 8 + length])
+            chunk_types.append(chunk_type)
+            offset += 12 + length
+        print(f"Chunks: {chunk_types}")
+        print("✓ PASS" if crcs_ok and chunk_types[-1] == b'IEND' and b'fpAd' in chunk_types else "✗ FAIL")
+        
+        # Test 4: A huge sparse file is created without writing its payload
+        print("\n4. Testing 20 GB sparse PDF...")
+        start = time.perf_counter()
+        path = generate_pdf(os.path.join(out_dir, "huge.pdf"), 20 * 1024 * 1024, fill='sparse', verbose=False)
+        elapsed = time.perf_counter() - start
+        with open(path, 'rb') as f:
+            f.seek(-6, os.SEEK_END)
+            tail = f.read()
+        print(f"Generated in {elapsed * 1000:.1f} ms")
+        print("✓ PASS" if os.path.getsize(path) == 20 * 1024 ** 3 and tail.strip() == b'%%EOF' and elapsed < 1
+              else "✗ FAIL")
+        
+        # Test 5: Formats that cannot hold zeros reject the modes
+        print("\n5. Testing unsupported formats...")
+        rejected = 0
+        for generator in (generate_docx, generate_svg):
+            try:
+                generator(os.path.join(out_dir, "unsupported"), 10, fill='sparse', verbose=False)
+            except ValueError:
+                rejected += 1
+        print("✓ PASS" if rejected == 2 else "✗ FAIL")
+    
+    print("\nSparse Fill Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_sparse()
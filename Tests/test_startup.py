@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import subprocess
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must stay unloaded unless their file type is generated
+HEAVY_MODULES = ('docx', 'lxml', 'PIL', 'consolemenu', 'concurrent.futures.process', 'importlib.metadata')
+
+def loaded_heavy_modules(args, out_dir, cache_dir):
+    """Run cli.main in a fresh interpreter and list the heavy modules it loaded"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = ("import sys, cli; code = cli.main(sys.argv[1:]); "
+              f"print([name for name in {HEAVY_MODULES!r} if name in sys.modules]); sys.exit(code)")
+    env = dict(os.environ, FILEGEN_CACHE_DIR=cache_dir)
+    result = subprocess.run([sys.executable, "-c", script] + args + ['--out', out_dir],
+                            cwd=root, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip().splitlines()[-1]
+
+def test_startup():
+    """Test that each file type only loads the libraries it needs"""
+    print("Testing lazy imports")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as out_dir, tempfile.TemporaryDirectory() as cache_dir:
+        cases = [
+            ("TXT", ['generate', '--type', 'txt', '--size', '1KB'], "[]"),
+            ("SVG", ['generate', '--type', 'svg', '--size', '1KB'], "[]"),
+            ("PDF", ['generate', '--type', 'pdf', '--size', '4KB'], "[]"),
+            # First PNG run builds the template with Pillow, the second reads it from the cache
+            ("PNG, cold template cache", ['generate', '--type', 'png', '--size', '1KB'], "['PIL']"),
+            ("PNG, warm template cache", ['generate', '--type', 'png', '--size', '1KB'], "[]"),
+            ("DOCX", ['generate', '--type', 'docx', '--size', '40KB'], "['docx', 'lxml']"),
+        ]
+        for number, (label, args, expected) in enumerate(cases, start=1):
+            print(f"\n{number}. Testing {label} run...")
+            loaded = loaded_heavy_modules(args, out_dir, cache_dir)
+            print(f"Heavy modules loaded: {loaded}")
+            print("✓ PASS" if loaded == expected else f"✗ FAIL - expected {expected}")
+    
+    print("\nStartup Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_startup()
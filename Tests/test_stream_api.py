@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import io
+import socket
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import GENERATORS, iter_chunks, write_to
+
+def test_stream_api():
+    """Test generating files into sinks and as memoryviews"""
+    print("Testing the streaming library API")
+    print("=" * 60)
+    
+    # Test 1: Every type streams the same bytes the generator writes to disk
+    print("\n1. Testing streamed bytes against files on disk...")
+    ok = True
+    with tempfile.TemporaryDirectory() as out_dir:
+        for file_type, (generator, extension) in GENERATORS.items():
+            sink = io.BytesIO()
+            written = write_to(sink, file_type, 70, seed=3)
+            path = generator(os.path.join(out_dir, f"stream.{extension}"), 70, seed=3, verbose=False)
+            with open(path, 'rb') as f:
+                on_disk = f.read()
+            views = list(iter_chunks(file_type, 70, seed=3))
+            same = sink.getvalue() == on_disk == b"".join(views) and written == len(on_disk)
+            print(f"  {file_type}: {written} bytes, {len(views)} views, identical: {same}")
+            ok = ok and same and all(isinstance(view, memoryview) for view in views)
+    print("✓ PASS" if ok else "✗ FAIL")
+    
+    # Test 2: A raw pipe fd and a socket receive the whole file
+    print("\n2. Testing file descriptor and socket sinks...")
+    received = {}
+    
+    def drain(name, read):
+        received[name] = b"".join(iter(lambda: read(1024 * 1024), b""))
+    
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=drain, args=('pipe', lambda n: os.read(read_fd, n)))
+    reader.start()
+    write_to(write_fd, 'txt', 3000, seed=1)
+    os.close(write_fd)
+    reader.join()
+    os.close(read_fd)
+    
+    left, right = socket.socketpair()
+    reader = threading.Thread(target=drain, args=('socket', right.recv))
+    reader.start()
+    write_to(left, 'png', 2000, seed=1)
+    left.close()
+    reader.join()
+    right.close()
+    
+    expected = {'pipe': b"".join(iter_chunks('txt', 3000, seed=1)),
+                'socket': b"".join(iter_chunks('png', 2000, seed=1))}
+    print(f"  pipe: {len(received['pipe'])} bytes, socket: {len(received['socket'])} bytes")
+    print("✓ PASS" if received == expected else "✗ FAIL")
+    
+    # Test 3: Zero fills and unknown sinks are rejected
+    print("\n3. Testing invalid requests...")
+    rejected = 0
+    for call in (lambda: iter_chunks('txt', 1, fill='sparse'),
+                 lambda: iter_chunks('bmp', 1),
+                 lambda: write_to(object(), 'txt', 1)):
+        try:
+            call()
+        except (ValueError, TypeError):
+            rejected += 1
+    print("✓ PASS" if rejected == 3 else "✗ FAIL")
+    
+    print("\nStreaming API Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_stream_api()
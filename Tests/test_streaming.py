@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tracemalloc
+from io import BytesIO
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators.document_generator import generate_txt
+from file_generators.image_generator import generate_png
+from utils import iter_random_bytes, iter_random_text, write_stream, write_stream_pipelined, generate_random_text, SVG_SAFE_ALPHABET, TEXT_ALPHABET
+
+def test_streaming():
+    """Test the chunked byte source and the streaming sink"""
+    print("Testing streaming byte source and sink")
+    print("=" * 60)
+    
+    # Test 1: Chunked byte source
+    print("\n1. Testing iter_random_bytes chunking...")
+    chunks = list(iter_random_bytes(2500, chunk_size=1000))
+    sizes = [len(chunk) for chunk in chunks]
+    print(f"Chunk sizes: {sizes}")
+    print("✓ PASS" if sizes == [1000, 1000, 500] else "✗ FAIL")
+    
+    # Test 2: Streaming sink keeps bytes and order intact
+    print("\n2. Testing write_stream with uneven chunks...")
+    pieces = [os.urandom(n) for n in (3, 700, 0, 2048, 5, 1024)]
+    buffer = BytesIO()
+    written = write_stream(buffer, pieces, buffer_size=1024)
+    expected = b''.join(pieces)
+    print(f"Expected: {len(expected)} bytes")
+    print(f"Actual: {written} bytes")
+    print("✓ PASS" if written == len(expected) and buffer.getvalue() == expected else "✗ FAIL")
+    
+    # Test 3: Pipelined writer keeps bytes and order intact
+    print("\n3. Testing write_stream_pipelined with uneven chunks...")
+    buffer = BytesIO()
+    written = write_stream_pipelined(buffer, pieces, buffer_size=1024, depth=2)
+    print(f"Expected: {len(expected)} bytes")
+    print(f"Actual: {written} bytes")
+    print("✓ PASS" if written == len(expected) and buffer.getvalue() == expected else "✗ FAIL")
+    
+    # Test 4: TXT generation has flat memory use and exact size
+    print("\n4. Testing generate_txt peak memory...")
+    generated_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generated")
+    txt_filename = "test_stream.txt"
+    txt_size_kb = 32 * 1024
+    
+    try:
+        tracemalloc.start()
+        generate_txt(txt_filename, txt_size_kb)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+        txt_path = os.path.join(generated_folder, txt_filename)
+        file_size = os.path.getsize(txt_path)
+        print(f"File size: {file_size} bytes, traced peak: {peak / 1024 / 1024:.2f} MB")
+        if file_size == txt_size_kb * 1024 and peak < 8 * 1024 * 1024:
+            print("✓ PASS")
+        else:
+            print("✗ FAIL - Size mismatch or memory grew with file size")
+        os.remove(txt_path)
+    except Exception as e:
+        print(f"✗ FAIL - Exception occurred: {e}")
+    
+    # Test 5: PNG padding is streamed to the exact size
+    print("\n5. Testing streamed PNG padding...")
+    png_filename = "test_stream.png"
+    
+    try:
+        generate_png(png_filename, 3)
+        png_path = os.path.join(generated_folder, png_filename)
+        file_size = os.path.getsize(png_path)
+        print(f"Expected: {3 * 1024} bytes, Actual: {file_size} bytes")
+        print("✓ PASS" if file_size == 3 * 1024 else "✗ FAIL")
+        os.remove(png_path)
+    except Exception as e:
+        print(f"✗ FAIL - Exception occurred: {e}")
+    
+    # Test 6: Bulk text engine keeps the alphabet and exact sizes
+    print("\n6. Testing the bulk text engine...")
+    text = b''.join(iter_random_text(5000, SVG_SAFE_ALPHABET, chunk_size=1024))
+    allowed = set(SVG_SAFE_ALPHABET.encode('ascii'))
+    print(f"Expected: 5000 bytes, Actual: {len(text)} bytes")
+    print("✓ PASS" if len(text) == 5000 and set(text) <= allowed else "✗ FAIL")
+    print("✓ PASS" if len(generate_random_text(777)) == 777 else "✗ FAIL")
+    
+    # Test 7: Every character of the alphabet is equally likely
+    print("\n7. Testing character frequencies...")
+    worst = 0.0
+    for alphabet in (TEXT_ALPHABET, SVG_SAFE_ALPHABET):
+        text = generate_random_text(len(alphabet) * 20000, alphabet)
+        for character in set(alphabet):
+            expected = 20000 * alphabet.count(character)
+            worst = max(worst, abs(text.count(character) / expected - 1))
+    print(f"Largest deviation from the expected count: {worst:.1%}")
+    print("✓ PASS" if worst < 0.05 else "✗ FAIL")
+    
+    print("\nStreaming Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_streaming()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import xml.etree.ElementTree as ET
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators.vector_generator import generate_svg
+
+def test_svg_exact():
+    """Test the single-pass exact-size SVG writer"""
+    print("Testing exact-size SVG generation")
+    print("=" * 60)
+    
+    generated_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generated")
+    svg_path = os.path.join(generated_folder, "test_exact.svg")
+    
+    # Sizes around the comment framing threshold and a multi-MB file
+    for size_kb in (0.2, 0.21, 1, 20, 4096):
+        print(f"\nTesting {size_kb} KB SVG...")
+        try:
+            generate_svg("test_exact.svg", size_kb)
+            file_size = os.path.getsize(svg_path)
+            expected_bytes = int(size_kb * 1024)
+            print(f"Expected: {expected_bytes} bytes, Actual: {file_size} bytes")
+            print("✓ PASS - Exact size" if file_size == expected_bytes else "✗ FAIL - Size mismatch")
+            
+            root = ET.parse(svg_path).getroot()
+            print("✓ PASS - Well-formed SVG" if root.tag.endswith('svg') else f"✗ FAIL - Root is {root.tag}")
+            os.remove(svg_path)
+        except ET.ParseError as e:
+            print(f"✗ FAIL - Invalid XML format: {e}")
+        except Exception as e:
+            print(f"✗ FAIL - Exception occurred: {e}")
+    
+    print("\nSVG Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_svg_exact()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import hashlib
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_generators import generate_tree
+
+def list_tree(root):
+    """Map every file below root to its size and digest, and count the folders"""
+    files = {}
+    folders = 0
+    for directory, subdirectories, names in os.walk(root):
+        folders += len(subdirectories)
+        for name in names:
+            with open(os.path.join(directory, name), 'rb') as f:
+                data = f.read()
+            files[os.path.relpath(os.path.join(directory, name), root)] = (len(data), hashlib.md5(data).hexdigest())
+    return files, folders
+
+def test_tree_generator():
+    """Test the directory-tree generator"""
+    print("Testing directory-tree generation")
+    print("=" * 60)
+    
+    size_range = {"min": "100B", "max": "200KB", "distribution": "log-uniform"}
+    
+    with tempfile.TemporaryDirectory() as out_dir:
+        # Test 1: Files are spread evenly over the leaf folders with the requested size
+        print("\n1. Testing tree shape...")
+        root = os.path.join(out_dir, "shape")
+        summary = generate_tree(root, 1003, depth=2, fanout=3, size="100B", workers=1, extension="txt",
+                                verbose=False)
+        files, folders = list_tree(root)
+        per_leaf = {}
+        for path in files:
+            per_leaf[os.path.dirname(path)] = per_leaf.get(os.path.dirname(path), 0) + 1
+        print(f"  {len(files)} files in {folders} folders, {min(per_leaf.values())}-{max(per_leaf.values())} "
+              f"per leaf; summary {summary['files']} files, {summary['directories']} folders")
+        ok = (len(files) == summary['files'] == 1003 and folders == summary['directories'] == 12
+              and sorted(per_leaf.values()) == [111] * 5 + [112] * 4)
+        ok = ok and {size for size, _ in files.values()} == {100} and summary['bytes'] == 100300
+        ok = ok and "dir_0/dir_0/file_00000.txt" in files and "dir_2/dir_2/file_01002.txt" in files
+        print("✓ PASS" if ok else "✗ FAIL")
+        
+        # Test 2: A seeded tree does not depend on the worker count
+        print("\n2. Testing reproducibility across workers...")
+        generate_tree(os.path.join(out_dir, "one"), 500, depth=3, fanout=4, size=size_range, seed=5, workers=1,
+                      verbose=False)
+        generate_tree(os.path.join(out_dir, "three"), 500, depth=3, fanout=4, size=size_range, seed=5, workers=3,
+                      verbose=False)
+        single, _ = list_tree(os.path.join(out_dir, "one"))
+        parallel, _ = list_tree(os.path.join(out_dir, "three"))
+        sizes = [size for size, _ in single.values()]
+        print(f"  {len(single)} files, sizes {min(sizes)} to {max(sizes)} bytes")
+        print("✓ PASS" if single == parallel and len(single) == 500 and 100 <= min(sizes) and max(sizes) <= 204800
+              and len(set(sizes)) > 100 else "✗ FAIL")
+        
+        # Test 3: Depth 0 keeps files in the root, and a rerun overwrites them
+        print("\n3. Testing a flat tree and reruns...")
+        root = os.path.join(out_dir, "flat")
+        generate_tree(root, 50, depth=0, size="2KB", seed=1, verbose=False)
+        first, folders = list_tree(root)
+        generate_tree(root, 50, depth=0, size="2KB", seed=1, verbose=False)
+        second, _ = list_tree(root)
+        print("✓ PASS" if first == second and len(first) == 50 and folders == 0 else "✗ FAIL")
+        
+        # Test 4: Invalid shapes and sizes are rejected before anything is written
+        print("\n4. Testing invalid requests...")
+        errors = 0
+        for options in ({'files': -1}, {'files': 10, 'depth': 1.5}, {'files': 10, 'fanout': 0},
+                        {'files': 10, 'size': "big"}):
+            try:
+                generate_tree(os.path.join(out_dir, "bad"), verbose=False, **options)
+            except ValueError as e:
+                print(f"  {options}: {e}")
+                errors += 1
+        print("✓ PASS" if errors == 4 and not os.path.exists(os.path.join(out_dir, "bad")) else "✗ FAIL")
+    
+    print("\nTree Generator Testing Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_tree_generator()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: every generator across size tiers and modes.
+
+Each case (file type, mode, size) runs in a fresh interpreter, so peak RSS
+belongs to that case alone. The case is timed repeat times and the best
+wall time and MB/s are kept; one more run under tracemalloc records the
+peak of Python allocations. Results go to a JSON file, and a saved result
+file can be given as baseline: the exit code is 1 if any case got slower
+or uses more memory than the baseline allows.
+
+Run from the repository root:
+    python benchmarks/bench_generators.py [--sizes 1KB,1MB] [--full] [--types txt,png]
+        [--modes random,sparse] [--repeat N] [--output results.json]
+        [--baseline baseline.json] [--threshold 0.25] [--target folder]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from utils import parse_size
+
+# Size tiers, smallest to largest. The default run stops at 16 MB; --full
+# goes up to 1 GB, which needs a few GB of free disk and a few minutes.
+DEFAULT_SIZES = "1KB,64KB,1MB,16MB"
+FULL_SIZES = "1KB,64KB,1MB,16MB,256MB,1GB"
+
+# Generator options of each mode, and the file types that support it
+MODES = {
+    'random': ({}, ('txt', 'pdf', 'docx', 'png', 'jpg', 'svg', 'zip', 'tar', 'tgz')),
+    'seeded': ({'seed': 1}, ('txt', 'pdf', 'docx', 'png', 'jpg', 'svg', 'zip', 'tar', 'tgz')),
+    'sparse': ({'fill': 'sparse'}, ('txt', 'pdf', 'png', 'jpg')),
+    'allocate': ({'fill': 'allocate'}, ('txt', 'pdf', 'png', 'jpg')),
+    'append': ({'padding': 'append'}, ('png', 'jpg')),
+    'pixels': ({'padding': 'pixels'}, ('png', 'jpg')),
+    'compressible': ({'compress_ratio': 4}, ('txt', 'png', 'jpg', 'svg')),
+}
+
+# Differences below these are noise (timer resolution, interpreter and
+# imports), so they never count as a regression on their own
+TIME_SLACK_S = 0.002
+MEMORY_SLACK_BYTES = 1024 * 1024
+
+
+def run_case(file_type, mode, size_bytes, repeat, target_folder):
+    """
+    Time one case in this process and print its result as JSON.
+    
+    This is the body of the child interpreter started by measure_case.
+    
+    Args:
+        file_type (str): Key of file_generators.GENERATORS
+        mode (str): Key of MODES
+        size_bytes (int): Target file size
+        repeat (int): Timed runs; the best one is reported
+        target_folder (str): Folder for the generated file
+    """
+    import resource
+    import tracemalloc
+    from file_generators import GENERATORS
+    
+    generator, extension = GENERATORS[file_type]
+    options, _ = MODES[mode]
+    path = os.path.join(target_folder, f"bench_{file_type}_{mode}_{size_bytes}.{extension}")
+    
+    def generate():
+        generator(path, size_bytes / 1024, verbose=False, **options)
+    
+    best = None
+    for _ in range(repeat):
+        # Flush earlier runs first, so writeback throttling is not charged to this one
+        os.sync()
+        start = time.perf_counter()
+        generate()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    actual_size = os.path.getsize(path)
+    os.remove(path)
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    tracemalloc.start()
+    generate()
+    _, tracemalloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    os.remove(path)
+    
+    print(json.dumps({
+        'type': file_type,
+        'mode': mode,
+        'size_bytes': size_bytes,
+        'actual_bytes': actual_size,
+        'wall_s': best,
+        'mb_per_s': actual_size / (1024 * 1024) / max(best, 1e-9),
+        'peak_rss_kb': peak_rss_kb,
+        'tracemalloc_peak_bytes': tracemalloc_peak,
+        'repeat': repeat,
+    }))
+
+
+def measure_case(file_type, mode, size_bytes, repeat, target_folder):
+    """Run one case in a fresh interpreter and return its result dict"""
+    command = [sys.executable, os.path.abspath(__file__), '--case', file_type, mode, str(size_bytes),
+               '--repeat', str(repeat), '--target', target_folder]
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {'type': file_type, 'mode': mode, 'size_bytes': size_bytes,
+                'error': error[-1] if error else f"exit code {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against a baseline.
+    
+    Args:
+        results (list): Result dicts of this run
+        baseline (dict): Parsed result file of an earlier run
+        threshold (float): Allowed relative growth of wall time, peak RSS
+            and tracemalloc peak, e.g. 0.25 for 25%
+    
+    Returns:
+        list: One message per regression, empty if there are none
+    """
+    previous = {(r['type'], r['mode'], r['size_bytes']): r for r in baseline.get('results', []) if 'error' not in r}
+    regressions = []
+    for result in results:
+        old = previous.get((result['type'], result['mode'], result['size_bytes']))
+        if old is None or 'error' in result:
+            continue
+        label = f"{result['type']} {result['mode']} {format_size(result['size_bytes'])}"
+        if result['wall_s'] > old['wall_s'] * (1 + threshold) + TIME_SLACK_S:
+            regressions.append(f"{label}: {result['wall_s'] * 1000:.1f} ms ({result['mb_per_s']:.1f} MB/s), "
+                               f"baseline {old['wall_s'] * 1000:.1f} ms ({old['mb_per_s']:.1f} MB/s)")
+        for key, scale in (('peak_rss_kb', 1024), ('tracemalloc_peak_bytes', 1)):
+            limit = old[key] * scale * (1 + threshold) + MEMORY_SLACK_BYTES
+            if result[key] * scale > limit:
+                regressions.append(f"{label}: {key} {result[key]}, baseline {old[key]}")
+    return regressions
+
+
+def format_size(size_bytes):
+    """Format a tier size compactly, e.g. '64KB' or '1GB'"""
+    for unit in ('B', 'KB', 'MB'):
+        if size_bytes < 1024 or size_bytes % 1024:
+            return f"{size_bytes:g}{unit}"
+        size_bytes //= 1024
+    return f"{size_bytes:g}GB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every generator across size tiers and modes.")
+    parser.add_argument('--sizes', help=f"Comma-separated size tiers (default: {DEFAULT_SIZES})")
+    parser.add_argument('--full', action='store_true', help=f"Use all tiers: {FULL_SIZES}")
+    parser.add_argument('--types', default="txt,pdf,docx,png,jpg,svg", help="Comma-separated file types")
+    parser.add_argument('--modes', default="random", help=f"Comma-separated modes out of {', '.join(MODES)}")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case, best is kept (default: 3)")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--baseline', help="Result file of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed relative slowdown or memory growth against the baseline (default: 0.25)")
+    parser.add_argument('--target', help="Folder for the generated files (default: a temporary folder)")
+    parser.add_argument('--case', nargs=3, metavar=('TYPE', 'MODE', 'SIZE_BYTES'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.case:
+        file_type, mode, size_bytes = args.case
+        run_case(file_type, mode, int(size_bytes), args.repeat, args.target)
+        return 0
+    
+    size_list = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    sizes = [int(parse_size(size) * 1024) for size in size_list.split(',')]
+    types = args.types.split(',')
+    modes = args.modes.split(',')
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode '{mode}', expected one of {', '.join(MODES)}")
+    
+    work_dir = tempfile.mkdtemp(prefix="bench_generators_", dir=args.target)
+    results = []
+    print(f"{'case':<24} {'size':>6} {'best':>10} {'MB/s':>9} {'peak RSS':>10} {'tracemalloc':>12}")
+    try:
+        for file_type in types:
+            for mode in modes:
+                if file_type not in MODES[mode][1]:
+                    continue
+                for size_bytes in sizes:
+                    result = measure_case(file_type, mode, size_bytes, args.repeat, work_dir)
+                    results.append(result)
+                    label = f"{file_type} {mode}"
+                    if 'error' in result:
+                        print(f"{label:<24} {format_size(size_bytes):>6}  error: {result['error']}")
+                        continue
+                    print(f"{label:<24} {format_size(size_bytes):>6} {result['wall_s'] * 1000:8.1f}ms "
+                          f"{result['mb_per_s']:9.1f} {result['peak_rss_kb'] / 1024:8.1f}MB "
+                          f"{result['tracemalloc_peak_bytes'] / (1024 * 1024):10.2f}MB")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    failed = [result for result in results if 'error' in result]
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\nRegressions against {args.baseline} (threshold {args.threshold:.0%}):")
+            for message in regressions:
+                print(f"  {message}")
+        else:
+            print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+        return 1 if regressions or failed else 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
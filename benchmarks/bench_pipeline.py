@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: inline vs. pipelined (background writer thread) streaming writes.
+
+Writes random data to a file in the target folder with write_stream and
+with write_stream_pipelined and prints the throughput of each, next to
+the raw urandom rate and the write rate of pre-generated data.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py [size_mb] [target_folder]
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import CHUNK_SIZE, iter_random_bytes, write_stream, write_stream_pipelined
+
+
+def measure(label, func, size_bytes):
+    """Run func once and print its throughput in MB/s"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed:8.3f} s  {size_bytes / (1024 * 1024) / elapsed:10.1f} MB/s")
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 512
+    target_folder = sys.argv[2] if len(sys.argv) > 2 else tempfile.gettempdir()
+    size_bytes = int(size_mb * 1024 * 1024)
+    path = os.path.join(target_folder, "bench_pipeline.bin")
+    block = os.urandom(CHUNK_SIZE)
+    
+    def write_with(writer, chunks):
+        with open(path, 'wb') as f:
+            writer(f, chunks)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    print(f"{size_mb:g} MB to {target_folder}:")
+    try:
+        measure("urandom only", lambda: sum(len(c) for c in iter_random_bytes(size_bytes)), size_bytes)
+        measure("write only (same block)", lambda: write_with(write_stream, (block for _ in range(size_bytes // CHUNK_SIZE))), size_bytes)
+        measure("write_stream (inline)", lambda: write_with(write_stream, iter_random_bytes(size_bytes)), size_bytes)
+        measure("write_stream_pipelined", lambda: write_with(write_stream_pipelined, iter_random_bytes(size_bytes)), size_bytes)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scaling of the parallel scheduler from 1 to N workers.
+
+Runs the same mixed DOCX/PDF/SVG/PNG batch with 1, 2, 4, ... N worker
+processes (and as many threads) and prints wall time and speedup.
+
+Run from the repository root:
+    python benchmarks/bench_scheduler.py [max_workers]
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_generators.scheduler import make_job, run_jobs
+
+
+# (file type, size in KB, count) of the benchmark batch
+BATCH = [
+    ('docx', 1024, 16),
+    ('pdf', 4096, 16),
+    ('svg', 2048, 16),
+    ('png', 256, 64),
+]
+
+
+def make_batch(out_dir):
+    """Build the job list of the benchmark batch"""
+    jobs = []
+    for file_type, size_kb, count in BATCH:
+        for index in range(count):
+            jobs.append(make_job(file_type, os.path.join(out_dir, f"{file_type}_{index}.{file_type}"), size_kb))
+    return jobs
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    worker_counts = sorted({1, max_workers} | {n for n in (2, 4, 8, 16, 32, 64) if n < max_workers})
+    
+    print(f"CPU count: {os.cpu_count()}")
+    baseline = None
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory() as out_dir:
+            jobs = make_batch(out_dir)
+            start = time.perf_counter()
+            results = run_jobs(jobs, processes=workers, threads=workers)
+            elapsed = time.perf_counter() - start
+        
+        failed = sum(1 for result in results if result.error is not None)
+        total_mb = sum(result.size_bytes for result in results) / (1024 * 1024)
+        baseline = baseline or elapsed
+        print(f"  {workers:3d} workers: {elapsed:7.2f} s  {len(jobs) / elapsed:7.1f} files/s  "
+              f"{total_mb / elapsed:7.1f} MB/s  speedup {baseline / elapsed:4.2f}x"
+              + (f"  ({failed} failed)" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
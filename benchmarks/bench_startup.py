@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark and guard: cli.py startup time and the libraries it imports.
+
+Runs cli.py in fresh interpreters under python -X importtime for a few
+typical invocations and prints the best and median wall time, the total
+import time and the heavy libraries each one loaded. With --max-ms or
+--check it doubles as a regression guard for scripts and CI: the exit code
+is 1 if the TXT run is slower than the budget, or if any run loads a heavy
+library its file type does not need.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py [--runs N] [--max-ms MS] [--check]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that are slow to import, and the file types allowed to load them
+HEAVY_MODULES = {
+    'docx': {'docx'},
+    'lxml': {'docx'},
+    'PIL': {'png', 'jpg'},
+    'numpy': set(),
+    'consolemenu': set(),
+    'concurrent.futures.process': set(),
+    'importlib.metadata': set(),
+}
+
+# (label, file type or None, cli.py arguments)
+SCENARIOS = [
+    ("--help", None, ['--help']),
+    ("generate txt", 'txt', ['generate', '--type', 'txt', '--size', '1KB']),
+    ("generate svg", 'svg', ['generate', '--type', 'svg', '--size', '1KB']),
+    ("generate pdf", 'pdf', ['generate', '--type', 'pdf', '--size', '4KB']),
+    ("generate png", 'png', ['generate', '--type', 'png', '--size', '1KB']),
+    ("generate docx", 'docx', ['generate', '--type', 'docx', '--size', '40KB']),
+]
+
+
+def parse_importtime(stderr):
+    """
+    Parse python -X importtime output.
+    
+    Args:
+        stderr (str): Captured standard error of the run
+    
+    Returns:
+        tuple: (total import time in ms, set of imported module names)
+    """
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        # Only top-level entries, so nested imports are not counted twice
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def run_once(args, out_dir, cache_dir):
+    """Run cli.py once; return (wall ms, import ms, modules)"""
+    env = dict(os.environ, FILEGEN_CACHE_DIR=cache_dir)
+    command = [sys.executable, "-X", "importtime", os.path.join(ROOT, "cli.py")] + args
+    if args[0] == 'generate':
+        command += ['--out', out_dir]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"cli.py {' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    import_ms, modules = parse_importtime(result.stderr)
+    return wall_ms, import_ms, modules
+
+
+def unexpected_modules(file_type, modules):
+    """Heavy libraries a run loaded although its file type does not need them"""
+    return sorted(name for name, allowed in HEAVY_MODULES.items()
+                  if name in modules and file_type not in allowed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cli.py startup time")
+    parser.add_argument('--runs', type=int, default=10, help="Runs per scenario (default: 10)")
+    parser.add_argument('--max-ms', type=float, help="Fail if the median TXT run takes longer")
+    parser.add_argument('--check', action='store_true', help="Fail if a run loads an unneeded heavy library")
+    options = parser.parse_args()
+    
+    failed = False
+    with tempfile.TemporaryDirectory() as out_dir, tempfile.TemporaryDirectory() as cache_dir:
+        print(f"{'scenario':<16} {'best':>9} {'median':>9} {'imports':>9}  heavy libraries loaded")
+        for label, file_type, args in SCENARIOS:
+            runs = [run_once(args, out_dir, cache_dir) for _ in range(options.runs)]
+            walls = [wall for wall, _, _ in runs]
+            median_wall = statistics.median(walls)
+            import_ms = statistics.median(imports for _, imports, _ in runs)
+            modules = runs[-1][2]
+            heavy = sorted(name for name in HEAVY_MODULES if name in modules)
+            print(f"{label:<16} {min(walls):7.1f}ms {median_wall:7.1f}ms {import_ms:7.1f}ms  {', '.join(heavy) or '-'}")
+            
+            unexpected = unexpected_modules(file_type, modules)
+            if options.check and unexpected:
+                print(f"  FAIL: {label} loaded {', '.join(unexpected)}")
+                failed = True
+            if options.max_ms is not None and file_type == 'txt' and median_wall > options.max_ms:
+                print(f"  FAIL: {label} median {median_wall:.1f} ms is over the {options.max_ms:g} ms budget")
+                failed = True
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-character random text vs. the bulk text engine.
+
+Run from the repository root:
+    python benchmarks/bench_text_engine.py [size_mb]
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import TEXT_ALPHABET, SVG_SAFE_ALPHABET, generate_random_text, iter_random_text
+
+
+def legacy_random_text(length, alphabet):
+    """The original one-random.choice-per-character implementation"""
+    return ''.join(random.choice(alphabet) for _ in range(length))
+
+
+def measure(label, func, size_bytes):
+    """Run func once and print its throughput in MB/s"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    mb_per_s = size_bytes / (1024 * 1024) / elapsed
+    print(f"  {label:<28} {elapsed:8.3f} s  {mb_per_s:10.1f} MB/s")
+    return mb_per_s
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    size_bytes = int(size_mb * 1024 * 1024)
+
+    for name, alphabet in (("generic", TEXT_ALPHABET), ("svg-safe", SVG_SAFE_ALPHABET)):
+        print(f"{name} alphabet, {size_mb:g} MB:")
+        legacy = measure("legacy random.choice loop", lambda: legacy_random_text(size_bytes, alphabet), size_bytes)
+        bulk = measure("generate_random_text", lambda: generate_random_text(size_bytes, alphabet), size_bytes)
+        measure("iter_random_text (stream)", lambda: sum(len(c) for c in iter_random_text(size_bytes, alphabet)), size_bytes)
+        print(f"  speedup: {bulk / legacy:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
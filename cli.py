@@ -1,18 +1,21 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
-from consolemenu import ConsoleMenu
-from consolemenu.items import FunctionItem, SubmenuItem
-from consolemenu.format import AsciiBorderStyle
+import sys
+import time
 
-from file_generators.document_generator import generate_txt, generate_pdf, generate_docx
-from file_generators.image_generator import generate_png, generate_jpg
-from file_generators.vector_generator import generate_svg
-from utils import prompt_for_filename_and_size
+from file_generators import GENERATORS, COMPRESSIBLE_TYPES, ARCHIVE_TYPES, instrument
+from file_generators.scheduler import make_job, iter_results
+from file_generators.dedup import CLONE_METHODS
+from file_generators.manifest import SIZE_DISTRIBUTIONS
+from utils import prompt_for_filename_and_size, parse_size, create_generated_folder, FILL_MODES
 
 
 def generate_txt_wrapper():
     """Wrapper function for TXT file generation"""
+    from file_generators.document_generator import generate_txt
+    
     try:
         filename, size_kb = prompt_for_filename_and_size(default_extension="txt")
         generate_txt(filename, size_kb)
@@ -24,6 +27,8 @@ def generate_txt_wrapper():
 
 def generate_png_wrapper():
     """Wrapper function for PNG file generation"""
+    from file_generators.image_generator import generate_png
+    
     try:
         filename, size_kb = prompt_for_filename_and_size(default_extension="png")
         generate_png(filename, size_kb)
@@ -35,6 +40,8 @@ def generate_png_wrapper():
 
 def generate_jpg_wrapper():
     """Wrapper function for JPG file generation"""
+    from file_generators.image_generator import generate_jpg
+    
     try:
         filename, size_kb = prompt_for_filename_and_size(default_extension="jpg")
         generate_jpg(filename, size_kb)
@@ -46,6 +53,8 @@ def generate_jpg_wrapper():
 
 def generate_pdf_wrapper():
     """Wrapper function for PDF file generation"""
+    from file_generators.document_generator import generate_pdf
+    
     try:
         filename, size_kb = prompt_for_filename_and_size(default_extension="pdf")
         generate_pdf(filename, size_kb)
@@ -57,6 +66,8 @@ def generate_pdf_wrapper():
 
 def generate_docx_wrapper():
     """Wrapper function for DOCX file generation"""
+    from file_generators.document_generator import generate_docx
+    
     try:
         filename, size_kb = prompt_for_filename_and_size(default_extension="docx")
         generate_docx(filename, size_kb)
@@ -68,6 +79,8 @@ def generate_docx_wrapper():
 
 def generate_svg_wrapper():
     """Wrapper function for SVG file generation"""
+    from file_generators.vector_generator import generate_svg
+    
     try:
         filename, size_kb = prompt_for_filename_and_size(default_extension="svg")
         generate_svg(filename, size_kb)
@@ -77,8 +90,51 @@ def generate_svg_wrapper():
     input("\nPress Enter to continue...")
 
 
+def generate_zip_wrapper():
+    """Wrapper function for ZIP archive generation"""
+    from file_generators.archive_generator import generate_zip
+    
+    try:
+        filename, size_kb = prompt_for_filename_and_size(default_extension="zip")
+        generate_zip(filename, size_kb)
+    except Exception as e:
+        print(f"Error generating ZIP file: {e}")
+    
+    input("\nPress Enter to continue...")
+
+
+def generate_tar_wrapper():
+    """Wrapper function for TAR archive generation"""
+    from file_generators.archive_generator import generate_tar
+    
+    try:
+        filename, size_kb = prompt_for_filename_and_size(default_extension="tar")
+        generate_tar(filename, size_kb)
+    except Exception as e:
+        print(f"Error generating TAR file: {e}")
+    
+    input("\nPress Enter to continue...")
+
+
+def generate_tgz_wrapper():
+    """Wrapper function for TAR.GZ archive generation"""
+    from file_generators.archive_generator import generate_tgz
+    
+    try:
+        filename, size_kb = prompt_for_filename_and_size(default_extension="tar.gz")
+        generate_tgz(filename, size_kb)
+    except Exception as e:
+        print(f"Error generating TAR.GZ file: {e}")
+    
+    input("\nPress Enter to continue...")
+
+
 def create_image_files_menu():
     """Create the Image Files sub-menu"""
+    from consolemenu import ConsoleMenu
+    from consolemenu.items import FunctionItem
+    from consolemenu.format import AsciiBorderStyle
+    
     image_menu = ConsoleMenu("Image Files", "Select an image file type to generate:")
     image_menu.border_style = AsciiBorderStyle()
     
@@ -91,6 +147,10 @@ def create_image_files_menu():
 
 def create_document_files_menu():
     """Create the Document Files sub-menu"""
+    from consolemenu import ConsoleMenu
+    from consolemenu.items import FunctionItem
+    from consolemenu.format import AsciiBorderStyle
+    
     document_menu = ConsoleMenu("Document Files", "Select a document file type to generate:")
     document_menu.border_style = AsciiBorderStyle()
     
@@ -106,6 +166,10 @@ def create_document_files_menu():
 
 def create_vector_files_menu():
     """Create the Vector Files sub-menu"""
+    from consolemenu import ConsoleMenu
+    from consolemenu.items import FunctionItem
+    from consolemenu.format import AsciiBorderStyle
+    
     vector_menu = ConsoleMenu("Vector Files", "Select a vector file type to generate:")
     vector_menu.border_style = AsciiBorderStyle()
     
@@ -115,8 +179,29 @@ def create_vector_files_menu():
     return vector_menu
 
 
-def main():
-    """Main application entry point"""
+def create_archive_files_menu():
+    """Create the Archive Files sub-menu"""
+    from consolemenu import ConsoleMenu
+    from consolemenu.items import FunctionItem
+    from consolemenu.format import AsciiBorderStyle
+    
+    archive_menu = ConsoleMenu("Archive Files", "Select an archive type to generate:")
+    archive_menu.border_style = AsciiBorderStyle()
+    
+    archive_menu.append_item(FunctionItem("Generate ZIP File", generate_zip_wrapper))
+    archive_menu.append_item(FunctionItem("Generate TAR File", generate_tar_wrapper))
+    archive_menu.append_item(FunctionItem("Generate TAR.GZ File", generate_tgz_wrapper))
+    
+    return archive_menu
+
+
+def run_menu():
+    """Run the interactive console-menu interface"""
+    # The menu library is only needed here, so batch runs never import it
+    from consolemenu import ConsoleMenu
+    from consolemenu.items import SubmenuItem
+    from consolemenu.format import AsciiBorderStyle
+    
     # Create the main menu
     main_menu = ConsoleMenu(
         "File Generator CLI Tool",
@@ -128,15 +213,408 @@ def main():
     image_menu = create_image_files_menu()
     document_menu = create_document_files_menu()
     vector_menu = create_vector_files_menu()
+    archive_menu = create_archive_files_menu()
     
     # Add sub-menu items to main menu
     main_menu.append_item(SubmenuItem("Image Files", image_menu, main_menu))
     main_menu.append_item(SubmenuItem("Document Files", document_menu, main_menu))
     main_menu.append_item(SubmenuItem("Vector Files", vector_menu, main_menu))
+    main_menu.append_item(SubmenuItem("Archive Files", archive_menu, main_menu))
     
     # Show the menu
     main_menu.show()
 
 
+def size_argument(size_text):
+    """argparse type for sizes such as 512KB, 5MB or 1.5GB (returns kilobytes)"""
+    try:
+        return parse_size(size_text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def positive_int(text):
+    """argparse type for counts that must be at least 1"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid whole number: '{text}'")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def format_bytes(size_bytes):
+    """Format a byte count with a binary unit, e.g. '4.88 GB'"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size_bytes < 1024:
+            return f"{size_bytes:.2f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.2f} TB"
+
+
+def run_generate(args):
+    """
+    Generate a batch of files of one type and print a throughput summary.
+    
+    Args:
+        args (argparse.Namespace): Parsed 'generate' arguments
+        
+    Returns:
+        int: Process exit code
+    """
+    _, extension = GENERATORS[args.type]
+    out_dir = os.path.abspath(args.out) if args.out else create_generated_folder()
+    os.makedirs(out_dir, exist_ok=True)
+    
+    file_paths = [os.path.join(out_dir, args.name.format(index=index, type=args.type, ext=extension))
+                  for index in range(args.count)]
+    options = {}
+    if args.fill != 'random':
+        options['fill'] = args.fill
+    if args.padding is not None:
+        if args.type not in ('png', 'jpg'):
+            print(f"Error: --padding only applies to PNG and JPG, not {args.type.upper()}", file=sys.stderr)
+            return 1
+        options['padding'] = args.padding
+    if args.compress_ratio is not None:
+        if args.type not in COMPRESSIBLE_TYPES:
+            print(f"Error: --compress-ratio only applies to {', '.join(t.upper() for t in COMPRESSIBLE_TYPES)}, "
+                  f"not {args.type.upper()}", file=sys.stderr)
+            return 1
+        options['compress_ratio'] = args.compress_ratio
+    if args.members is not None:
+        if args.type not in ARCHIVE_TYPES:
+            print(f"Error: --members only applies to ZIP, TAR and TGZ, not {args.type.upper()}", file=sys.stderr)
+            return 1
+        options['members'] = args.members
+    
+    start = time.perf_counter()
+    total_bytes = 0
+    generated = 0
+    
+    if args.dedup:
+        from file_generators.dedup import generate_copies
+        
+        # One canonical file per run, so the base seed is used as is
+        if args.seed is not None:
+            options['seed'] = args.seed
+        try:
+            results = generate_copies(args.type, file_paths, args.size, method=args.dedup,
+                                      patch=args.patch_copies, **options)
+        except (OSError, ValueError) as e:
+            print(f"Error generating {args.type.upper()} copies: {e}", file=sys.stderr)
+            results = []
+        generated = len(results)
+        total_bytes = sum(os.path.getsize(full_path) for full_path, _ in results)
+        methods = sorted({how for _, how in results[1:]})
+        if methods:
+            print(f"Copies made with: {', '.join(methods)}")
+    else:
+        jobs = []
+        for index, file_path in enumerate(file_paths):
+            job_options = dict(options)
+            if args.seed is not None:
+                # Each file gets its own seed, so files differ but reruns match
+                job_options['seed'] = f"{args.seed}:{index}"
+            jobs.append(make_job(args.type, file_path, args.size, **job_options))
+        
+        for result in iter_results(jobs, processes=args.workers, threads=args.threads or args.workers,
+                                   stop_on_error=True):
+            if result.error is not None:
+                print(f"Error generating {os.path.basename(result.job.file_path)}: {result.error}", file=sys.stderr)
+                break
+            total_bytes += result.size_bytes
+            generated += 1
+    
+    elapsed = time.perf_counter() - start
+    rate = max(elapsed, 1e-9)
+    print(f"Generated {generated} {args.type.upper()} files ({format_bytes(total_bytes)}) in {out_dir} "
+          f"in {elapsed:.2f} s: {generated / rate:.1f} files/s, {total_bytes / (1024 * 1024) / rate:.1f} MB/s")
+    
+    return 0 if generated == args.count else 1
+
+
+def run_manifest_command(args):
+    """
+    Generate the files described by a manifest, resuming an earlier run.
+    
+    Args:
+        args (argparse.Namespace): Parsed 'run' arguments
+        
+    Returns:
+        int: Process exit code
+    """
+    from file_generators.manifest import run_manifest
+    
+    try:
+        summary = run_manifest(args.manifest, out_dir=args.out, workers=args.workers, threads=args.threads)
+    except (OSError, ValueError) as e:
+        print(f"Error running manifest: {e}", file=sys.stderr)
+        return 1
+    return 0 if summary['failed'] == 0 else 1
+
+
+def run_tree_command(args):
+    """
+    Generate a directory tree of many small files.
+    
+    Args:
+        args (argparse.Namespace): Parsed 'tree' arguments
+    
+    Returns:
+        int: Process exit code
+    """
+    from file_generators.tree_generator import generate_tree
+    
+    size = args.size
+    if args.max_size is not None:
+        size = {'min': f"{args.size}KB", 'max': f"{args.max_size}KB", 'distribution': args.distribution}
+    out_dir = os.path.abspath(args.out) if args.out else os.path.join(create_generated_folder(), "tree")
+    try:
+        summary = generate_tree(out_dir, args.files, depth=args.depth, fanout=args.fanout, size=size,
+                                seed=args.seed, workers=args.workers, extension=args.ext)
+    except (OSError, ValueError) as e:
+        print(f"Error generating tree: {e}", file=sys.stderr)
+        return 1
+    return 0 if summary['files'] == args.files else 1
+
+
+def run_cache_command(args):
+    """
+    Show the file cache statistics, after clearing or evicting if asked.
+    
+    Args:
+        args (argparse.Namespace): Parsed 'cache' arguments
+    
+    Returns:
+        int: Process exit code
+    """
+    from file_generators import file_cache
+    
+    if args.budget is not None:
+        try:
+            file_cache.configure(budget=args.budget)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    if args.clear:
+        file_cache.clear()
+    elif args.evict:
+        removed, freed = file_cache.evict()
+        print(f"Evicted {removed} files ({format_bytes(freed)})")
+    
+    stats = file_cache.stats()
+    print(f"File cache in {stats['folder']}")
+    print(f"  {stats['entries']} files, {format_bytes(stats['size_bytes'])} "
+          f"of a {format_bytes(stats['budget_bytes'])} budget")
+    print(f"  {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%} hit rate), "
+          f"{stats['bypassed']} not cacheable")
+    print(f"  {format_bytes(stats['bytes_served'])} served from the cache, "
+          f"{format_bytes(stats['bytes_stored'])} stored, "
+          f"{stats['evictions']} files ({format_bytes(stats['bytes_evicted'])}) evicted")
+    return 0
+
+
+def print_cache_summary(before):
+    """Print what the cache did during a batch, given its stats from before"""
+    from file_generators import file_cache
+    
+    after = file_cache.stats()
+    delta = {name: after[name] - before[name] for name in file_cache.STAT_COUNTERS}
+    print(f"Cache: {delta['hits']} hits, {delta['misses']} misses, {delta['bypassed']} not cacheable "
+          f"(unseeded or zero-filled), {delta['evictions']} evicted; {after['entries']} files, "
+          f"{format_bytes(after['size_bytes'])} of {format_bytes(after['budget_bytes'])}")
+
+
+def run_serve(args):
+    """
+    Serve generated files over HTTP until interrupted.
+    
+    Args:
+        args (argparse.Namespace): Parsed 'serve' arguments
+        
+    Returns:
+        int: Process exit code
+    """
+    from file_generators.server import serve
+    
+    try:
+        serve(args.host, args.port, threads=args.threads, max_bytes=int(args.max_size * 1024), verbose=args.verbose)
+    except KeyboardInterrupt:
+        return 0
+    except OSError as e:
+        print(f"Error starting server: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def add_profile_arguments(parser):
+    """Add the profiling options shared by the batch commands"""
+    parser.add_argument('--profile', nargs='?', const='summary', metavar='SPEC',
+                        help="Time each file's phases (synthesize, serialize, write, fsync) and report them; SPEC "
+                             f"is a comma-separated list of {', '.join(instrument.PROFILE_OPTIONS)} "
+                             "(default without a value: summary; also set by FILEGEN_PROFILE)")
+    parser.add_argument('--profile-out', metavar='PATH',
+                        help="Append the per-file JSON lines of --profile json to this file instead of stderr")
+
+
+def add_cache_arguments(parser):
+    """Add the file cache options shared by the batch commands"""
+    parser.add_argument('--cache', nargs='?', const='auto', choices=CLONE_METHODS,
+                        help="Reuse seeded files made by earlier runs from a local cache, cloned with this "
+                             "method ('auto' tries a reflink, then a copy; 'hardlink' shares the inode, so do "
+                             "not edit the outputs; default without a value: auto)")
+    parser.add_argument('--cache-budget', metavar='SIZE',
+                        help="Disk budget of the cache; least recently used files are evicted beyond it "
+                             "(default: 5GB, or FILEGEN_FILE_CACHE_BUDGET)")
+
+
+def build_parser():
+    """Build the argument parser of the non-interactive interface"""
+    parser = argparse.ArgumentParser(
+        description="Generate files with random data. Run without arguments for the interactive menu.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    generate_parser = subparsers.add_parser('generate', help="Generate a batch of files of one type")
+    generate_parser.add_argument('--type', required=True, choices=sorted(GENERATORS),
+                                 help="File type to generate")
+    generate_parser.add_argument('--size', required=True, type=size_argument,
+                                 help="Target size per file, e.g. 512KB, 5MB, 1.5GB (bare numbers are KB)")
+    generate_parser.add_argument('--count', type=positive_int, default=1,
+                                 help="Number of files to generate (default: 1)")
+    generate_parser.add_argument('--out', help="Output folder (default: the 'generated' folder)")
+    generate_parser.add_argument('--name', default="file_{index:05d}.{ext}",
+                                 help="File name pattern with {index}, {type} and {ext} fields "
+                                      "(default: file_{index:05d}.{ext})")
+    generate_parser.add_argument('--workers', type=positive_int, default=1,
+                                 help="Worker processes for PDF, DOCX and SVG, and worker threads for "
+                                      "the other types (default: 1)")
+    generate_parser.add_argument('--threads', type=positive_int,
+                                 help="Worker threads for TXT, PNG and JPG (default: same as --workers)")
+    generate_parser.add_argument('--seed',
+                                 help="Seed for reproducible content; the same seed, type, size and name "
+                                      "index always give identical bytes (default: os.urandom)")
+    generate_parser.add_argument('--fill', choices=FILL_MODES, default='random',
+                                 help="Payload: random bytes, or zeros as a sparse hole or preallocated blocks "
+                                      "for huge files where only size and header matter (TXT, PDF, PNG, JPG; "
+                                      "default: random)")
+    generate_parser.add_argument('--padding', choices=('embedded', 'append', 'pixels'),
+                                 help="PNG and JPG: 'embedded' hides the padding in chunks or segments the image "
+                                      "format allows, 'append' adds it after the image, 'pixels' encodes a real "
+                                      "gradient-and-noise image sized to the target (needs NumPy; default: embedded)")
+    generate_parser.add_argument('--compress-ratio', type=float, metavar='RATIO',
+                                 help="TXT, SVG and PNG/JPG padding: mix random and repeated data so the file "
+                                      "compresses about RATIO times with gzip or zstd (default: incompressible)")
+    generate_parser.add_argument('--members', type=positive_int,
+                                 help="ZIP, TAR and TGZ: members per archive, split evenly (default: one per MB)")
+    generate_parser.add_argument('--dedup', nargs='?', const='auto', choices=CLONE_METHODS,
+                                 help="Generate one file and clone it for the rest of the batch: 'auto' tries a "
+                                      "reflink, then copy_file_range, then a plain copy; 'hardlink' links them "
+                                      "(default without a value: auto)")
+    generate_parser.add_argument('--patch-copies', action='store_true',
+                                 help="With --dedup, stamp each copy with its index so checksums differ "
+                                      "(not for DOCX or hardlinks)")
+    add_profile_arguments(generate_parser)
+    add_cache_arguments(generate_parser)
+    generate_parser.set_defaults(func=run_generate)
+    
+    run_parser = subparsers.add_parser('run', help="Generate the files described by a JSON or YAML manifest")
+    run_parser.add_argument('manifest', help="Path of the manifest (.json, or .yaml/.yml with PyYAML)")
+    run_parser.add_argument('--out', help="Output folder (default: the manifest's 'output', else 'generated')")
+    run_parser.add_argument('--workers', type=positive_int,
+                            help="Worker processes and threads (default: the manifest's 'workers', else 1)")
+    run_parser.add_argument('--threads', type=positive_int,
+                            help="Worker threads for TXT, PNG and JPG (default: same as --workers)")
+    add_profile_arguments(run_parser)
+    add_cache_arguments(run_parser)
+    run_parser.set_defaults(func=run_manifest_command)
+    
+    serve_parser = subparsers.add_parser('serve', help="Serve generated files over HTTP, e.g. GET /png/5MB?seed=42")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument('--port', type=int, default=8000, help="Port to listen on (default: 8000)")
+    serve_parser.add_argument('--threads', type=positive_int,
+                              help="Threads that run the generators (default: Python's thread pool size)")
+    serve_parser.add_argument('--max-size', type=size_argument, default=1024 * 1024,
+                              help="Largest file served; larger requests get 413 (default: 1GB)")
+    serve_parser.add_argument('--verbose', action='store_true', help="Log every request to stderr")
+    serve_parser.set_defaults(func=run_serve)
+    
+    tree_parser = subparsers.add_parser('tree', help="Generate a directory tree of many small files")
+    tree_parser.add_argument('--files', required=True, type=positive_int, help="Total number of files")
+    tree_parser.add_argument('--depth', type=int, default=2,
+                             help="Levels of directories; files go in the deepest level (default: 2)")
+    tree_parser.add_argument('--fanout', type=positive_int, default=10,
+                             help="Subdirectories per directory (default: 10)")
+    tree_parser.add_argument('--size', type=size_argument, default=4,
+                             help="File size, or the minimum with --max-size, e.g. 100B or 4KB (default: 4KB)")
+    tree_parser.add_argument('--max-size', type=size_argument,
+                             help="Draw each file's size between --size and this size")
+    tree_parser.add_argument('--distribution', choices=SIZE_DISTRIBUTIONS, default='log-uniform',
+                             help="Distribution of the sizes with --max-size (default: log-uniform)")
+    tree_parser.add_argument('--out', help="Root folder of the tree (default: 'generated/tree')")
+    tree_parser.add_argument('--workers', type=positive_int,
+                             help="Worker processes, each building whole subtrees (default: CPU count)")
+    tree_parser.add_argument('--seed', help="Seed for reproducible sizes and content (default: os.urandom)")
+    tree_parser.add_argument('--ext', default='bin', help="Extension of the file names (default: bin)")
+    tree_parser.set_defaults(func=run_tree_command)
+    
+    cache_parser = subparsers.add_parser('cache', help="Show, evict or clear the cache of generated files")
+    cache_parser.add_argument('--clear', action='store_true', help="Remove every cached file and reset the counters")
+    cache_parser.add_argument('--evict', action='store_true',
+                              help="Evict least recently used files until the cache fits its budget")
+    cache_parser.add_argument('--budget', metavar='SIZE', help="Budget for --evict and the report (default: 5GB)")
+    cache_parser.set_defaults(func=run_cache_command)
+    
+    return parser
+
+
+def main(argv=None):
+    """Main application entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # No arguments: keep the interactive menu as the default interface
+    if not argv:
+        run_menu()
+        return 0
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'generate':
+        # Every name is checked, since a pattern such as {index!s:.1} only
+        # repeats from the eleventh file and would overwrite earlier ones
+        first_index = {}
+        for index in range(args.count):
+            try:
+                name = args.name.format(index=index, type=args.type, ext=GENERATORS[args.type][1])
+            except (KeyError, IndexError, ValueError) as e:
+                parser.error(f"invalid --name pattern {args.name!r}: {e!r}")
+            if name in first_index:
+                parser.error(f"--name {args.name!r} gives files {first_index[name]} and {index} the same name "
+                             f"{name!r}; use the whole {{index}} so every name differs")
+            first_index[name] = index
+    profile, profile_out = getattr(args, 'profile', None), getattr(args, 'profile_out', None)
+    if profile is not None or profile_out is not None:
+        try:
+            instrument.configure(profile, profile_out)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    cache_before = None
+    if getattr(args, 'cache', None) is not None:
+        from file_generators import file_cache
+        try:
+            file_cache.configure(args.cache, args.cache_budget)
+        except ValueError as e:
+            parser.error(str(e))
+        cache_before = file_cache.stats()
+    
+    exit_code = args.func(args)
+    instrument.finish()
+    if cache_before is not None:
+        print_cache_summary(cache_before)
+    return exit_code
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import importlib
+
+
+# Module of each public generator function. Modules are imported on first
+# use, so a TXT-only run never loads python-docx, lxml or Pillow. The
+# iter_* functions yield a file's bytes instead of writing it, and
+# write_to and iter_chunks stream any type into a sink or as memoryviews.
+_GENERATOR_MODULES = {
+    'generate_txt': 'document_generator',
+    'generate_pdf': 'document_generator',
+    'generate_docx': 'document_generator',
+    'generate_png': 'image_generator',
+    'generate_jpg': 'image_generator',
+    'generate_svg': 'vector_generator',
+    'iter_txt': 'document_generator',
+    'iter_pdf': 'document_generator',
+    'iter_docx': 'document_generator',
+    'iter_png': 'image_generator',
+    'iter_jpg': 'image_generator',
+    'iter_svg': 'vector_generator',
+    'generate_zip': 'archive_generator',
+    'generate_tar': 'archive_generator',
+    'generate_tgz': 'archive_generator',
+    'generate_tree': 'tree_generator',
+    'iter_zip': 'archive_generator',
+    'iter_tar': 'archive_generator',
+    'iter_tgz': 'archive_generator',
+    'iter_chunks': 'stream',
+    'write_to': 'stream',
+}
+
+
+def _load_generator(function_name):
+    """Import the module of a generator function and return the function"""
+    module = importlib.import_module(f"{__name__}.{_GENERATOR_MODULES[function_name]}")
+    return getattr(module, function_name)
+
+
+def _lazy_generator(function_name):
+    """
+    Create a stand-in for a generator function that imports its module on
+    the first call.
+
+    Args:
+        function_name (str): Key of _GENERATOR_MODULES
+
+    Returns:
+        callable: Function with the generator's signature
+    """
+    def generator(*args, **kwargs):
+        return _load_generator(function_name)(*args, **kwargs)
+
+    generator.__name__ = generator.__qualname__ = function_name
+    generator.__doc__ = f"Lazy stand-in for file_generators.{_GENERATOR_MODULES[function_name]}.{function_name}"
+    return generator
+
+
+def __getattr__(name):
+    """Resolve 'from file_generators import generate_png' or 'write_to' without importing the other modules"""
+    if name in _GENERATOR_MODULES:
+        return _load_generator(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Supported file types: type -> (generator, default extension)
+GENERATORS = {
+    'txt': (_lazy_generator('generate_txt'), 'txt'),
+    'pdf': (_lazy_generator('generate_pdf'), 'pdf'),
+    'docx': (_lazy_generator('generate_docx'), 'docx'),
+    'png': (_lazy_generator('generate_png'), 'png'),
+    'jpg': (_lazy_generator('generate_jpg'), 'jpg'),
+    'svg': (_lazy_generator('generate_svg'), 'svg'),
+    'zip': (_lazy_generator('generate_zip'), 'zip'),
+    'tar': (_lazy_generator('generate_tar'), 'tar'),
+    'tgz': (_lazy_generator('generate_tgz'), 'tar.gz'),
+}
+
+# Types whose random data can be made compressible with compress_ratio;
+# for PNG and JPG it applies to the padding
+COMPRESSIBLE_TYPES = ('txt', 'svg', 'png', 'jpg')
+
+# Archive types, which take a member count
+ARCHIVE_TYPES = ('zip', 'tar', 'tgz')
@@ -0,0 +1,457 @@
+import os
+import struct
+import tarfile
+import zlib
+from array import array
+from utils import iter_random_bytes, get_random_source, write_stream_auto, check_fill_mode, create_generated_folder
+from file_generators import instrument
+
+
+# Members are named like batch outputs, numbered from 0 with at least this
+# many digits. Without an explicit count there is one member per
+# ARCHIVE_MEMBER_BYTES of the target.
+ARCHIVE_MEMBER_NAME = "file_{index:0{width}d}.bin"
+ARCHIVE_NAME_DIGITS = 5
+ARCHIVE_MEMBER_BYTES = 1024 * 1024
+
+# Every member is dated 1980-01-01 00:00, the earliest ZIP date, so seeded
+# archives are reproducible
+ARCHIVE_MTIME = 315532800
+ZIP_DOS_TIME = 0x0000
+ZIP_DOS_DATE = 0x0021
+
+# ZIP records. Members are stored (random data does not compress) with a
+# data descriptor after the data, so each CRC is computed while streaming
+# instead of in a second pass.
+ZIP_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+ZIP_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+ZIP_END_RECORD = struct.Struct('<4s4H2LH')
+ZIP_DESCRIPTOR = struct.Struct('<4s3L')
+ZIP_STORED = 0
+ZIP_DESCRIPTOR_FLAG = 0x0008
+ZIP_VERSION = 20
+ZIP_MADE_BY_UNIX = 3 << 8
+ZIP_FILE_ATTRIBUTES = 0o100644 << 16
+
+# ZIP64 records, used for the whole archive once it reaches 4 GB or 65535
+# members: the 32-bit fields then hold their maximum and the real values
+# go into extra fields and a second end record
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_MEMBER_LIMIT = 0xFFFF
+ZIP64_VERSION = 45
+ZIP64_EXTRA_ID = 0x0001
+ZIP64_LOCAL_EXTRA = struct.Struct('<2H2Q')
+ZIP64_CENTRAL_EXTRA = struct.Struct('<2H3Q')
+ZIP64_DESCRIPTOR = struct.Struct('<4sL2Q')
+ZIP64_END_RECORD = struct.Struct('<4sQ2H2L4Q')
+ZIP64_END_LOCATOR = struct.Struct('<4sLQL')
+
+# Central directory entries are collected into batches of about this size
+ZIP_DIRECTORY_BATCH = 64 * 1024
+
+# TAR blocks: a header block per member, data padded to whole blocks, and
+# two zero blocks at the end. Readers stop at those, so any remainder of
+# the target is more zeros after them.
+TAR_BLOCK = 512
+TAR_END_BLOCKS = 2
+
+# tar.gz is a gzip member of stored deflate blocks around the TAR stream,
+# so its size is known exactly: a 10-byte header, 5 bytes per block of up
+# to 65535 bytes and an 8-byte trailer (CRC-32 and size)
+GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+GZIP_TRAILER = struct.Struct('<2L')
+DEFLATE_STORED_BLOCK = struct.Struct('<B2H')
+DEFLATE_STORED_MAX = 65535
+
+
+def _member_count(target_bytes, members):
+    """Check a requested member count, or pick one member per ARCHIVE_MEMBER_BYTES"""
+    if members is None:
+        return max(target_bytes // ARCHIVE_MEMBER_BYTES, 1)
+    if isinstance(members, bool) or not isinstance(members, int) or members < 1:
+        raise ValueError(f"Member count must be a positive integer, got {members!r}")
+    return members
+
+
+def _member_name(index, members):
+    """Get the name of a member; all names in an archive have the same length"""
+    return ARCHIVE_MEMBER_NAME.format(index=index, width=max(ARCHIVE_NAME_DIGITS, len(str(members - 1))))
+
+
+def _split(total, count):
+    """Yield count sizes that differ by at most one and add up to total"""
+    base, extra = divmod(total, count)
+    for i in range(count):
+        yield base + 1 if i < extra else base
+
+
+def _check_layout(size_kb, label, requested, members, total_bytes):
+    """Warn when the target is too small for the requested members or for the format"""
+    if total_bytes > int(size_kb * 1024):
+        print(f"Warning: Requested size ({size_kb} KB) is smaller than minimum {label} size.")
+    elif members < requested:
+        print(f"Warning: Requested size ({size_kb} KB) only has room for {members} {label} members.")
+
+
+def _zip_framing(members, zip64):
+    """
+    Get the bytes a ZIP archive spends on framing.
+    
+    Args:
+        members (int): Number of members
+        zip64 (bool): Whether ZIP64 records are written
+    
+    Returns:
+        tuple: (per_member, end) with the local header, data descriptor
+            and central directory entry of each member, and the end records
+    """
+    name_len = len(_member_name(0, members))
+    per_member = ZIP_LOCAL_HEADER.size + ZIP_CENTRAL_HEADER.size + 2 * name_len
+    end = ZIP_END_RECORD.size
+    if zip64:
+        per_member += ZIP64_LOCAL_EXTRA.size + ZIP64_CENTRAL_EXTRA.size + ZIP64_DESCRIPTOR.size
+        end += ZIP64_END_RECORD.size + ZIP64_END_LOCATOR.size
+    else:
+        per_member += ZIP_DESCRIPTOR.size
+    return per_member, end
+
+
+def _zip_layout(target_bytes, members):
+    """
+    Fit members and their data into a ZIP archive of the target size.
+    
+    Args:
+        target_bytes (int): Target archive size in bytes
+        members (int): Requested number of members
+    
+    Returns:
+        tuple: (members, data_bytes, zip64); members is lowered when the
+            target cannot hold the framing of that many
+    """
+    zip64 = target_bytes >= ZIP64_LIMIT or members >= ZIP64_MEMBER_LIMIT
+    per_member, end = _zip_framing(members, zip64)
+    if members * per_member + end > target_bytes:
+        members = max((target_bytes - end) // per_member, 1)
+        zip64 = target_bytes >= ZIP64_LIMIT or members >= ZIP64_MEMBER_LIMIT
+        per_member, end = _zip_framing(members, zip64)
+    return members, max(target_bytes - members * per_member - end, 0), zip64
+
+
+def _zip_central_directory(members, sizes, crcs, zip64):
+    """
+    Yield the central directory and end records of a ZIP archive.
+    
+    Names and offsets follow from the member count and sizes, so only
+    the CRCs had to be kept while the members were written.
+    
+    Args:
+        members (int): Number of members
+        sizes (iterable): Data size of each member
+        crcs (array): CRC-32 of each member
+        zip64 (bool): Whether ZIP64 records are written
+    
+    Yields:
+        bytearray: Batches of directory entries, then the end records
+    """
+    version = ZIP64_VERSION if zip64 else ZIP_VERSION
+    local_extra = ZIP64_LOCAL_EXTRA.size if zip64 else 0
+    descriptor = ZIP64_DESCRIPTOR.size if zip64 else ZIP_DESCRIPTOR.size
+    
+    batch = bytearray()
+    offset = 0
+    directory_size = 0
+    for index, size, crc in zip(range(members), sizes, crcs):
+        name = _member_name(index, members).encode('ascii')
+        if zip64:
+            extra = ZIP64_CENTRAL_EXTRA.pack(ZIP64_EXTRA_ID, ZIP64_CENTRAL_EXTRA.size - 4, size, size, offset)
+            fields = (ZIP64_LIMIT, ZIP64_LIMIT, len(name), len(extra), 0, 0, 0, ZIP_FILE_ATTRIBUTES, ZIP64_LIMIT)
+        else:
+            extra = b''
+            fields = (size, size, len(name), 0, 0, 0, 0, ZIP_FILE_ATTRIBUTES, offset)
+        entry = ZIP_CENTRAL_HEADER.pack(b'PK\x01\x02', ZIP_MADE_BY_UNIX | version, version, ZIP_DESCRIPTOR_FLAG,
+                                        ZIP_STORED, ZIP_DOS_TIME, ZIP_DOS_DATE, crc, *fields)
+        batch += entry
+        batch += name
+        batch += extra
+        directory_size += len(entry) + len(name) + len(extra)
+        offset += ZIP_LOCAL_HEADER.size + len(name) + local_extra + size + descriptor
+        if len(batch) >= ZIP_DIRECTORY_BATCH:
+            yield batch
+            batch = bytearray()
+    
+    if zip64:
+        batch += ZIP64_END_RECORD.pack(b'PK\x06\x06', ZIP64_END_RECORD.size - 12, ZIP_MADE_BY_UNIX | version,
+                                       version, 0, 0, members, members, directory_size, offset)
+        batch += ZIP64_END_LOCATOR.pack(b'PK\x06\x07', 0, offset + directory_size, 1)
+        batch += ZIP_END_RECORD.pack(b'PK\x05\x06', 0, 0, ZIP64_MEMBER_LIMIT, ZIP64_MEMBER_LIMIT,
+                                     ZIP64_LIMIT, ZIP64_LIMIT, 0)
+    else:
+        batch += ZIP_END_RECORD.pack(b'PK\x05\x06', 0, 0, members, members, directory_size, offset, 0)
+    yield batch
+
+
+def iter_zip(size_kb, members=None, seed=None):
+    """
+    Yield the bytes of a ZIP archive of stored members with random data.
+    
+    Each member's local header is written before its data and a data
+    descriptor after it, so nothing is generated twice; only one CRC per
+    member is kept for the central directory. Archives of 4 GB or 65535
+    members and more use ZIP64 records.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        members (int, optional): Number of members (default: one per MB)
+        seed (int or str, optional): Seed for reproducible content
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    target_bytes = int(size_kb * 1024)
+    requested = _member_count(target_bytes, members)
+    members, data_bytes, zip64 = _zip_layout(target_bytes, requested)
+    per_member, end = _zip_framing(members, zip64)
+    _check_layout(size_kb, 'ZIP', requested, members, members * per_member + end + data_bytes)
+    
+    source = get_random_source(seed)
+    version = ZIP64_VERSION if zip64 else ZIP_VERSION
+    crcs = array('L')
+    for index, size in enumerate(_split(data_bytes, members)):
+        name = _member_name(index, members).encode('ascii')
+        if zip64:
+            extra = ZIP64_LOCAL_EXTRA.pack(ZIP64_EXTRA_ID, ZIP64_LOCAL_EXTRA.size - 4, 0, 0)
+            sizes = (ZIP64_LIMIT, ZIP64_LIMIT)
+        else:
+            extra = b''
+            sizes = (0, 0)
+        yield ZIP_LOCAL_HEADER.pack(b'PK\x03\x04', version, ZIP_DESCRIPTOR_FLAG, ZIP_STORED, ZIP_DOS_TIME,
+                                    ZIP_DOS_DATE, 0, *sizes, len(name), len(extra)) + name + extra
+        crc = 0
+        for chunk in instrument.timed_chunks(iter_random_bytes(size, source=source)):
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+        crcs.append(crc)
+        if zip64:
+            yield ZIP64_DESCRIPTOR.pack(b'PK\x07\x08', crc, size, size)
+        else:
+            yield ZIP_DESCRIPTOR.pack(b'PK\x07\x08', crc, size, size)
+    yield from _zip_central_directory(members, _split(data_bytes, members), crcs, zip64)
+
+
+def _tar_layout(target_bytes, members):
+    """
+    Fit members and their data into a TAR archive of the target size.
+    
+    Args:
+        target_bytes (int): Target archive size in bytes
+        members (int): Requested number of members
+    
+    Returns:
+        tuple: (members, data_blocks, end_bytes); end_bytes are the zeros
+            after the last member, at least TAR_END_BLOCKS blocks. Targets
+            below one header plus the end blocks (1536 bytes) get no members
+    """
+    blocks = target_bytes // TAR_BLOCK
+    if blocks < 1 + TAR_END_BLOCKS:
+        # No room for even one header: an empty archive is just its end blocks
+        return 0, 0, max(target_bytes, TAR_END_BLOCKS * TAR_BLOCK)
+    if members + TAR_END_BLOCKS > blocks:
+        members = max(blocks - TAR_END_BLOCKS, 1)
+    data_blocks = max(blocks - TAR_END_BLOCKS - members, 0)
+    end_bytes = max(target_bytes - (members + data_blocks) * TAR_BLOCK, TAR_END_BLOCKS * TAR_BLOCK)
+    return members, data_blocks, end_bytes
+
+
+def _tar_header(name, size):
+    """Encode the header block of a regular file member"""
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = ARCHIVE_MTIME
+    info.mode = 0o644
+    # GNU headers store sizes of 8 GB and more in base-256 instead of a PAX record
+    return info.tobuf(tarfile.GNU_FORMAT)
+
+
+def _iter_tar_members(members, data_blocks, end_bytes, source):
+    """Yield the member headers, member data and end of a TAR archive laid out by _tar_layout"""
+    for index, blocks in enumerate(_split(data_blocks, members) if members else ()):
+        yield _tar_header(_member_name(index, members), blocks * TAR_BLOCK)
+        yield from instrument.timed_chunks(iter_random_bytes(blocks * TAR_BLOCK, source=source))
+    yield bytes(end_bytes)
+
+
+def iter_tar(size_kb, members=None, seed=None):
+    """
+    Yield the bytes of a TAR archive with random member data.
+    
+    Member sizes are whole blocks, so there is no padding inside the
+    archive; the remainder of the target goes after the end-of-archive
+    blocks, where readers stop. The smallest TAR is the two end blocks
+    (1024 bytes), and targets below 1536 bytes give an empty archive.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        members (int, optional): Number of members (default: one per MB)
+        seed (int or str, optional): Seed for reproducible content
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    target_bytes = int(size_kb * 1024)
+    requested = _member_count(target_bytes, members)
+    members, data_blocks, end_bytes = _tar_layout(target_bytes, requested)
+    _check_layout(size_kb, 'TAR', requested, members, (members + data_blocks) * TAR_BLOCK + end_bytes)
+    yield from _iter_tar_members(members, data_blocks, end_bytes, get_random_source(seed))
+
+
+def _iter_gzip_stored(chunks, size_bytes, block_count):
+    """
+    Wrap a stream in a gzip member made of stored deflate blocks.
+    
+    Args:
+        chunks (iterable): Bytes-like chunks adding up to size_bytes
+        size_bytes (int): Total size of the stream
+        block_count (int): Number of stored blocks, at least
+            size_bytes / DEFLATE_STORED_MAX
+    
+    Yields:
+        bytes-like: Chunks of the gzip member, in order
+    """
+    yield GZIP_HEADER
+    block_sizes = _split(size_bytes, block_count)
+    blocks_left = block_count
+    block_left = 0
+    crc = 0
+    for chunk in chunks:
+        with memoryview(chunk) as view:
+            crc = zlib.crc32(view, crc)
+            position = 0
+            while position < len(view):
+                if block_left == 0:
+                    block_left = next(block_sizes)
+                    blocks_left -= 1
+                    yield DEFLATE_STORED_BLOCK.pack(blocks_left == 0, block_left, block_left ^ 0xFFFF)
+                take = min(block_left, len(view) - position)
+                yield view[position:position + take]
+                position += take
+                block_left -= take
+    # Only an empty stream has a block left here
+    for _ in range(blocks_left):
+        yield DEFLATE_STORED_BLOCK.pack(blocks_left == 1, 0, 0xFFFF)
+        blocks_left -= 1
+    yield GZIP_TRAILER.pack(crc, size_bytes & 0xFFFFFFFF)
+
+
+def iter_tgz(size_kb, members=None, seed=None):
+    """
+    Yield the bytes of a gzip-compressed TAR archive with random member data.
+    
+    Random data does not compress, so the TAR stream is wrapped in stored
+    deflate blocks, whose framing is known in advance. That makes the
+    size exact and costs no compression time. The smallest TAR.GZ holds
+    an empty TAR (1047 bytes), and targets below 1559 bytes hold no members.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        members (int, optional): Number of members (default: one per MB)
+        seed (int or str, optional): Seed for reproducible content
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    target_bytes = int(size_kb * 1024)
+    requested = _member_count(target_bytes, members)
+    framing = len(GZIP_HEADER) + GZIP_TRAILER.size
+    block_count = max(-(-(target_bytes - framing) // (DEFLATE_STORED_MAX + DEFLATE_STORED_BLOCK.size)), 1)
+    tar_target = max(target_bytes - framing - block_count * DEFLATE_STORED_BLOCK.size, 0)
+    
+    members, data_blocks, end_bytes = _tar_layout(tar_target, requested)
+    tar_bytes = (members + data_blocks) * TAR_BLOCK + end_bytes
+    block_count = max(block_count, -(-tar_bytes // DEFLATE_STORED_MAX))
+    _check_layout(size_kb, 'TAR.GZ', requested, members,
+                  framing + block_count * DEFLATE_STORED_BLOCK.size + tar_bytes)
+    tar_chunks = _iter_tar_members(members, data_blocks, end_bytes, get_random_source(seed))
+    yield from _iter_gzip_stored(tar_chunks, tar_bytes, block_count)
+
+
+def _generate_archive(label, iter_archive, file_path, size_kb, members, seed, fill, verbose):
+    """Write an archive from its iterator in a single pass"""
+    if fill != 'random':
+        check_fill_mode(fill)
+        raise ValueError(f"{label} files do not support fill='{fill}', only 'random'")
+    
+    # Create generated folder and get full path
+    generated_folder = create_generated_folder()
+    full_path = os.path.join(generated_folder, file_path)
+    
+    try:
+        with open(full_path, 'wb') as f:
+            write_stream_auto(instrument.timed_file(f), iter_archive(size_kb, members, seed), int(size_kb * 1024))
+        
+        if verbose:
+            print(f"Successfully generated {label} file: {full_path} ({size_kb} KB)")
+        return full_path
+    
+    except Exception as e:
+        if verbose:
+            print(f"Error generating {label} file: {e}")
+        raise
+
+
+def generate_zip(file_path, size_kb, members=None, seed=None, fill='random', verbose=True):
+    """
+    Generate a ZIP archive of stored members with random data.
+    
+    Args:
+        file_path (str): Path where the file will be saved
+        size_kb (int): Target file size in kilobytes
+        members (int, optional): Number of members (default: one per MB);
+            fewer are written if the framing of that many does not fit
+        seed (int or str, optional): Seed for reproducible content
+        fill (str): Only 'random' is supported
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
+    """
+    return _generate_archive('ZIP', iter_zip, file_path, size_kb, members, seed, fill, verbose)
+
+
+def generate_tar(file_path, size_kb, members=None, seed=None, fill='random', verbose=True):
+    """
+    Generate a TAR archive with random member data.
+    
+    Args:
+        file_path (str): Path where the file will be saved
+        size_kb (int): Target file size in kilobytes
+        members (int, optional): Number of members (default: one per MB);
+            fewer are written if the headers of that many do not fit, and
+            none below 1.5 KB, the size of one header and the end blocks
+        seed (int or str, optional): Seed for reproducible content
+        fill (str): Only 'random' is supported
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
+    """
+    return _generate_archive('TAR', iter_tar, file_path, size_kb, members, seed, fill, verbose)
+
+
+def generate_tgz(file_path, size_kb, members=None, seed=None, fill='random', verbose=True):
+    """
+    Generate a gzip-compressed TAR archive (.tar.gz) with random member data.
+    
+    Args:
+        file_path (str): Path where the file will be saved
+        size_kb (int): Target file size in kilobytes
+        members (int, optional): Number of members (default: one per MB);
+            fewer are written if the headers of that many do not fit, and
+            none below 1.5 KB, the size of one header and the end blocks
+        seed (int or str, optional): Seed for reproducible content
+        fill (str): Only 'random' is supported
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
+    """
+    return _generate_archive('TAR.GZ', iter_tgz, file_path, size_kb, members, seed, fill, verbose)
@@ -0,0 +1,118 @@
+import os
+import json
+import hashlib
+
+from utils import get_cache_folder
+from file_generators.header_cache import _write_atomic
+
+
+# Persist size models under the user cache folder so that new processes
+# can aim for the target on their first render. Set
+# FILEGEN_CALIBRATION_CACHE=0 to keep them in memory only.
+PERSIST_MODELS = os.environ.get("FILEGEN_CALIBRATION_CACHE", "1") != "0"
+
+# Weight of a new measurement in the stored bytes-per-unit estimate
+MODEL_SMOOTHING = 0.5
+
+# In-memory models: (format, version) -> model dict
+_models = {}
+
+
+def get_model(fmt, version):
+    """
+    Get the size model of a format, if one has been recorded.
+    
+    A model predicts the output size of a render as
+    base + bytes_per_unit * units, where units is whatever the generator
+    scales, e.g. characters of body text. Lookups go to the in-memory
+    cache first, then to the on-disk cache.
+    
+    Args:
+        fmt (str): Format name, e.g. 'docx'
+        version (str): Identifies the libraries and layout that produce the
+            bytes; a new version starts a new model
+    
+    Returns:
+        dict: {'base': int, 'bytes_per_unit': float, 'samples': int}, or None
+    """
+    key = (fmt, version)
+    model = _models.get(key)
+    if model is not None or not PERSIST_MODELS:
+        return model
+    
+    try:
+        with open(_disk_path(key), 'r', encoding='utf-8') as f:
+            model = json.load(f)
+        model = {'base': int(model['base']),
+                 'bytes_per_unit': float(model['bytes_per_unit']),
+                 'samples': int(model['samples'])}
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing or unreadable: calibrate again
+        return None
+    if model['bytes_per_unit'] <= 0:
+        return None
+    
+    _models[key] = model
+    return model
+
+
+def predict_units(model, target_bytes):
+    """
+    Get the number of units a render needs to reach target_bytes.
+    
+    Args:
+        model (dict): Model returned by get_model
+        target_bytes (int): Desired output size
+    
+    Returns:
+        int: Predicted unit count, 0 if the target is below the base size
+    """
+    return max(int((target_bytes - model['base']) / model['bytes_per_unit']), 0)
+
+
+def record_sample(fmt, version, base, units, size, persist=True):
+    """
+    Update the size model of a format with a measured render.
+    
+    Args:
+        fmt (str): Format name passed to get_model
+        version (str): Version passed to get_model
+        base (int): Output size with zero units
+        units (int): Units in the measured render
+        size (int): Output size of the measured render
+        persist (bool): Also write the model to the on-disk cache
+    
+    Returns:
+        dict: The updated model, or None if the render says nothing about the slope
+    """
+    key = (fmt, version)
+    model = get_model(fmt, version)
+    bytes_per_unit = (size - base) / units if units > 0 else 0
+    
+    if bytes_per_unit <= 0:
+        # Nothing to learn about the slope from this render
+        if model is None:
+            return None
+        model = dict(model, base=base)
+    elif model is None:
+        model = {'base': base, 'bytes_per_unit': bytes_per_unit, 'samples': 1}
+    else:
+        blended = (1 - MODEL_SMOOTHING) * model['bytes_per_unit'] + MODEL_SMOOTHING * bytes_per_unit
+        model = {'base': base, 'bytes_per_unit': blended, 'samples': model['samples'] + 1}
+    
+    _models[key] = model
+    if persist and PERSIST_MODELS:
+        _write_atomic(_disk_path(key), json.dumps(model, sort_keys=True).encode('utf-8'))
+    return model
+
+
+def clear_models():
+    """Drop all in-memory models (persisted models are kept)"""
+    _models.clear()
+
+
+def _disk_path(key):
+    """Get the file that persists the model for a cache key"""
+    fmt, version = key
+    digest = hashlib.sha256(repr((fmt, version)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(get_cache_folder("calibration"), f"{fmt}-{digest}.json")
@@ -0,0 +1,324 @@
+import os
+import struct
+import zlib
+
+from utils import create_generated_folder
+from file_generators import GENERATORS
+
+
+# Ways to materialize a copy. 'auto' tries a reflink, then an in-kernel
+# copy, then a plain copy; 'hardlink' shares one inode between all files.
+CLONE_METHODS = ('auto', 'reflink', 'copy', 'hardlink')
+
+# ioctl request that makes a file share the extents of another (Linux
+# FICLONE, supported by Btrfs, XFS, bcachefs and others)
+FICLONE = 0x40049409
+
+# Bytes overwritten in each patched copy; the copy index as 8 hex digits
+PATCH_BYTES = 8
+
+# How far into a PDF to look for the padding stream; the visible page and
+# fixed objects always fit in this
+PDF_HEAD_SCAN = 64 * 1024
+
+# Start of the PDF padding object, see document_generator._pdf_layout
+PDF_PAD_OBJECT = b"6 0 obj\n<< /Type /XObject /Subtype /Form /BBox [0 0 0 0] /Length "
+
+# CRC register maps for runs of zero bytes, built lazily per run length
+_zero_run_operators = {}
+
+
+def _reflink(source_path, dest_path):
+    """Clone a file with the FICLONE ioctl, sharing its disk blocks"""
+    import fcntl
+    with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _copy_range(source_path, dest_path):
+    """Copy a file inside the kernel with copy_file_range"""
+    with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def clone_file(source_path, dest_path, method='auto'):
+    """
+    Materialize a copy of a file as cheaply as the filesystem allows.
+    
+    Args:
+        source_path (str): File to copy
+        dest_path (str): Path of the copy; an existing file is replaced
+        method (str): One of CLONE_METHODS
+    
+    Returns:
+        str: Method actually used: 'reflink', 'copy_file_range', 'copy' or 'hardlink'
+    """
+    if method not in CLONE_METHODS:
+        raise ValueError(f"Unknown clone method '{method}', expected one of {', '.join(CLONE_METHODS)}")
+    
+    if method == 'hardlink':
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+        os.link(source_path, dest_path)
+        return 'hardlink'
+    
+    if method == 'reflink':
+        _reflink(source_path, dest_path)
+        return 'reflink'
+    
+    if method == 'auto':
+        # Not every filesystem or platform can share extents
+        try:
+            _reflink(source_path, dest_path)
+            return 'reflink'
+        except (ImportError, OSError):
+            pass
+    
+    if hasattr(os, 'copy_file_range'):
+        try:
+            _copy_range(source_path, dest_path)
+            return 'copy_file_range'
+        except OSError:
+            pass
+    import shutil
+    shutil.copyfile(source_path, dest_path)
+    return 'copy'
+
+
+def _carry_through_zeros(register, length):
+    """
+    Apply the linear map that length zero bytes have on a CRC-32 register.
+    
+    Every copy of a batch patches the same spot, so the map is built once
+    per run length by repeated squaring and reused.
+    
+    Args:
+        register (int): CRC register value (or change in value)
+        length (int): Number of zero bytes
+    
+    Returns:
+        int: The register after the zero bytes
+    """
+    from file_generators.image_generator import _gf2_times
+    
+    operator = _zero_run_operators.get(length)
+    if operator is None:
+        mask = 0xFFFFFFFF
+        power = [~zlib.crc32(b'\0', ~(1 << bit) & mask) & mask for bit in range(32)]
+        operator = [1 << bit for bit in range(32)]
+        remaining = length
+        while remaining:
+            if remaining & 1:
+                operator = [_gf2_times(power, column) for column in operator]
+            remaining >>= 1
+            if remaining:
+                power = [_gf2_times(power, column) for column in power]
+        _zero_run_operators[length] = operator
+    return _gf2_times(operator, register)
+
+
+def _trailing_patch_offset(f, file_type):
+    """Offset of the last PATCH_BYTES of raw data appended after an image template"""
+    # Importing the image module registers the templates
+    from file_generators.image_generator import get_template
+    
+    template_size = len(get_template(file_type))
+    size = os.fstat(f.fileno()).st_size
+    if size - template_size < PATCH_BYTES:
+        raise ValueError(f"{file_type.upper()} file is too small to patch")
+    return size - PATCH_BYTES, None
+
+
+def _patch_offset_txt(f):
+    """Random bytes throughout: patch the end"""
+    size = os.fstat(f.fileno()).st_size
+    if size < PATCH_BYTES:
+        raise ValueError("TXT file is too small to patch")
+    return size - PATCH_BYTES, None
+
+
+def _patch_offset_svg(f):
+    """Patch the start of the padding comment body, if there is one"""
+    from file_generators.vector_generator import SVG_HEADER, SVG_FOOTER, SVG_COMMENT_OPEN, SVG_COMMENT_CLOSE
+    
+    header = SVG_HEADER.encode('utf-8')
+    comment_open = SVG_COMMENT_OPEN.encode('utf-8')
+    framing = len(header) + len(comment_open) + len(SVG_COMMENT_CLOSE.encode('utf-8')) + len(SVG_FOOTER.encode('utf-8'))
+    size = f.seek(0, os.SEEK_END)
+    f.seek(len(header))
+    # Tiny files are padded with whitespace instead of a comment, and a
+    # short comment body has no room for the stamp
+    if f.read(len(comment_open)) != comment_open or size - framing < PATCH_BYTES:
+        return None
+    return len(header) + len(comment_open), None
+
+
+def _patch_offset_pdf(f):
+    """Patch the first comment line of the padding stream, right after its '%'"""
+    head = f.read(PDF_HEAD_SCAN)
+    start = head.find(PDF_PAD_OBJECT)
+    if start < 0:
+        raise ValueError("PDF padding stream not found")
+    length_end = head.index(b" >>", start)
+    pad_len = int(head[start + len(PDF_PAD_OBJECT):length_end])
+    if pad_len < 1 + PATCH_BYTES:
+        raise ValueError("PDF file is too small to patch")
+    return head.index(b"stream\n", length_end) + len(b"stream\n") + 1, None
+
+
+def _patch_offset_png(f):
+    """Patch the first padding chunk and report where its CRC is"""
+    from file_generators.image_generator import PNG_PAD_CHUNK_TYPE, PNG_CHUNK_OVERHEAD
+    
+    offset = 8
+    size = os.fstat(f.fileno()).st_size
+    while offset + PNG_CHUNK_OVERHEAD <= size:
+        f.seek(offset)
+        length, chunk_type = struct.unpack('>I4s', f.read(8))
+        if chunk_type == PNG_PAD_CHUNK_TYPE and length >= PATCH_BYTES:
+            return offset + 8, (offset + 8 + length, length)
+        if chunk_type == b'IEND':
+            break
+        offset += PNG_CHUNK_OVERHEAD + length
+    # Padding appended after IEND
+    return _trailing_patch_offset(f, 'png')
+
+
+def _patch_offset_jpg(f):
+    """Patch the first COM padding segment, or data appended after EOI"""
+    offset = 2
+    while True:
+        f.seek(offset)
+        marker, length = struct.unpack('>2sH', f.read(4))
+        if marker == b'\xff\xfe' and length - 2 >= PATCH_BYTES:
+            return offset + 4, None
+        if not (marker[0] == 0xFF and (0xE0 <= marker[1] <= 0xEF or marker[1] == 0xFE)):
+            break
+        offset += 2 + length
+    return _trailing_patch_offset(f, 'jpeg')
+
+
+def _patch_offset_tar(f):
+    """Patch the start of the first member's data, which TAR does not checksum"""
+    import tarfile
+    from file_generators.archive_generator import TAR_BLOCK
+    
+    # Archives too small for a member hold only the zero end blocks
+    try:
+        info = tarfile.TarInfo.frombuf(f.read(TAR_BLOCK), 'utf-8', 'surrogateescape')
+    except tarfile.HeaderError:
+        return None
+    if info.size < PATCH_BYTES:
+        return None
+    return TAR_BLOCK, None
+
+
+# Where each format can take a per-copy stamp without becoming invalid.
+# DOCX is a zip of deflated, CRC-checked members, so it has no such spot,
+# and neither do ZIP and tar.gz, whose data is covered by CRCs.
+_PATCH_LOCATORS = {
+    'txt': _patch_offset_txt,
+    'svg': _patch_offset_svg,
+    'pdf': _patch_offset_pdf,
+    'png': _patch_offset_png,
+    'jpg': _patch_offset_jpg,
+    'tar': _patch_offset_tar,
+}
+
+
+def patch_copy(file_path, file_type, index):
+    """
+    Overwrite a few padding bytes of a copy so its checksum differs.
+    
+    The copy index is written as PATCH_BYTES hex digits into the random
+    padding of the format, so the file stays valid. For PNG the CRC of the
+    patched chunk is adjusted arithmetically instead of being recomputed.
+    An SVG too small for a padding comment, or a TAR without member data
+    to stamp, has nowhere to put the stamp and is left as it is.
+    
+    Args:
+        file_path (str): Copy to patch in place
+        file_type (str): Key of file_generators.GENERATORS
+        index (int): Number of the copy, makes the patch unique
+    
+    Returns:
+        bool: Whether the copy was patched
+    """
+    if file_type not in _PATCH_LOCATORS:
+        raise ValueError(f"{file_type.upper()} copies cannot be patched")
+    stamp = b"%08x" % (index & 0xFFFFFFFF)
+    
+    with open(file_path, 'r+b') as f:
+        locator = _PATCH_LOCATORS[file_type](f)
+        if locator is None:
+            return False
+        offset, crc_field = locator
+        f.seek(offset)
+        old = f.read(PATCH_BYTES)
+        
+        if crc_field is not None:
+            # CRC is affine, so the change in the CRC only depends on the
+            # XOR of old and new bytes, carried through the rest of the chunk
+            crc_offset, data_len = crc_field
+            diff = bytes(a ^ b for a, b in zip(old, stamp))
+            register_change = zlib.crc32(diff) ^ zlib.crc32(bytes(PATCH_BYTES))
+            delta = _carry_through_zeros(register_change, data_len - PATCH_BYTES)
+            f.seek(crc_offset)
+            crc, = struct.unpack('>I', f.read(4))
+            f.seek(crc_offset)
+            f.write(struct.pack('>I', crc ^ delta))
+        
+        f.seek(offset)
+        f.write(stamp)
+    return True
+
+
+def generate_copies(file_type, file_paths, size_kb, method='auto', patch=False, **options):
+    """
+    Generate one canonical file and materialize the others as clones of it.
+    
+    Args:
+        file_type (str): Key of file_generators.GENERATORS
+        file_paths (list): Output paths; the first one gets the canonical file
+        size_kb (float): Target file size in kilobytes
+        method (str): One of CLONE_METHODS
+        patch (bool): Stamp each clone with its index so checksums differ
+        **options: Generator keyword arguments, e.g. seed or fill
+    
+    Returns:
+        list: (full_path, how) pairs in path order, where how is 'generated'
+            for the canonical file and the clone method for the rest
+    """
+    if file_type not in GENERATORS:
+        raise ValueError(f"Unknown file type '{file_type}', expected one of {', '.join(sorted(GENERATORS))}")
+    if method not in CLONE_METHODS:
+        raise ValueError(f"Unknown clone method '{method}', expected one of {', '.join(CLONE_METHODS)}")
+    if patch and method == 'hardlink':
+        raise ValueError("Hardlinked copies share their data and cannot be patched")
+    if patch and file_type not in _PATCH_LOCATORS:
+        raise ValueError(f"{file_type.upper()} copies cannot be patched")
+    if not file_paths:
+        return []
+    
+    generator, _ = GENERATORS[file_type]
+    from file_generators import file_cache
+    if file_cache.enabled():
+        canonical, _ = file_cache.generate_cached(file_type, file_paths[0], size_kb, verbose=False, **options)
+    else:
+        canonical = generator(file_paths[0], size_kb, verbose=False, **options)
+    results = [(canonical, 'generated')]
+    
+    generated_folder = create_generated_folder()
+    for index, file_path in enumerate(file_paths[1:], start=1):
+        full_path = os.path.join(generated_folder, file_path)
+        how = clone_file(canonical, full_path, method)
+        if patch:
+            patch_copy(full_path, file_type, index)
+        results.append((full_path, how))
+    
+    return results
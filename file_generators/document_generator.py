@@ -1,135 +1,558 @@
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils import generate_random_bytes, generate_random_text, create_generated_folder
-from fpdf import FPDF
-from docx import Document
+from utils import (iter_random_bytes, iter_random_text, write_stream, write_stream_auto, generate_random_text,
+                   get_random_source, extend_file, check_fill_mode, create_generated_folder, get_package_version,
+                   CHUNK_SIZE)
+from file_generators import instrument
 from io import BytesIO
+import string
+import struct
+import time
+import zlib
+
+
+# Text drawn on the visible PDF page and in its padding stream. Parentheses
+# and backslashes are left out so strings need no escaping.
+PDF_TEXT_ALPHABET = string.ascii_letters + string.digits + ' .,!?'
+PDF_VISIBLE_LINES = 50
+PDF_VISIBLE_LINE_CHARS = 90
+
+# Length of each comment line in the PDF padding stream
+PDF_PAD_LINE = 128
+
+# Allowed relative deviation of a generated DOCX from its target size
+DOCX_SIZE_TOLERANCE = 0.01
+
+# Upper bound on full serializations per DOCX, including the empty render
+DOCX_MAX_RENDERS = 8
+
+# Characters of the calibration probe and of each body paragraph
+DOCX_PROBE_CHARS = 256 * 1024
+DOCX_PARAGRAPH_CHARS = 2000
+
+# Body text alphabet. Tabs and newlines are left out because python-docx
+# turns each of them into a separate <w:tab/> or <w:br/> element.
+DOCX_ALPHABET = string.ascii_letters + string.digits + string.punctuation + ' '
+
+# Part of the DOCX size-model key; bump it when the body layout changes so
+# models calibrated on the old layout are not reused
+DOCX_LAYOUT_VERSION = 2
+
+# DOS time and date written into seeded DOCX archives (1980-01-01 00:00)
+DOCX_FIXED_ZIP_TIME = 0x0000
+DOCX_FIXED_ZIP_DATE = 0x0021
+
+
+def iter_txt(size_kb, seed=None, compress_ratio=None):
+    """
+    Yield the bytes of a plain text file with random data.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        seed (int or str, optional): Seed for reproducible content
+        compress_ratio (float, optional): Make the file compress about
+            this many times with gzip or zstd instead of not at all
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    target_bytes = int(size_kb * 1024)
+    chunks = iter_random_bytes(target_bytes, source=get_random_source(seed), compress_ratio=compress_ratio)
+    yield from instrument.timed_chunks(chunks)
 
 
-def generate_txt(file_path, size_kb):
+def generate_txt(file_path, size_kb, seed=None, compress_ratio=None, fill='random', verbose=True):
     """
     Generate a plain text file with random data.
     
     Args:
         file_path (str): Path where the file will be saved
         size_kb (int): Target file size in kilobytes
+        seed (int or str, optional): Seed for reproducible content
+        compress_ratio (float, optional): Make the file compress about
+            this many times with gzip or zstd (random fill only)
+        fill (str): 'random' writes random bytes; 'sparse' and 'allocate'
+            produce a file of zeros without writing them
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
     """
+    check_fill_mode(fill, compress_ratio)
+    
     # Create generated folder and get full path
     generated_folder = create_generated_folder()
     full_path = os.path.join(generated_folder, file_path)
     
-    # Generate random bytes
-    random_data = generate_random_bytes(size_kb)
-    
-    # Write to file
+    # Stream random bytes to the file chunk by chunk
+    target_bytes = int(size_kb * 1024)
     with open(full_path, 'wb') as f:
-        f.write(random_data)
+        f = instrument.timed_file(f)
+        if fill == 'random':
+            write_stream_auto(f, iter_txt(size_kb, seed, compress_ratio), target_bytes)
+        else:
+            with instrument.phase('write'):
+                extend_file(f, target_bytes, fill)
+    
+    if verbose:
+        print(f"Successfully generated TXT file: {full_path} ({size_kb} KB)")
+    
+    return full_path
+
+
+def _pdf_page_content(line_count, source):
+    """Build the content stream of the visible page: a title and random text lines"""
+    lines = [b"BT /F1 16 Tf 72 770 Td (Random PDF Content) Tj ET",
+             b"BT /F1 10 Tf 72 740 Td 13 TL"]
+    for _ in range(line_count):
+        text = generate_random_text(PDF_VISIBLE_LINE_CHARS, PDF_TEXT_ALPHABET, source)
+        lines.append(b"(" + text.encode('ascii') + b") Tj T*")
+    lines.append(b"ET")
+    return b"\n".join(lines)
+
+
+def _pdf_layout(content):
+    """
+    Lay out everything except the padding stream data.
+    
+    The document is a single page plus one unpainted form XObject that
+    carries the padding. That object comes last, so only its /Length and
+    the startxref offset depend on the padding size. When a digit count
+    flips between two lengths, spaces in the trailer make up the odd byte.
+    
+    Args:
+        content (bytes): Content stream of the visible page
+        
+    Returns:
+        tuple: (head, frame) where head is the bytes of all fixed objects and
+            frame(pad_len, slack) returns the bytes right before and right after
+            the padding data; slack adds spaces inside the trailer dictionary
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 4 0 R >> /XObject << /Pad 6 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+    ]
     
-    print(f"Successfully generated TXT file: {full_path} ({size_kb} KB)")
+    head = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(head))
+        head += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    offsets.append(len(head))
+    head = bytes(head)
+    
+    xref = b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1)
+    xref += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    
+    def frame(pad_len, slack=0):
+        before = b"6 0 obj\n<< /Type /XObject /Subtype /Form /BBox [0 0 0 0] /Length %d >>\nstream\n" % pad_len
+        xref_offset = len(head) + len(before) + pad_len + len(b"\nendstream\nendobj\n")
+        after = (b"\nendstream\nendobj\n" + xref +
+                 b"trailer\n<< /Size %d /Root 1 0 R " % (len(offsets) + 1) + b" " * slack +
+                 b">>\nstartxref\n%d\n%%%%EOF\n" % xref_offset)
+        return before, after
+    
+    return head, frame
+
+
+def _solve_pdf_padding(head, frame, target_bytes):
+    """
+    Find the padding length (and dictionary slack) that gives exactly target_bytes.
+    
+    Returns:
+        tuple: (pad_len, slack), or None if the target is below the minimum size
+    """
+    for slack in range(3):
+        before, after = frame(0, slack)
+        pad_len = target_bytes - len(head) - len(before) - len(after)
+        # Each step fixes the digit counts of /Length and startxref
+        for _ in range(4):
+            if pad_len < 0:
+                return None
+            before, after = frame(pad_len, slack)
+            total = len(head) + len(before) + pad_len + len(after)
+            if total == target_bytes:
+                return pad_len, slack
+            pad_len += target_bytes - total
+    return None
+
+
+def _iter_pdf_padding(size_bytes, source):
+    """
+    Yield the padding stream data: comment lines of random text.
+    
+    Every PDF_PAD_LINE bytes start with '%' and end with a newline, so the
+    data stays valid content-stream syntax even if a reader parses it.
+    
+    Args:
+        size_bytes (int): Number of padding bytes to produce
+        source (callable): Byte source, see utils.get_random_source
+        
+    Yields:
+        bytearray: Chunks of padding data
+    """
+    chunk_size = CHUNK_SIZE - CHUNK_SIZE % PDF_PAD_LINE
+    for text in iter_random_text(size_bytes, PDF_TEXT_ALPHABET, chunk_size, source):
+        chunk = bytearray(text)
+        n = len(chunk)
+        chunk[0::PDF_PAD_LINE] = b"%" * len(range(0, n, PDF_PAD_LINE))
+        chunk[PDF_PAD_LINE - 1::PDF_PAD_LINE] = b"\n" * len(range(PDF_PAD_LINE - 1, n, PDF_PAD_LINE))
+        yield chunk
 
 
-def generate_pdf(file_path, size_kb):
+def _pdf_document(size_kb, source):
+    """
+    Build everything of a PDF except the padding stream data.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        source (callable): Byte source, see utils.get_random_source
+    
+    Returns:
+        tuple: (head, before, pad_len, after); the file is head, before,
+            pad_len bytes of padding data and after, in that order
+    """
+    target_bytes = int(size_kb * 1024)
+    
+    # Visible text takes at most a quarter of the file
+    line_count = min(PDF_VISIBLE_LINES, target_bytes // (4 * PDF_VISIBLE_LINE_CHARS))
+    with instrument.phase('synthesize'):
+        content = _pdf_page_content(line_count, source)
+    with instrument.phase('serialize'):
+        head, frame = _pdf_layout(content)
+        solution = _solve_pdf_padding(head, frame, target_bytes)
+    if solution is None:
+        print(f"Warning: Requested size ({size_kb} KB) is smaller than minimum PDF size.")
+        solution = (0, 0)
+    pad_len, slack = solution
+    before, after = frame(pad_len, slack)
+    return head, before, pad_len, after
+
+
+def iter_pdf(size_kb, seed=None):
+    """
+    Yield the bytes of a PDF file with random text content.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        seed (int or str, optional): Seed for reproducible content
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    source = get_random_source(seed)
+    head, before, pad_len, after = _pdf_document(size_kb, source)
+    yield head
+    yield before
+    yield from instrument.timed_chunks(_iter_pdf_padding(pad_len, source))
+    yield after
+
+
+def generate_pdf(file_path, size_kb, seed=None, fill='random', verbose=True):
     """
     Generate a PDF file with random text content.
     
+    The PDF is written directly instead of through a layout engine: one
+    page shows a title and some random text, and an uncompressed padding
+    stream brings the file to exactly the requested size. The padding is
+    streamed, so memory use is constant even for multi-GB files.
+    
     Args:
         file_path (str): Path where the file will be saved
         size_kb (int): Target file size in kilobytes
+        seed (int or str, optional): Seed for reproducible content
+        fill (str): 'random' fills the padding stream with comment lines;
+            'sparse' and 'allocate' leave it as zeros without writing them.
+            The stream is never painted, so either way the PDF stays valid.
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
     """
+    check_fill_mode(fill)
+    
     # Create generated folder and get full path
     generated_folder = create_generated_folder()
     full_path = os.path.join(generated_folder, file_path)
     
     try:
-        # Create PDF object
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Helvetica", size=12)
+        start = time.perf_counter()
         
-        # Add title
-        pdf.cell(0, 10, "Random PDF Content", ln=True)
-        pdf.ln(10)
+        # Write structure and padding in one pass
+        with open(full_path, 'wb') as f:
+            f = instrument.timed_file(f)
+            if fill == 'random':
+                write_stream_auto(f, iter_pdf(size_kb, seed), int(size_kb * 1024))
+            else:
+                head, before, pad_len, after = _pdf_document(size_kb, get_random_source(seed))
+                f.write(head)
+                f.write(before)
+                with instrument.phase('write'):
+                    extend_file(f, pad_len, fill)
+                f.write(after)
         
-        # Target size in bytes
-        target_bytes = size_kb * 1024
+        # Verify the file size and report the generation speed
+        if verbose:
+            elapsed = time.perf_counter() - start
+            actual_size = os.path.getsize(full_path)
+            mb_per_s = actual_size / (1024 * 1024) / max(elapsed, 1e-9)
+            print(f"Successfully generated PDF file: {full_path} ({actual_size / 1024:.2f} KB, {mb_per_s:.1f} MB/s)")
+        return full_path
         
-        # Add random text content
-        # We'll use a simpler approach - just add reasonable chunks of text
-        for i in range(min(size_kb // 10, 100)):  # Limit the number of chunks
-            # Generate a reasonable chunk of text
-            chunk = generate_random_text(200)
-            
-            # Add to PDF
-            pdf.set_font("Helvetica", size=11)
-            pdf.multi_cell(0, 7, chunk)
-            pdf.ln(3)
-            
-            # Add new page if needed
-            if pdf.get_y() > 270:
-                pdf.add_page()
-                pdf.set_font("Helvetica", size=12)
-                pdf.cell(0, 10, f"Page {pdf.page_no()}", ln=True)
-                pdf.ln(5)
+    except Exception as e:
+        if verbose:
+            print(f"Error generating PDF file: {e}")
+        raise
+
+
+def _docx_model_version():
+    """Identify everything the bytes-per-character ratio of a DOCX depends on"""
+    return (f"python-docx {get_package_version('docx', 'python-docx')}, "
+            f"lxml {get_package_version('lxml', 'lxml')}, zlib {zlib.ZLIB_RUNTIME_VERSION}, "
+            f"layout {DOCX_LAYOUT_VERSION}")
+
+
+def _render_docx(doc):
+    """Serialize a document into a new in-memory buffer"""
+    buffer = BytesIO()
+    with instrument.phase('serialize'):
+        doc.save(buffer)
+    instrument.count('docx_renders')
+    return buffer
+
+
+def _fix_zip_timestamps(buffer):
+    """
+    Overwrite the modification times in a zip archive with a fixed date.
+    
+    python-docx stamps every archive member with the current time, which
+    is the only thing that differs between two seeded renders. The times
+    are patched in place in the local headers and the central directory,
+    so sizes and offsets do not change.
+    
+    Args:
+        buffer (BytesIO): Rendered archive, modified in place
+    """
+    data = buffer.getbuffer()
+    stamp = struct.pack('<HH', DOCX_FIXED_ZIP_TIME, DOCX_FIXED_ZIP_DATE)
+    
+    # End of central directory record: entry count and directory offset
+    eocd = bytes(data).rfind(b'PK\x05\x06')
+    entry_count, = struct.unpack_from('<H', data, eocd + 10)
+    offset, = struct.unpack_from('<I', data, eocd + 16)
+    
+    for _ in range(entry_count):
+        name_len, extra_len, comment_len = struct.unpack_from('<HHH', data, offset + 28)
+        local_offset, = struct.unpack_from('<I', data, offset + 42)
+        data[offset + 12:offset + 16] = stamp
+        data[local_offset + 10:local_offset + 14] = stamp
+        offset += 46 + name_len + extra_len + comment_len
+    data.release()
+
+
+def _resize_docx_body(body, paragraphs, char_count, source):
+    """
+    Grow or shrink the random body text of a document to char_count characters.
+    
+    Paragraph elements are inserted directly in front of the section
+    properties; going through doc.add_paragraph searches the whole body
+    for that anchor on every call, which is quadratic for large documents.
+    
+    Args:
+        body: <w:body> element of the document being built
+        paragraphs (list): [<w:t> element, length] pairs of the random body, in order
+        char_count (int): Desired total number of body characters
+        source (callable): Byte source, see utils.get_random_source
+    """
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    
+    current = sum(length for _, length in paragraphs)
+    
+    # Drop whole paragraphs from the end while we are too long
+    while paragraphs and current - paragraphs[-1][1] >= char_count:
+        text_element, length = paragraphs.pop()
+        paragraph = text_element.getparent().getparent()
+        body.remove(paragraph)
+        current -= length
+    
+    # Trim the last paragraph if it still overshoots
+    if current > char_count:
+        text_element, length = paragraphs[-1]
+        new_length = length - (current - char_count)
+        text_element.text = text_element.text[:new_length]
+        paragraphs[-1][1] = new_length
+        current = char_count
+    
+    # Add <w:p><w:r><w:t>...</w:t></w:r></w:p> paragraphs until we have enough text
+    anchor = body.sectPr
+    while current < char_count:
+        length = min(DOCX_PARAGRAPH_CHARS, char_count - current)
+        paragraph = OxmlElement('w:p')
+        run = OxmlElement('w:r')
+        text_element = OxmlElement('w:t', {qn('xml:space'): 'preserve'})
+        text_element.text = generate_random_text(length, DOCX_ALPHABET, source)
+        run.append(text_element)
+        paragraph.append(run)
+        if anchor is not None:
+            anchor.addprevious(paragraph)
+        else:
+            body.append(paragraph)
+        paragraphs.append([text_element, length])
+        current += length
+
+
+def iter_docx(size_kb, seed=None):
+    """
+    Yield the bytes of a DOCX file with random text content.
+    
+    The document is rendered in memory as described in generate_docx and
+    yielded as one view of the render buffer, without copying it.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        seed (int or str, optional): Seed for reproducible content
+    
+    Yields:
+        memoryview: The whole file
+    """
+    # python-docx and lxml are only loaded for DOCX files
+    from docx import Document
+    from file_generators.calibration import get_model, predict_units, record_sample
+    
+    # Create a new Document
+    doc = Document()
+    
+    # Target size in bytes
+    target_bytes = int(size_kb * 1024)
+    tolerance = int(target_bytes * DOCX_SIZE_TOLERANCE)
+    
+    # Add title
+    title = doc.add_heading('Random Document Content', level=1)
+    
+    # Size of the document without any body text, rendered only when
+    # no model knows it or the target may be below it. Seeded runs
+    # always calibrate, so their bytes do not depend on the cache.
+    version = _docx_model_version()
+    stored_model = get_model('docx', version)
+    model = stored_model if seed is None else None
+    best = None
+    best_chars = 0
+    if model is None or target_bytes <= model['base']:
+        best = _render_docx(doc)
+        base_size = len(best.getbuffer())
+    else:
+        base_size = model['base']
+    
+    if base_size > target_bytes:
+        print(f"Warning: Requested size ({size_kb} KB) is smaller than minimum DOCX size.")
+    else:
+        paragraphs = []
+        source = get_random_source(seed)
         
-        # Save the PDF
-        pdf.output(full_path)
+        # Aim with the stored model, or probe to calibrate bytes per character
+        if model is not None:
+            char_count = max(predict_units(model, target_bytes), 1)
+        else:
+            char_count = min(target_bytes - base_size, DOCX_PROBE_CHARS)
+        lower = (0, base_size)
+        upper = None
+        renders = 0
         
-        # Verify the file size
-        actual_size = os.path.getsize(full_path)
-        print(f"Successfully generated PDF file: {full_path} ({actual_size / 1024:.2f} KB)")
+        for _ in range(DOCX_MAX_RENDERS - 1):
+            with instrument.phase('synthesize'):
+                _resize_docx_body(doc.element.body, paragraphs, char_count, source)
+            buffer = _render_docx(doc)
+            size = len(buffer.getbuffer())
+            renders += 1
+            
+            if best is None or abs(size - target_bytes) < abs(len(best.getbuffer()) - target_bytes):
+                best = buffer
+                best_chars = char_count
+            if abs(size - target_bytes) <= tolerance:
+                break
+            
+            # Narrow the bracket around the target
+            if size < target_bytes:
+                lower = (char_count, size)
+            else:
+                upper = (char_count, size)
+            
+            # Secant step from the closest bounds, bisection if it leaves the bracket
+            if upper is None:
+                bytes_per_char = (size - base_size) / char_count
+                next_count = int((target_bytes - base_size) / bytes_per_char)
+            else:
+                (lo_chars, lo_size), (hi_chars, hi_size) = lower, upper
+                slope = (hi_size - lo_size) / (hi_chars - lo_chars)
+                next_count = lo_chars + int((target_bytes - lo_size) / slope)
+                if not lo_chars < next_count < hi_chars:
+                    next_count = (lo_chars + hi_chars) // 2
+                if hi_chars - lo_chars <= 1:
+                    break
+            
+            if next_count == char_count:
+                break
+            char_count = max(next_count, 1)
         
-    except Exception as e:
-        print(f"Error generating PDF file: {e}")
-        raise
+        # Learn from the closest render; the store is only rewritten
+        # when the model was missing or missed the target
+        record_sample('docx', version, base_size, best_chars, len(best.getbuffer()),
+                      persist=stored_model is None or (model is not None and renders > 1))
+    
+    if seed is not None:
+        _fix_zip_timestamps(best)
+    
+    yield best.getbuffer()
 
 
-def generate_docx(file_path, size_kb):
+def generate_docx(file_path, size_kb, seed=None, fill='random', verbose=True):
     """
     Generate a DOCX file with random text content.
     
+    The size converges in a few serializations. The first render aims
+    at the target with the size model stored by file_generators.calibration;
+    without one, an empty and a probe render calibrate it. The body is then
+    resized by secant steps kept inside a shrinking bisection bracket
+    until the output is within DOCX_SIZE_TOLERANCE of the target, and the
+    closest render updates the stored model.
+    
     Args:
         file_path (str): Path where the file will be saved
         size_kb (int): Target file size in kilobytes
+        seed (int or str, optional): Seed for reproducible content; the
+            archive timestamps are fixed as well and the stored size model
+            is not used
+        fill (str): Only 'random' is supported; the body is compressed XML,
+            so it cannot be a run of zeros
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
     """
+    if fill != 'random':
+        check_fill_mode(fill)
+        raise ValueError(f"DOCX files do not support fill='{fill}', only 'random'")
+    
     # Create generated folder and get full path
     generated_folder = create_generated_folder()
     full_path = os.path.join(generated_folder, file_path)
     
     try:
-        # Create a new Document
-        doc = Document()
-        
-        # Target size in bytes
-        target_bytes = size_kb * 1024
-        
-        # Add title
-        title = doc.add_heading('Random Document Content', level=1)
-        
-        # Add random text until we reach the target size
-        current_size = 0
-        
-        while current_size < target_bytes * 0.7:  # Stop at 70% to account for DOCX overhead
-            # Generate a chunk of random text
-            chunk_size = min(2000, (target_bytes - current_size) // 8)
-            random_chunk = generate_random_text(chunk_size)
-            
-            # Add paragraph with random text
-            paragraph = doc.add_paragraph(random_chunk)
-            
-            # Check current size by saving to buffer
-            buffer = BytesIO()
-            doc.save(buffer)
-            current_size = len(buffer.getvalue())
-        
-        # Save the document
-        doc.save(full_path)
+        # Write the closest render to disk
+        with open(full_path, 'wb') as f:
+            write_stream(instrument.timed_file(f), iter_docx(size_kb, seed))
         
         # Verify the file size
-        actual_size = os.path.getsize(full_path)
-        print(f"Successfully generated DOCX file: {full_path} ({actual_size / 1024:.2f} KB)")
+        if verbose:
+            actual_size = os.path.getsize(full_path)
+            print(f"Successfully generated DOCX file: {full_path} ({actual_size / 1024:.2f} KB)")
+        return full_path
         
     except Exception as e:
-        print(f"Error generating DOCX file: {e}")
-        raise
\ No newline at end of file
+        if verbose:
+            print(f"Error generating DOCX file: {e}")
+        raise
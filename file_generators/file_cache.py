@@ -0,0 +1,334 @@
+import os
+import re
+import json
+import hashlib
+
+from utils import get_cache_folder, create_generated_folder, get_package_version, parse_size
+from file_generators import GENERATORS, instrument
+from file_generators.header_cache import _write_atomic
+from file_generators.dedup import clone_file, CLONE_METHODS
+
+
+# Part of every cache key; bump it when a generator's output for a given
+# seed changes, so files made by older code are never served
+FILE_CACHE_VERSION = 2
+
+# Disk budget when FILEGEN_FILE_CACHE_BUDGET is not set
+DEFAULT_BUDGET = "5GB"
+
+# Cached files are named by their key and keep the extension of their type
+_ENTRY_NAME = re.compile(r"^[0-9a-f]{32}\.[a-z]+$")
+
+# Lifetime counters kept in the stats file
+STAT_COUNTERS = ('hits', 'misses', 'bypassed', 'evictions', 'bytes_served', 'bytes_stored', 'bytes_evicted')
+
+
+def configure(method=None, budget=None):
+    """
+    Switch the file cache on or off for this process and its workers.
+
+    The settings live in the environment, like the profiling options, so
+    worker processes started afterwards pick them up.
+
+    Args:
+        method (str, optional): One of dedup.CLONE_METHODS used to serve
+            hits and to store new files; None switches the cache off
+        budget (str, optional): Disk budget such as '10GB' (bare numbers
+            are KB); None keeps the current one
+    """
+    if method is not None and method not in CLONE_METHODS:
+        raise ValueError(f"Unknown clone method '{method}', expected one of {', '.join(CLONE_METHODS)}")
+    if budget is not None:
+        parse_size(str(budget))
+        os.environ["FILEGEN_FILE_CACHE_BUDGET"] = str(budget)
+    os.environ["FILEGEN_FILE_CACHE"] = method or "0"
+
+
+def enabled():
+    """Tell whether generated files go through the cache"""
+    return os.environ.get("FILEGEN_FILE_CACHE", "0") not in ("", "0")
+
+
+def budget_bytes():
+    """Get the disk budget of the cache in bytes"""
+    return int(parse_size(os.environ.get("FILEGEN_FILE_CACHE_BUDGET") or DEFAULT_BUDGET) * 1024)
+
+
+def _generator_version(file_type, options):
+    """Identify the libraries the bytes of a seeded file depend on"""
+    if file_type == 'docx':
+        from file_generators.document_generator import _docx_model_version
+        return _docx_model_version()
+    if file_type in ('png', 'jpg'):
+        version = f"Pillow {get_package_version('PIL', 'Pillow')}"
+        if options.get('padding') == 'pixels':
+            version += f", numpy {get_package_version('numpy', 'numpy')}"
+        return version
+    return ""
+
+
+def cache_key(file_type, size_kb, options):
+    """
+    Hash everything a generated file depends on.
+
+    Only seeded files with random fill are cacheable: unseeded files are
+    meant to be unique, and sparse or allocated files cost nothing to make.
+
+    Args:
+        file_type (str): Key of file_generators.GENERATORS
+        size_kb (float): Target file size in kilobytes
+        options (dict): Generator keyword arguments
+
+    Returns:
+        str: 32 hex digits, or None if the file must not be cached
+    """
+    if options.get('seed') is None or options.get('fill', 'random') != 'random':
+        return None
+    # Seeds are hashed as text by the generators, so 1 and '1' are the same file
+    normalized = sorted((name, str(value)) for name, value in options.items() if name != 'fill')
+    material = repr((FILE_CACHE_VERSION, file_type, int(size_kb * 1024), normalized,
+                     _generator_version(file_type, options)))
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+
+
+def _entry_path(key, file_type):
+    """Get the cache file of a key"""
+    return os.path.join(get_cache_folder("files"), f"{key}.{GENERATORS[file_type][1]}")
+
+
+def _clone(source_path, dest_path, method):
+    """Clone a file, copying instead when a link or reflink cannot be made here"""
+    try:
+        return clone_file(source_path, dest_path, method)
+    except OSError:
+        if method in ('auto', 'copy') or not os.path.exists(source_path):
+            raise
+        # Hardlinks and reflinks need one filesystem that supports them
+        return clone_file(source_path, dest_path, 'auto')
+
+
+def _unlink_output(full_path):
+    """
+    Remove an earlier output before it is replaced.
+
+    With 'hardlink' an earlier output may share its inode with a cache
+    file, and the generators and copies open their destination for
+    writing, which would overwrite that cache file in place.
+    """
+    try:
+        os.remove(full_path)
+    except FileNotFoundError:
+        pass
+
+
+def _expected_size(file_type, size, target_bytes):
+    """
+    Tell whether a file has the size a generator makes for a target.
+
+    DOCX files land within DOCX_SIZE_TOLERANCE of the target and the other
+    types hit it exactly. A cache file of another size was damaged, and an
+    output of another size (a target below the type's minimum) is not
+    stored, since a hit on it could not be told from a damaged one.
+    """
+    if file_type == 'docx':
+        from file_generators.document_generator import DOCX_SIZE_TOLERANCE
+        return abs(size - target_bytes) <= target_bytes * DOCX_SIZE_TOLERANCE
+    return size == target_bytes
+
+
+def _read_stats(path):
+    """Read the lifetime counters, starting from zero if there are none"""
+    stats = dict.fromkeys(STAT_COUNTERS, 0)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        stats.update((name, int(stored[name])) for name in STAT_COUNTERS if name in stored)
+    except (OSError, ValueError, TypeError):
+        pass
+    return stats
+
+
+def _update_stats(**deltas):
+    """
+    Add to the lifetime counters.
+
+    Worker processes exit without running atexit hooks, so every event is
+    written right away, under a lock so concurrent processes lose nothing.
+    """
+    path = os.path.join(get_cache_folder("files"), "stats.json")
+    try:
+        with open(f"{path}.lock", 'a') as lock:
+            try:
+                import fcntl
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            except ImportError:
+                pass
+            stats = _read_stats(path)
+            for name, value in deltas.items():
+                stats[name] += value
+            _write_atomic(path, json.dumps(stats, sort_keys=True).encode('utf-8'))
+    except OSError:
+        # Statistics are only informational
+        pass
+
+
+def _list_entries():
+    """List cached files as (last use, size, path), oldest first"""
+    entries = []
+    with os.scandir(get_cache_folder("files")) as scan:
+        for entry in scan:
+            if not _ENTRY_NAME.match(entry.name):
+                continue
+            try:
+                info = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((info.st_mtime, info.st_size, entry.path))
+    entries.sort()
+    return entries
+
+
+def evict(budget=None):
+    """
+    Remove least recently used files until the cache fits its budget.
+
+    A hit sets the modification time of its cache file, so the oldest
+    modification time belongs to the least recently used file.
+
+    Args:
+        budget (int, optional): Budget in bytes (default: budget_bytes())
+
+    Returns:
+        tuple: (files removed, bytes freed)
+    """
+    budget = budget_bytes() if budget is None else budget
+    entries = _list_entries()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    freed = 0
+    for _, size, path in entries:
+        if total <= budget:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+            freed += size
+        except FileNotFoundError:
+            # Another process evicted it first
+            pass
+        total -= size
+    if removed:
+        _update_stats(evictions=removed, bytes_evicted=freed)
+    return removed, freed
+
+
+def _store(full_path, entry_path, size, method):
+    """Add a generated file to the cache and evict to stay in budget"""
+    budget = budget_bytes()
+    if size > budget:
+        return False
+    import threading
+    tmp_path = f"{entry_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        _clone(full_path, tmp_path, method)
+        os.replace(tmp_path, entry_path)
+    except OSError:
+        # Caching is only an optimization
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    evict(budget)
+    return True
+
+
+def generate_cached(file_type, file_path, size_kb, verbose=True, **options):
+    """
+    Generate a file, or clone it from the cache if it was made before.
+
+    Hits are cloned with the configured method (reflink, copy or hardlink)
+    and misses are generated as usual, then added to the cache the same
+    way. With 'hardlink' the output shares its inode with the cache file,
+    so it must not be modified in place.
+
+    Args:
+        file_type (str): Key of file_generators.GENERATORS
+        file_path (str): Path where the file will be saved
+        size_kb (float): Target file size in kilobytes
+        verbose (bool): Print a line when the file is generated or copied
+        **options: Generator keyword arguments, e.g. seed or padding
+
+    Returns:
+        tuple: (full_path, outcome) where outcome is 'hit', 'miss' or
+            'bypassed' for files that are not cacheable
+    """
+    if file_type not in GENERATORS:
+        raise ValueError(f"Unknown file type '{file_type}', expected one of {', '.join(sorted(GENERATORS))}")
+    generator, _ = GENERATORS[file_type]
+    key = cache_key(file_type, size_kb, options)
+    if key is None:
+        _update_stats(bypassed=1)
+        return generator(file_path, size_kb, verbose=verbose, **options), 'bypassed'
+
+    method = os.environ.get("FILEGEN_FILE_CACHE", "0")
+    if method not in CLONE_METHODS:
+        method = 'auto'
+    full_path = os.path.join(create_generated_folder(), file_path)
+    entry_path = _entry_path(key, file_type)
+    target_bytes = int(size_kb * 1024)
+    _unlink_output(full_path)
+    try:
+        if not _expected_size(file_type, os.path.getsize(entry_path), target_bytes):
+            # A damaged cache file is dropped and regenerated
+            os.remove(entry_path)
+        # Mark as recently used first; this fails if the file is not cached
+        os.utime(entry_path)
+        _clone(entry_path, full_path, method)
+        size = os.path.getsize(full_path)
+    except OSError:
+        pass
+    else:
+        _update_stats(hits=1, bytes_served=size)
+        instrument.count('cache_hits')
+        if verbose:
+            print(f"Copied cached {file_type.upper()} file: {full_path} ({size / 1024:.2f} KB)")
+        return full_path, 'hit'
+
+    full_path = generator(file_path, size_kb, verbose=verbose, **options)
+    instrument.count('cache_misses')
+    size = os.path.getsize(full_path)
+    stored = _expected_size(file_type, size, target_bytes) and _store(full_path, entry_path, size, method)
+    _update_stats(misses=1, bytes_stored=size if stored else 0)
+    return full_path, 'miss'
+
+
+def stats():
+    """
+    Get the lifetime counters and the current contents of the cache.
+
+    Returns:
+        dict: STAT_COUNTERS plus 'entries', 'size_bytes', 'budget_bytes',
+            'hit_rate' and 'folder'
+    """
+    folder = get_cache_folder("files")
+    result = _read_stats(os.path.join(folder, "stats.json"))
+    entries = _list_entries()
+    lookups = result['hits'] + result['misses']
+    result.update(entries=len(entries), size_bytes=sum(size for _, size, _ in entries),
+                  budget_bytes=budget_bytes(), hit_rate=result['hits'] / lookups if lookups else 0.0,
+                  folder=folder)
+    return result
+
+
+def clear():
+    """Remove every cached file and reset the counters"""
+    for _, _, path in _list_entries():
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    try:
+        os.remove(os.path.join(get_cache_folder("files"), "stats.json"))
+    except FileNotFoundError:
+        pass
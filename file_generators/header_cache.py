@@ -0,0 +1,124 @@
+import os
+import struct
+import hashlib
+
+from utils import get_cache_folder
+
+
+# Persist templates under the user cache folder so that new processes can
+# skip building them. Set FILEGEN_TEMPLATE_CACHE=0 to keep them in memory only.
+PERSIST_TEMPLATES = os.environ.get("FILEGEN_TEMPLATE_CACHE", "1") != "0"
+
+# Persisted templates start with this magic, the template length and its
+# SHA-256, so an empty or torn file is noticed and the template rebuilt
+TEMPLATE_MAGIC = b"FGTEMPL1"
+TEMPLATE_HEADER = struct.Struct('>8sQ32s')
+
+# Registered builders: format -> (builder, version)
+_builders = {}
+
+# In-memory templates: (format, options) -> bytes
+_templates = {}
+
+
+def register_template(fmt, builder, version=None):
+    """
+    Register the function that builds the header template of a format.
+    
+    Args:
+        fmt (str): Format name, e.g. 'png'
+        builder (callable): Called with the template options as keyword
+            arguments; must return bytes
+        version (callable, optional): Returns a string identifying the
+            library that produced the bytes. It is part of the on-disk key,
+            so upgrading the library invalidates persisted templates.
+    """
+    _builders[fmt] = (builder, version)
+
+
+def get_template(fmt, **options):
+    """
+    Get the header template of a format, building it on first use.
+    
+    Lookups go to the in-memory cache first, then to the on-disk cache,
+    and only then to the registered builder. A persisted template whose
+    length or checksum does not match is rebuilt and written again.
+    
+    Args:
+        fmt (str): Format name passed to register_template
+        **options: Builder options; each combination is cached separately
+    
+    Returns:
+        bytes: Template bytes
+    """
+    key = (fmt, tuple(sorted(options.items())))
+    template = _templates.get(key)
+    if template is not None:
+        return template
+    
+    if fmt not in _builders:
+        raise ValueError(f"No header template registered for format '{fmt}'")
+    builder, version = _builders[fmt]
+    
+    disk_path = None
+    if PERSIST_TEMPLATES:
+        disk_path = _disk_path(key, version() if version else "")
+        try:
+            with open(disk_path, 'rb') as f:
+                template = _unpack_template(f.read())
+        except OSError:
+            template = None
+    
+    if template is None:
+        template = bytes(builder(**options))
+        if disk_path is not None:
+            _write_atomic(disk_path, _pack_template(template))
+    
+    _templates[key] = template
+    return template
+
+
+def clear_templates():
+    """Drop all in-memory templates (persisted templates are kept)"""
+    _templates.clear()
+
+
+def _disk_path(key, version):
+    """Get the file that persists the template for a cache key"""
+    fmt, options = key
+    digest = hashlib.sha256(repr((fmt, options, version)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(get_cache_folder("templates"), f"{fmt}-{digest}.bin")
+
+
+def _pack_template(template):
+    """Prefix a template with the header that lets a reader check it"""
+    return TEMPLATE_HEADER.pack(TEMPLATE_MAGIC, len(template), hashlib.sha256(template).digest()) + template
+
+
+def _unpack_template(data):
+    """Get the template out of a persisted file, or None if the file is damaged"""
+    if len(data) < TEMPLATE_HEADER.size:
+        return None
+    magic, length, digest = TEMPLATE_HEADER.unpack_from(data)
+    template = data[TEMPLATE_HEADER.size:]
+    if magic != TEMPLATE_MAGIC or length != len(template) or digest != hashlib.sha256(template).digest():
+        return None
+    return template
+
+
+def _write_atomic(path, data):
+    """Write a file through a temporary name so readers never see partial data"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            # Without this a crash can leave the renamed file empty
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        # Persisting is only an optimization
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
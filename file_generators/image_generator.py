@@ -1,131 +1,631 @@
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from PIL import Image
+import math
+import struct
+import zlib
 from io import BytesIO
-from utils import generate_random_bytes, create_generated_folder
+from utils import (iter_random_bytes, get_random_source, write_stream_auto, extend_file, check_fill_mode,
+                   create_generated_folder, get_package_version)
+from file_generators.header_cache import register_template, get_template
+from file_generators import instrument
+
+
+# Private, ancillary, safe-to-copy PNG chunk type used for padding
+PNG_PAD_CHUNK_TYPE = b'fpAd'
+PNG_PAD_CHUNK_DATA = 1024 * 1024
+
+# Length, type and CRC fields of a PNG chunk
+PNG_CHUNK_OVERHEAD = 12
+
+# Largest chunk payload the PNG spec allows, used for sparse padding so a
+# huge file needs only a few chunk headers
+PNG_SPARSE_CHUNK_DATA = 2 ** 31 - 1
+
+# Marker and length fields of a JPEG segment, and the largest payload
+# the 16-bit length field allows
+JPEG_SEGMENT_OVERHEAD = 4
+JPEG_SEGMENT_DATA = 65535 - 2
+
+# Real pixels (padding='pixels'): the low bits of every channel are noise
+# on top of smooth gradients, so the image looks like something and its
+# encoded size grows linearly with the pixel count. One random byte per
+# pixel feeds all three channels through different odd multipliers, which
+# are bijections mod 256, so only a third of the random bytes are needed.
+PIXEL_NOISE_BITS = 6
+PIXEL_NOISE_MULTIPLIERS = (1, 97, 181)
+PIXEL_ASPECT = 4 / 3
+
+# Two small encodes fit the size model of a format: (width, height) each
+PIXEL_PROBES = ((64, 48), (256, 192))
+
+# Aim this far below the target, so one encode usually fits; the gap is
+# filled with embedded padding
+PIXEL_SIZE_MARGIN = 0.02
+PIXEL_MAX_ENCODES = 4
+
+# Larger targets keep this many pixels and pad the rest, which keeps
+# memory bounded and stays below Pillow's decompression-bomb warning
+PIXEL_MAX_PIXELS = 50_000_000
+
+# Pixel PNGs are written directly as unfiltered rows in stored deflate
+# blocks: noise does not compress, and zlib level 0 is a plain copy
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_PIXEL_COMPRESS_LEVEL = 0
+
+# JPEG quality of pixel images. The dimensions are fitted at this quality:
+# the encoded size is linear in the pixel count at a fixed quality, which
+# the two probes can model, while one quality step moves the size by more
+# than PIXEL_SIZE_MARGIN. Only when the pixel count is capped is the
+# quality raised, up to the maximum, to fill more of the target with pixels.
+JPEG_PIXEL_QUALITY = 90
+JPEG_PIXEL_MAX_QUALITY = 95
+
+
+def _encode_minimal_image(image_format, width=1, height=1, color='black'):
+    """
+    Encode a small solid-color image with Pillow.
+    
+    Pillow is imported here rather than at module level, so processes that
+    find the template in the header cache never load it.
+    
+    Args:
+        image_format (str): Pillow format name, e.g. 'PNG' or 'JPEG'
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        color (str): Fill color
+        
+    Returns:
+        bytes: The encoded image
+    """
+    from PIL import Image
+    img = Image.new('RGB', (width, height), color=color)
+    buffer = BytesIO()
+    img.save(buffer, format=image_format)
+    return buffer.getvalue()
+
 
+def _pillow_version():
+    """Get the installed Pillow version without importing Pillow"""
+    return get_package_version('PIL', 'Pillow')
 
-def generate_png(file_path, size_kb):
+
+register_template('png', lambda **options: _encode_minimal_image('PNG', **options), version=_pillow_version)
+register_template('jpeg', lambda **options: _encode_minimal_image('JPEG', **options), version=_pillow_version)
+
+
+def _synthesize_pixels(out, source):
+    """
+    Fill an RGB pixel array with gradients plus noise, without Python loops.
+    
+    Args:
+        out (numpy.ndarray): uint8 array of shape (height, width, 3), may be
+            a view with padded rows
+        source (callable): Byte source, see utils.get_random_source
+    """
+    import numpy as np
+    
+    height, width, _ = out.shape
+    noise = np.frombuffer(source(height * width), dtype=np.uint8).reshape(height, width)
+    
+    # Gradients use the headroom above the noise, so nothing overflows
+    top = 256 - (1 << PIXEL_NOISE_BITS)
+    across = np.linspace(0, top, width).astype(np.uint8)
+    down = np.linspace(0, top, height).astype(np.uint8)
+    gradients = ((across[None, :],), (down[:, None],), ((across[::-1] // 2)[None, :], (down // 2)[:, None]))
+    
+    # Build each channel in a contiguous plane, then copy it into place
+    plane = np.empty((height, width), dtype=np.uint8)
+    for channel, (multiplier, gradient) in enumerate(zip(PIXEL_NOISE_MULTIPLIERS, gradients)):
+        np.multiply(noise, multiplier, out=plane)
+        np.right_shift(plane, 8 - PIXEL_NOISE_BITS, out=plane)
+        for part in gradient:
+            plane += part
+        out[:, :, channel] = plane
+
+
+def _png_chunk(chunk_type, data):
+    """Frame data as a PNG chunk: length, type, data and CRC, as a list of parts"""
+    crc = zlib.crc32(data, zlib.crc32(chunk_type))
+    return [struct.pack('>I', len(data)), chunk_type, data, struct.pack('>I', crc)]
+
+
+def _encode_pixels(image_format, width, height, source, quality=JPEG_PIXEL_QUALITY):
+    """
+    Synthesize and encode an RGB image.
+    
+    Args:
+        image_format (str): 'PNG' or 'JPEG'
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        source (callable): Byte source, see utils.get_random_source
+        quality (int): JPEG quality
+    
+    Returns:
+        bytes: The encoded image
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ValueError("padding='pixels' needs NumPy (pip install numpy)")
+    
+    if image_format == 'PNG':
+        # Filter type 0 in front of every row, pixels synthesized in place
+        with instrument.phase('synthesize'):
+            rows = np.empty((height, 1 + width * 3), dtype=np.uint8)
+            rows[:, 0] = 0
+            _synthesize_pixels(rows[:, 1:].reshape(height, width, 3), source)
+        with instrument.phase('serialize'):
+            header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+            data = zlib.compress(rows, PNG_PIXEL_COMPRESS_LEVEL)
+            # Large images: let the rows go before the final copy
+            del rows
+            return b''.join([PNG_SIGNATURE] + _png_chunk(b'IHDR', header) + _png_chunk(b'IDAT', data) +
+                            _png_chunk(b'IEND', b''))
+    
+    from PIL import Image
+    with instrument.phase('synthesize'):
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        _synthesize_pixels(pixels, source)
+    with instrument.phase('serialize'):
+        buffer = BytesIO()
+        Image.fromarray(pixels).save(buffer, format=image_format, quality=quality)
+        return buffer.getvalue()
+
+
+def _pixel_dimensions(pixel_count):
+    """Get (width, height) with about pixel_count pixels at PIXEL_ASPECT"""
+    width = max(int(math.sqrt(pixel_count * PIXEL_ASPECT)), 1)
+    return width, max(pixel_count // width, 1)
+
+
+def _pixel_size_model(image_format, source, quality=JPEG_PIXEL_QUALITY):
+    """
+    Fit encoded size = base + bytes_per_pixel * pixels from two probe encodes.
+    
+    Args:
+        image_format (str): 'PNG' or 'JPEG'
+        source (callable): Byte source, see utils.get_random_source
+        quality (int): JPEG quality
+    
+    Returns:
+        tuple: (base, bytes_per_pixel)
+    """
+    (small_width, small_height), (large_width, large_height) = PIXEL_PROBES
+    small = len(_encode_pixels(image_format, small_width, small_height, source, quality))
+    large = len(_encode_pixels(image_format, large_width, large_height, source, quality))
+    bytes_per_pixel = (large - small) / (large_width * large_height - small_width * small_height)
+    return small - bytes_per_pixel * small_width * small_height, bytes_per_pixel
+
+
+def _pixel_image(image_format, target_bytes, seed, fill):
+    """
+    Encode a real image whose size lands just under target_bytes.
+    
+    Two small probe encodes fit encoded size = base + bytes_per_pixel *
+    pixels, the dimensions are picked to land PIXEL_SIZE_MARGIN below the
+    target, and an encode that still overshoots is scaled down and retried.
+    JPEGs keep JPEG_PIXEL_QUALITY unless the pixel count is capped at
+    PIXEL_MAX_PIXELS; then the highest quality up to JPEG_PIXEL_MAX_QUALITY
+    whose size model still fits the target is used.
+    
+    Args:
+        image_format (str): 'PNG' or 'JPEG'
+        target_bytes (int): Target file size in bytes
+        seed (int or str): Seed for reproducible pixels, or None
+        fill (str): Must be 'random'; the pixels are the content
+    
+    Returns:
+        bytes: The encoded image, or None if the target is too small for one
+    """
+    if fill != 'random':
+        check_fill_mode(fill)
+        raise ValueError(f"padding='pixels' only supports fill='random', not '{fill}'")
+    source = get_random_source(None if seed is None else f"{seed}:pixels")
+    
+    base, bytes_per_pixel = _pixel_size_model(image_format, source)
+    budget = target_bytes * (1 - PIXEL_SIZE_MARGIN) - base
+    pixel_count = min(int(budget / bytes_per_pixel), PIXEL_MAX_PIXELS)
+    
+    quality = JPEG_PIXEL_QUALITY
+    if image_format == 'JPEG' and pixel_count == PIXEL_MAX_PIXELS:
+        # No more pixels allowed, so a higher quality fills more of the target
+        for candidate in range(JPEG_PIXEL_QUALITY + 1, JPEG_PIXEL_MAX_QUALITY + 1):
+            candidate_base, candidate_bytes_per_pixel = _pixel_size_model(image_format, source, candidate)
+            if candidate_base + candidate_bytes_per_pixel * pixel_count > target_bytes * (1 - PIXEL_SIZE_MARGIN):
+                break
+            quality, base = candidate, candidate_base
+        budget = target_bytes * (1 - PIXEL_SIZE_MARGIN) - base
+    
+    for _ in range(PIXEL_MAX_ENCODES):
+        if pixel_count < 1:
+            return None
+        image = _encode_pixels(image_format, *_pixel_dimensions(pixel_count), source, quality)
+        if len(image) <= target_bytes:
+            return image
+        # Overshot: shrink by how far the real encode missed the budget
+        pixel_count = int(pixel_count * budget / (len(image) - base))
+    return None
+
+
+def _segment_sizes(total, overhead, max_data):
+    """
+    Split a padding size into format segments that add up exactly.
+    
+    Args:
+        total (int): Bytes to fill, segment overhead included
+        overhead (int): Bytes of framing per segment
+        max_data (int): Largest payload a single segment may carry
+        
+    Yields:
+        int: Payload size of each segment
+    """
+    if total <= 0:
+        return
+    count = -(-total // (max_data + overhead))
+    data_total = total - count * overhead
+    base, extra = divmod(data_total, count)
+    for i in range(count):
+        yield base + 1 if i < extra else base
+
+
+def _iter_png_padding(size_bytes, source, compress_ratio=None):
+    """
+    Yield private ancillary PNG chunks filled with random data.
+    
+    The CRC of each chunk is updated as its data is produced, so no chunk
+    is ever held in memory as a whole.
+    
+    Args:
+        size_bytes (int): Total size of the chunks, framing included
+        source (callable): Byte source, see utils.get_random_source
+        compress_ratio (float, optional): Compression ratio of the data,
+            see utils.iter_random_bytes
+        
+    Yields:
+        bytes-like: Chunk framing and data, in file order
+    """
+    for data_len in _segment_sizes(size_bytes, PNG_CHUNK_OVERHEAD, PNG_PAD_CHUNK_DATA):
+        yield struct.pack('>I', data_len) + PNG_PAD_CHUNK_TYPE
+        crc = zlib.crc32(PNG_PAD_CHUNK_TYPE)
+        for chunk in iter_random_bytes(data_len, source=source, compress_ratio=compress_ratio):
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+        yield struct.pack('>I', crc)
+
+
+def _iter_jpeg_padding(size_bytes, source, compress_ratio=None):
+    """
+    Yield JPEG comment (COM) segments filled with random data.
+    
+    Args:
+        size_bytes (int): Total size of the segments, markers included
+        source (callable): Byte source, see utils.get_random_source
+        compress_ratio (float, optional): Compression ratio of the data,
+            see utils.iter_random_bytes
+        
+    Yields:
+        bytes-like: Segment markers and data, in file order
+    """
+    for data_len in _segment_sizes(size_bytes, JPEG_SEGMENT_OVERHEAD, JPEG_SEGMENT_DATA):
+        # The length field counts itself but not the marker
+        yield b'\xff\xfe' + struct.pack('>H', data_len + 2)
+        yield from iter_random_bytes(data_len, source=source, compress_ratio=compress_ratio)
+
+
+def _gf2_times(matrix, vector):
+    """Multiply a 32x32 GF(2) matrix, given as a list of columns, by a vector"""
+    result = 0
+    column = 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[column]
+        vector >>= 1
+        column += 1
+    return result
+
+
+def _crc32_zeros(length, crc=0):
+    """
+    Compute zlib.crc32(bytes(length), crc) without touching the zeros.
+    
+    Feeding a zero byte through the CRC register is a linear map, so
+    length zero bytes are that map raised to the length-th power, done by
+    repeated squaring in O(log length) steps (as in zlib's crc32_combine).
+    
+    Args:
+        length (int): Number of zero bytes
+        crc (int): CRC of the data before the zeros
+        
+    Returns:
+        int: CRC of the data followed by the zeros
+    """
+    mask = 0xFFFFFFFF
+    # Columns of the one-zero-byte map, read off zlib itself
+    operator = [~zlib.crc32(b'\0', ~(1 << bit) & mask) & mask for bit in range(32)]
+    state = ~crc & mask
+    while length:
+        if length & 1:
+            state = _gf2_times(operator, state)
+        length >>= 1
+        if length:
+            operator = [_gf2_times(operator, column) for column in operator]
+    return ~state & mask
+
+
+def _write_png_sparse_padding(f, size_bytes, fill):
+    """
+    Write padding chunks whose data is a sparse or preallocated run of zeros.
+    
+    Only the chunk framing is written; the CRC of each zero run is computed
+    arithmetically, so the chunks stay valid.
+    
+    Args:
+        f: Binary file object positioned where the chunks go
+        size_bytes (int): Total size of the chunks, framing included
+        fill (str): 'sparse' or 'allocate'
+    """
+    type_crc = zlib.crc32(PNG_PAD_CHUNK_TYPE)
+    crcs = {}
+    for data_len in _segment_sizes(size_bytes, PNG_CHUNK_OVERHEAD, PNG_SPARSE_CHUNK_DATA):
+        if data_len not in crcs:
+            crcs[data_len] = _crc32_zeros(data_len, type_crc)
+        f.write(struct.pack('>I', data_len) + PNG_PAD_CHUNK_TYPE)
+        with instrument.phase('write'):
+            extend_file(f, data_len, fill)
+        f.write(struct.pack('>I', crcs[data_len]))
+
+
+def _png_padding_offset(header_bytes):
+    """Get the offset of the IEND chunk, where padding chunks are inserted"""
+    if header_bytes[-8:-4] != b'IEND':
+        raise ValueError("PNG template does not end with an IEND chunk")
+    return len(header_bytes) - PNG_CHUNK_OVERHEAD
+
+
+def _jpeg_padding_offset(header_bytes):
+    """Get the offset right after SOI and any APPn segments (JFIF, EXIF)"""
+    offset = 2
+    while header_bytes[offset] == 0xFF and 0xE0 <= header_bytes[offset + 1] <= 0xEF:
+        offset += 2 + struct.unpack('>H', header_bytes[offset + 2:offset + 4])[0]
+    return offset
+
+
+def _embed_padding(padding, remaining_bytes, overhead):
+    """Tell whether padding goes into the image; a gap smaller than one segment's framing can only be appended"""
+    return padding == 'embedded' and (remaining_bytes == 0 or remaining_bytes >= overhead)
+
+
+def _iter_image(header_bytes, target_bytes, padding, padding_offset, iter_padding, overhead, seed,
+                compress_ratio=None):
+    """
+    Yield an image template padded to the target size with random data.
+    
+    Args:
+        header_bytes (bytes): Complete minimal image
+        target_bytes (int): Target file size in bytes
+        padding (str): 'embedded' or 'append'
+        padding_offset (callable): Returns where embedded padding goes in the template
+        iter_padding (callable): Yields embedded padding of a given total size
+        overhead (int): Framing bytes per embedded segment
+        seed (int or str): Seed for reproducible padding, or None
+        compress_ratio (float, optional): Compression ratio of the padding
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    remaining_bytes = max(target_bytes - len(header_bytes), 0)
+    source = get_random_source(seed)
+    
+    # Slices of a view, since a pixel image can be hundreds of MB
+    header_view = memoryview(header_bytes)
+    if _embed_padding(padding, remaining_bytes, overhead):
+        offset = padding_offset(header_bytes)
+        yield header_view[:offset]
+        yield from instrument.timed_chunks(iter_padding(remaining_bytes, source, compress_ratio))
+        yield header_view[offset:]
+    else:
+        yield header_view
+        padding_chunks = iter_random_bytes(remaining_bytes, source=source, compress_ratio=compress_ratio)
+        yield from instrument.timed_chunks(padding_chunks)
+
+
+def _write_image(full_path, header_bytes, target_bytes, padding, padding_offset, iter_padding, overhead, seed,
+                 fill='random', write_sparse_padding=None, compress_ratio=None):
+    """
+    Write an image template padded to the target size.
+    
+    With fill='sparse' or 'allocate' no padding bytes are generated. Formats
+    without write_sparse_padding get their zeros appended after the image,
+    since framing small segments would touch every disk block.
+    
+    Args:
+        full_path (str): Destination path
+        header_bytes (bytes): Complete minimal image
+        target_bytes (int): Target file size in bytes
+        padding (str): 'embedded' or 'append'
+        padding_offset (callable): Returns where embedded padding goes in the template
+        iter_padding (callable): Yields embedded padding of a given total size
+        overhead (int): Framing bytes per embedded segment
+        seed (int or str): Seed for reproducible padding, or None
+        fill (str): 'random', 'sparse' or 'allocate'
+        write_sparse_padding (callable, optional): Writes embedded zero padding
+        compress_ratio (float, optional): Compression ratio of random padding
+    """
+    check_fill_mode(fill, compress_ratio)
+    
+    with open(full_path, 'wb') as f:
+        f = instrument.timed_file(f)
+        if fill == 'random':
+            chunks = _iter_image(header_bytes, target_bytes, padding, padding_offset, iter_padding, overhead, seed,
+                                 compress_ratio)
+            write_stream_auto(f, chunks, target_bytes)
+            return
+    
+        remaining_bytes = max(target_bytes - len(header_bytes), 0)
+        embedded = write_sparse_padding is not None and _embed_padding(padding, remaining_bytes, overhead)
+        with memoryview(header_bytes) as header_view:
+            if embedded:
+                offset = padding_offset(header_bytes)
+                f.write(header_view[:offset])
+                write_sparse_padding(f, remaining_bytes, fill)
+                f.write(header_view[offset:])
+            else:
+                f.write(header_view)
+                with instrument.phase('write'):
+                    extend_file(f, remaining_bytes, fill)
+
+
+def _image_header(image_format, size_kb, padding, seed, fill):
+    """
+    Get the image that padding completes to the target size.
+    
+    Args:
+        image_format (str): 'PNG' or 'JPEG'
+        size_kb (float): Target file size in kilobytes
+        padding (str): 'embedded', 'append' or 'pixels'
+        seed (int or str): Seed for reproducible pixels, or None
+        fill (str): 'random', 'sparse' or 'allocate'
+    
+    Returns:
+        tuple: (header_bytes, padding) where padding is 'embedded' or 'append'
+    """
+    if padding not in ('embedded', 'append', 'pixels'):
+        raise ValueError(f"Unknown padding mode '{padding}', expected 'embedded', 'append' or 'pixels'")
+    
+    target_bytes = int(size_kb * 1024)
+    header_bytes = None
+    if padding == 'pixels':
+        # A real image just under the target, completed by embedded padding
+        header_bytes = _pixel_image(image_format, target_bytes, seed, fill)
+        padding = 'embedded'
+    
+    if header_bytes is None:
+        # Get the encoded minimal 1x1 pixel black image from the header cache
+        with instrument.phase('serialize'):
+            header_bytes = get_template(image_format.lower())
+    
+    if target_bytes < len(header_bytes):
+        print(f"Warning: Requested size ({size_kb} KB) is smaller than minimum {image_format} header size.")
+    return header_bytes, padding
+
+
+def iter_png(size_kb, padding='embedded', seed=None, compress_ratio=None):
+    """
+    Yield the bytes of a PNG file with valid header and random data padding.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        padding (str): 'embedded', 'append' or 'pixels', see generate_png
+        seed (int or str, optional): Seed for reproducible content
+        compress_ratio (float, optional): Compression ratio of the padding
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    header_bytes, padding = _image_header('PNG', size_kb, padding, seed, 'random')
+    yield from _iter_image(header_bytes, int(size_kb * 1024), padding,
+                           _png_padding_offset, _iter_png_padding, PNG_CHUNK_OVERHEAD, seed, compress_ratio)
+
+
+def generate_png(file_path, size_kb, padding='embedded', seed=None, compress_ratio=None, fill='random',
+                 verbose=True):
     """
     Generate a PNG file with valid header and random data padding.
     
     Args:
         file_path (str): Path where the file will be saved
         size_kb (int): Target file size in kilobytes
+        padding (str): 'embedded' puts the random data in private ancillary
+            chunks before IEND, so the file passes strict validators;
+            'append' adds raw bytes after IEND; 'pixels' encodes a real
+            gradient-and-noise image sized to land just under the target
+            (needs NumPy) and embeds the rest
+        seed (int or str, optional): Seed for reproducible content
+        compress_ratio (float, optional): Make the padding compress about
+            this many times with gzip or zstd instead of not at all
+        fill (str): 'random' generates the padding; 'sparse' and 'allocate'
+            leave it as zeros in a hole or in preallocated blocks, which
+            takes milliseconds even for files of hundreds of GB
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
     """
     # Create generated folder and get full path
     generated_folder = create_generated_folder()
     full_path = os.path.join(generated_folder, file_path)
     
     try:
-        # Create a minimal 1x1 pixel black image
-        img = Image.new('RGB', (1, 1), color='black')
-        
-        # Save the minimal image to a BytesIO buffer to get its header
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        
-        # Get the header bytes
-        header_bytes = buffer.getvalue()
-        header_size = len(header_bytes)
-        
-        # Calculate remaining bytes needed
-        target_bytes = size_kb * 1024
-        remaining_bytes = target_bytes - header_size
+        header_bytes, padding = _image_header('PNG', size_kb, padding, seed, fill)
+        _write_image(full_path, header_bytes, int(size_kb * 1024), padding,
+                     _png_padding_offset, _iter_png_padding, PNG_CHUNK_OVERHEAD, seed,
+                     fill, _write_png_sparse_padding, compress_ratio)
         
-        if remaining_bytes < 0:
-            print(f"Warning: Requested size ({size_kb} KB) is smaller than minimum PNG header size.")
-            # Just save the minimal image
-            with open(full_path, 'wb') as f:
-                f.write(header_bytes)
-        else:
-            # Generate random padding data (convert remaining bytes to KB for the function)
-            padding_data = generate_random_bytes(remaining_bytes // 1024)
-            
-            # We need to make sure we get exactly the right amount of bytes
-            # generate_random_bytes returns size_kb * 1024 bytes, so we need to trim or pad
-            actual_padding_size = len(padding_data)
-            if actual_padding_size < remaining_bytes:
-                # Add more random bytes if needed
-                extra_bytes = os.urandom(remaining_bytes - actual_padding_size)
-                padding_data += extra_bytes
-            elif actual_padding_size > remaining_bytes:
-                # Trim excess bytes
-                padding_data = padding_data[:remaining_bytes]
-            
-            # Combine header and padding
-            final_data = header_bytes + padding_data
-            
-            # Write to file
-            with open(full_path, 'wb') as f:
-                f.write(final_data)
-        
-        print(f"Successfully generated PNG file: {full_path} ({size_kb} KB)")
+        if verbose:
+            print(f"Successfully generated PNG file: {full_path} ({size_kb} KB)")
+        return full_path
         
     except Exception as e:
-        print(f"Error generating PNG file: {e}")
+        if verbose:
+            print(f"Error generating PNG file: {e}")
         raise
 
 
-def generate_jpg(file_path, size_kb):
+def iter_jpg(size_kb, padding='embedded', seed=None, compress_ratio=None):
+    """
+    Yield the bytes of a JPG/JPEG file with valid header and random data padding.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        padding (str): 'embedded', 'append' or 'pixels', see generate_jpg
+        seed (int or str, optional): Seed for reproducible content
+        compress_ratio (float, optional): Compression ratio of the padding
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    header_bytes, padding = _image_header('JPEG', size_kb, padding, seed, 'random')
+    yield from _iter_image(header_bytes, int(size_kb * 1024), padding,
+                           _jpeg_padding_offset, _iter_jpeg_padding, JPEG_SEGMENT_OVERHEAD, seed, compress_ratio)
+
+
+def generate_jpg(file_path, size_kb, padding='embedded', seed=None, compress_ratio=None, fill='random',
+                 verbose=True):
     """
     Generate a JPG/JPEG file with valid header and random data padding.
     
     Args:
         file_path (str): Path where the file will be saved
         size_kb (int): Target file size in kilobytes
+        padding (str): 'embedded' puts the random data in COM segments after
+            the APPn headers, so the file passes strict validators;
+            'append' adds raw bytes after EOI; 'pixels' encodes a real
+            gradient-and-noise image sized to land just under the target
+            (needs NumPy) and embeds the rest
+        seed (int or str, optional): Seed for reproducible content
+        compress_ratio (float, optional): Make the padding compress about
+            this many times with gzip or zstd instead of not at all
+        fill (str): 'random' generates the padding; 'sparse' and 'allocate'
+            append zeros after EOI as a hole or in preallocated blocks
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
     """
     # Create generated folder and get full path
     generated_folder = create_generated_folder()
     full_path = os.path.join(generated_folder, file_path)
     
     try:
-        # Create a minimal 1x1 pixel black image
-        img = Image.new('RGB', (1, 1), color='black')
-        
-        # Save the minimal image to a BytesIO buffer to get its header
-        buffer = BytesIO()
-        img.save(buffer, format='JPEG')
-        
-        # Get the header bytes
-        header_bytes = buffer.getvalue()
-        header_size = len(header_bytes)
-        
-        # Calculate remaining bytes needed
-        target_bytes = size_kb * 1024
-        remaining_bytes = target_bytes - header_size
+        header_bytes, padding = _image_header('JPEG', size_kb, padding, seed, fill)
+        _write_image(full_path, header_bytes, int(size_kb * 1024), padding,
+                     _jpeg_padding_offset, _iter_jpeg_padding, JPEG_SEGMENT_OVERHEAD, seed,
+                     fill, compress_ratio=compress_ratio)
         
-        if remaining_bytes < 0:
-            print(f"Warning: Requested size ({size_kb} KB) is smaller than minimum JPEG header size.")
-            # Just save the minimal image
-            with open(full_path, 'wb') as f:
-                f.write(header_bytes)
-        else:
-            # Generate random padding data (convert remaining bytes to KB for the function)
-            padding_data = generate_random_bytes(remaining_bytes // 1024)
-            
-            # We need to make sure we get exactly the right amount of bytes
-            # generate_random_bytes returns size_kb * 1024 bytes, so we need to trim or pad
-            actual_padding_size = len(padding_data)
-            if actual_padding_size < remaining_bytes:
-                # Add more random bytes if needed
-                extra_bytes = os.urandom(remaining_bytes - actual_padding_size)
-                padding_data += extra_bytes
-            elif actual_padding_size > remaining_bytes:
-                # Trim excess bytes
-                padding_data = padding_data[:remaining_bytes]
-            
-            # Combine header and padding
-            final_data = header_bytes + padding_data
-            
-            # Write to file
-            with open(full_path, 'wb') as f:
-                f.write(final_data)
-        
-        print(f"Successfully generated JPG file: {full_path} ({size_kb} KB)")
+        if verbose:
+            print(f"Successfully generated JPG file: {full_path} ({size_kb} KB)")
+        return full_path
         
     except Exception as e:
-        print(f"Error generating JPG file: {e}")
-        raise
\ No newline at end of file
+        if verbose:
+            print(f"Error generating JPG file: {e}")
+        raise
@@ -0,0 +1,398 @@
+import os
+import sys
+import time
+
+
+# Things profiling can do, as a comma-separated spec in FILEGEN_PROFILE or
+# the --profile flag: 'summary' prints a phase table after the batch,
+# 'json' emits one JSON line per file, 'cprofile' and 'tracemalloc'
+# capture function statistics and peak Python memory, and 'fsync' flushes
+# each file to disk so that cost is measured instead of left to the kernel.
+PROFILE_OPTIONS = ('summary', 'json', 'cprofile', 'tracemalloc', 'fsync')
+
+# Phases reported in the summary table, in pipeline order. Generators may
+# use other names; they are listed after these.
+PHASES = ('synthesize', 'serialize', 'write', 'fsync')
+
+# Options that measure a whole process rather than one thread: cProfile
+# allows one active profiler at a time in newer Pythons, and the
+# tracemalloc peak counts every thread's allocations. While they are on,
+# thread-pool jobs run one at a time so each file is measured alone.
+SERIAL_OPTIONS = frozenset({'cprofile', 'tracemalloc'})
+
+# Functions listed from the merged cProfile statistics
+CPROFILE_TOP = 15
+
+# Active options; empty means profiling is off and every hook is a no-op
+_options = frozenset()
+
+# Where JSON lines go: a file path, or None for standard error
+_output_path = None
+
+# Per-thread current record; created when profiling is switched on so
+# that runs without it never import threading
+_local = None
+
+# Batch totals built by collect()
+_totals = None
+
+# Whether tracemalloc was started here, so turning profiling off stops it
+_started_tracemalloc = False
+
+
+class _NullContext:
+    """Do-nothing context manager returned by the hooks when profiling is off"""
+    
+    def __enter__(self):
+        return None
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL = _NullContext()
+
+
+def parse_spec(spec):
+    """
+    Parse a profiling spec such as 'summary,json'.
+    
+    Args:
+        spec (str): Comma-separated PROFILE_OPTIONS; '1' means 'summary',
+            empty or '0' means off
+    
+    Returns:
+        frozenset: The selected options
+    """
+    spec = (spec or '').strip()
+    if spec in ('', '0'):
+        return frozenset()
+    if spec == '1':
+        return frozenset({'summary'})
+    options = {option.strip() for option in spec.split(',') if option.strip()}
+    unknown = options - set(PROFILE_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown profile option '{sorted(unknown)[0]}', expected any of {', '.join(PROFILE_OPTIONS)}")
+    # Capturing without reporting would be pointless
+    if not options & {'summary', 'json'}:
+        options.add('summary')
+    return frozenset(options)
+
+
+def configure(spec=None, output_path=None):
+    """
+    Switch profiling on or off for this process and its workers.
+    
+    The settings are also written to the environment, so worker
+    processes started afterwards pick them up.
+    
+    Args:
+        spec (str, optional): Profiling spec, see parse_spec; None reads
+            FILEGEN_PROFILE
+        output_path (str, optional): File that receives the JSON lines;
+            None reads FILEGEN_PROFILE_OUT, else standard error
+    """
+    global _options, _output_path, _local, _totals, _started_tracemalloc
+    if spec is None:
+        spec = os.environ.get("FILEGEN_PROFILE", "")
+    if output_path is None:
+        output_path = os.environ.get("FILEGEN_PROFILE_OUT") or None
+    
+    _options = parse_spec(spec)
+    _output_path = output_path
+    os.environ["FILEGEN_PROFILE"] = ','.join(sorted(_options)) or '0'
+    if output_path:
+        os.environ["FILEGEN_PROFILE_OUT"] = output_path
+    else:
+        os.environ.pop("FILEGEN_PROFILE_OUT", None)
+    
+    if _options and _local is None:
+        import threading
+        _local = threading.local()
+    if _started_tracemalloc and 'tracemalloc' not in _options:
+        import tracemalloc
+        tracemalloc.stop()
+        _started_tracemalloc = False
+    _totals = {'files': 0, 'bytes': 0, 'elapsed': 0.0, 'phases': {}, 'counters': {},
+               'tracemalloc_peak': 0, 'cprofile': None}
+
+
+def enabled():
+    """Tell whether profiling is on"""
+    return bool(_options)
+
+
+def serial_threads():
+    """Tell whether jobs sharing this process must run one at a time to be measured"""
+    return bool(_options & SERIAL_OPTIONS)
+
+
+def _current():
+    """Get the record of the file being generated by this thread, if any"""
+    return getattr(_local, 'record', None) if _local is not None else None
+
+
+class _FileRecord:
+    """Context manager that measures the generation of one file"""
+    
+    def __init__(self, file_type, file_path):
+        self.record = {'type': file_type, 'path': file_path, 'size_bytes': 0, 'bytes_written': 0,
+                       'elapsed_s': 0.0, 'phases': {}, 'counters': {}}
+        self._profiler = None
+        self._start = None
+    
+    def __enter__(self):
+        global _started_tracemalloc
+        _local.record = self.record
+        if 'tracemalloc' in _options:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracemalloc = True
+            tracemalloc.reset_peak()
+        if 'cprofile' in _options:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.perf_counter()
+        return self.record
+    
+    def __exit__(self, *exc_info):
+        self.record['elapsed_s'] = time.perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.create_stats()
+            self.record['cprofile'] = self._profiler.stats
+        if 'tracemalloc' in _options:
+            import tracemalloc
+            self.record['tracemalloc_peak'] = tracemalloc.get_traced_memory()[1]
+        _local.record = None
+        return False
+
+
+def file_record(file_type, file_path):
+    """
+    Measure the generation of one file.
+    
+    Phases, counters and written bytes reported by the hooks below while
+    the block runs in this thread are added to the record. The record is
+    a plain dict, so it can be returned from a worker process and passed
+    to collect() in the parent.
+    
+    Args:
+        file_type (str): Key of file_generators.GENERATORS
+        file_path (str): Path of the file, for the report
+    
+    Returns:
+        context manager: Yields the record dict, or None when profiling is off
+    """
+    if not _options:
+        return _NULL
+    return _FileRecord(file_type, file_path)
+
+
+class _Phase:
+    """Context manager that adds the time spent in a block to a phase"""
+    
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+    
+    def __enter__(self):
+        self._start = time.perf_counter()
+    
+    def __exit__(self, *exc_info):
+        phases = self.record['phases']
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self._start
+        return False
+
+
+def phase(name):
+    """
+    Time a block as part of a phase of the current file.
+    
+    Args:
+        name (str): Phase name, usually one of PHASES
+    
+    Returns:
+        context manager: Does nothing when no file is being measured
+    """
+    record = _current()
+    if record is None:
+        return _NULL
+    return _Phase(record, name)
+
+
+def count(name, amount=1):
+    """Add to a counter of the current file, e.g. renders of a DOCX"""
+    record = _current()
+    if record is not None:
+        counters = record['counters']
+        counters[name] = counters.get(name, 0) + amount
+
+
+def timed_chunks(chunks, name='synthesize'):
+    """
+    Charge the time spent producing each chunk of a stream to a phase.
+    
+    Args:
+        chunks (iterable): Iterable of bytes-like objects
+        name (str): Phase name
+    
+    Returns:
+        iterable: chunks itself when no file is being measured
+    """
+    record = _current()
+    if record is None:
+        return chunks
+    return _timed_chunks(chunks, _Phase(record, name))
+
+
+def _timed_chunks(chunks, timer):
+    """Generator behind timed_chunks"""
+    iterator = iter(chunks)
+    while True:
+        with timer:
+            chunk = next(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class _TimedFile:
+    """File proxy that charges writes to the 'write' phase and counts bytes"""
+    
+    def __init__(self, f, record):
+        self._f = f
+        self._record = record
+        self._timer = _Phase(record, 'write')
+    
+    def write(self, data):
+        # The pipelined writer calls this from its own thread, so the
+        # record is bound here instead of looked up per thread
+        with self._timer:
+            written = self._f.write(data)
+        self._record['bytes_written'] += written if written is not None else len(data)
+        return written
+    
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+def timed_file(f):
+    """
+    Wrap a binary file object so writes are timed and counted.
+    
+    Args:
+        f: Writable binary file object
+    
+    Returns:
+        file object: f itself when no file is being measured
+    """
+    record = _current()
+    if record is None:
+        return f
+    return _TimedFile(f, record)
+
+
+def sync_file(full_path):
+    """With the 'fsync' option, flush a generated file to disk as its own phase"""
+    record = _current()
+    if record is None or 'fsync' not in _options:
+        return
+    with _Phase(record, 'fsync'):
+        fd = os.open(full_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class _RawStats:
+    """Adapter that lets pstats.Stats load a stats dict from another process"""
+    
+    def __init__(self, stats):
+        self.stats = stats
+    
+    def create_stats(self):
+        pass
+
+
+def collect(record, size_bytes=None):
+    """
+    Report a finished record and add it to the batch totals.
+    
+    Args:
+        record (dict): Record yielded by file_record, or None
+        size_bytes (int, optional): Final size of the file
+    """
+    if record is None or not _options:
+        return
+    if size_bytes is not None:
+        record['size_bytes'] = size_bytes
+    
+    stats = record.pop('cprofile', None)
+    if stats is not None:
+        import pstats
+        if _totals['cprofile'] is None:
+            _totals['cprofile'] = pstats.Stats(_RawStats(stats))
+        else:
+            _totals['cprofile'].add(_RawStats(stats))
+    
+    _totals['files'] += 1
+    _totals['bytes'] += record['bytes_written']
+    _totals['elapsed'] += record['elapsed_s']
+    _totals['tracemalloc_peak'] = max(_totals['tracemalloc_peak'], record.get('tracemalloc_peak', 0))
+    for key in ('phases', 'counters'):
+        for name, value in record[key].items():
+            _totals[key][name] = _totals[key].get(name, 0) + value
+    
+    if 'json' in _options:
+        import json
+        line = json.dumps(record, sort_keys=True) + "\n"
+        if _output_path:
+            with open(_output_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        else:
+            sys.stderr.write(line)
+
+
+def finish(stream=None):
+    """
+    Print the summary of the batch, if requested.
+    
+    Args:
+        stream: Text stream for the report (default: standard error)
+    """
+    if not _options or _totals is None or 'summary' not in _options:
+        return
+    stream = stream or sys.stderr
+    totals = _totals
+    elapsed = totals['elapsed']
+    
+    print(f"\nProfile of {totals['files']} files, {elapsed:.3f} s of generation time "
+          f"(summed over workers), {totals['bytes'] / (1024 * 1024):.1f} MB written:", file=stream)
+    print(f"  {'phase':<14} {'seconds':>10} {'share':>7}", file=stream)
+    names = [name for name in PHASES if name in totals['phases']]
+    names += sorted(name for name in totals['phases'] if name not in PHASES)
+    for name in names:
+        seconds = totals['phases'][name]
+        print(f"  {name:<14} {seconds:10.3f} {seconds / max(elapsed, 1e-9):7.1%}", file=stream)
+    other = elapsed - sum(totals['phases'].values())
+    print(f"  {'other':<14} {max(other, 0.0):10.3f} {max(other, 0.0) / max(elapsed, 1e-9):7.1%}", file=stream)
+    for name, value in sorted(totals['counters'].items()):
+        print(f"  counter {name}: {value}", file=stream)
+    if 'tracemalloc' in _options:
+        print(f"  tracemalloc peak per file: {totals['tracemalloc_peak'] / (1024 * 1024):.2f} MB", file=stream)
+    if totals['cprofile'] is not None:
+        print(f"\n  Top {CPROFILE_TOP} functions by cumulative time:", file=stream)
+        totals['cprofile'].stream = stream
+        totals['cprofile'].sort_stats('cumulative').print_stats(CPROFILE_TOP)
+
+
+# Honour FILEGEN_PROFILE in scripts and worker processes
+if os.environ.get("FILEGEN_PROFILE", "0") not in ("", "0"):
+    try:
+        configure()
+    except ValueError as e:
+        print(f"Warning: profiling disabled: {e}", file=sys.stderr)
@@ -0,0 +1,264 @@
+import sys
+import os
+import json
+import math
+import random
+import time
+
+from utils import parse_size, create_generated_folder
+from file_generators import GENERATORS
+from file_generators.scheduler import make_job, iter_results
+
+
+# Name of the journal of completed outputs, kept in the output folder
+JOURNAL_NAME = ".filegen-journal.jsonl"
+
+# Size distributions accepted in a manifest entry
+SIZE_DISTRIBUTIONS = ('uniform', 'log-uniform')
+
+
+def load_manifest(manifest_path):
+    """
+    Load a manifest from a JSON or YAML file.
+    
+    A manifest looks like this (JSON shown, YAML has the same structure):
+        
+        {
+          "output": "corpus",
+          "seed": 1,
+          "files": [
+            {"type": "png", "count": 5000,
+             "size": {"min": "1KB", "max": "10MB", "distribution": "log-uniform"},
+             "name": "images/img_{index:05d}.{ext}"},
+            {"type": "docx", "count": 200, "size": "2MB"}
+          ]
+        }
+    
+    Args:
+        manifest_path (str): Path of a .json, .yaml or .yml file
+    
+    Returns:
+        dict: The parsed manifest
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        if manifest_path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML manifests need PyYAML (pip install pyyaml); use JSON otherwise")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+    
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('files'), list):
+        raise ValueError("Manifest must be a mapping with a 'files' list")
+    return manifest
+
+
+def _sample_sizes(size_spec, count, rng):
+    """
+    Draw the sizes (in KB) of one manifest entry.
+    
+    Args:
+        size_spec: A size string such as "2MB", a {"choices": [...]} mapping, or a
+            {"min": ..., "max": ..., "distribution": ...} mapping
+        count (int): Number of sizes to draw
+        rng (random.Random): Seeded generator, so reruns see the same sizes
+    
+    Returns:
+        list: Sizes in kilobytes
+    """
+    if isinstance(size_spec, (str, int, float)):
+        return [parse_size(str(size_spec))] * count
+    
+    if not isinstance(size_spec, dict):
+        raise ValueError(f"Invalid size specification: {size_spec!r}")
+    
+    if 'choices' in size_spec:
+        choices = [parse_size(str(choice)) for choice in size_spec['choices']]
+        return [rng.choice(choices) for _ in range(count)]
+    
+    low = parse_size(str(size_spec['min']))
+    high = parse_size(str(size_spec['max']))
+    if low > high:
+        raise ValueError(f"Size minimum {size_spec['min']} is larger than maximum {size_spec['max']}")
+    distribution = size_spec.get('distribution', 'uniform')
+    if distribution not in SIZE_DISTRIBUTIONS:
+        raise ValueError(f"Unknown size distribution '{distribution}', expected one of {', '.join(SIZE_DISTRIBUTIONS)}")
+    
+    sizes = []
+    for _ in range(count):
+        if distribution == 'log-uniform':
+            size_kb = math.exp(rng.uniform(math.log(low), math.log(high)))
+        else:
+            size_kb = rng.uniform(low, high)
+        # Whole bytes, so the journal can compare sizes exactly
+        sizes.append(max(round(size_kb * 1024), 1) / 1024)
+    return sizes
+
+
+def _job_record(job):
+    """
+    Describe a planned job the way the journal stores it.
+    
+    A file only counts as done if it was made for the same type, size and
+    options, so editing a manifest entry regenerates its files.
+    
+    Args:
+        job (GenerationJob): Planned job
+    
+    Returns:
+        dict: JSON-compatible type, size and options of the job
+    """
+    return json.loads(json.dumps({'type': job.file_type, 'size_kb': job.size_kb, 'options': job.options},
+                                 default=str))
+
+
+def expand_manifest(manifest, out_dir):
+    """
+    Turn a manifest into generation jobs.
+    
+    Args:
+        manifest (dict): Parsed manifest
+        out_dir (str): Folder the relative output names are resolved against
+    
+    Returns:
+        list: (relative_path, GenerationJob) tuples
+    """
+    seed = manifest.get('seed', 0)
+    planned = []
+    seen = set()
+    
+    for position, entry in enumerate(manifest['files']):
+        file_type = entry.get('type')
+        if file_type not in GENERATORS:
+            raise ValueError(f"Entry {position}: unknown file type {file_type!r}")
+        _, extension = GENERATORS[file_type]
+        count = int(entry.get('count', 1))
+        pattern = entry.get('name', f"{file_type}/{file_type}_{{index:05d}}.{{ext}}")
+        options = entry.get('options', {})
+        content_seed = entry.get('content_seed')
+        # Each entry draws from its own generator, so editing one entry
+        # does not move the sizes of the entries after it
+        rng = random.Random(f"{seed}:{position}")
+        
+        for index, size_kb in enumerate(_sample_sizes(entry.get('size'), count, rng)):
+            relative_path = os.path.normpath(pattern.format(index=index, type=file_type, ext=extension))
+            if os.path.isabs(relative_path) or relative_path.split(os.sep)[0] == os.pardir:
+                raise ValueError(f"Entry {position}: output name '{relative_path}' is outside the output folder")
+            if relative_path in seen:
+                raise ValueError(f"Entry {position}: output name '{relative_path}' is used more than once")
+            seen.add(relative_path)
+            if content_seed is not None:
+                options = dict(options, seed=f"{content_seed}:{index}")
+            job = make_job(file_type, os.path.join(out_dir, relative_path), size_kb, **options)
+            planned.append((relative_path, job))
+    
+    return planned
+
+
+def read_journal(out_dir):
+    """
+    Read the journal of completed outputs.
+    
+    Args:
+        out_dir (str): Output folder of the manifest run
+    
+    Returns:
+        dict: relative path -> journal record, with the size in bytes and
+            the job (see _job_record) the file was completed for
+    """
+    completed = {}
+    journal_path = os.path.join(out_dir, JOURNAL_NAME)
+    if not os.path.exists(journal_path):
+        return completed
+    
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                completed[record['path']] = dict(record, size_bytes=int(record['size_bytes']))
+            except (ValueError, KeyError, TypeError):
+                # A crash can leave a torn last line; that file is regenerated
+                continue
+    return completed
+
+
+def run_manifest(manifest_path, out_dir=None, workers=None, threads=None, verbose=True):
+    """
+    Generate every file described by a manifest, resuming an earlier run.
+    
+    Each completed file is appended to a journal in the output folder.
+    A rerun skips files that are in the journal for the same type, size
+    and options and still exist with the recorded size, so after a crash
+    only unfinished files are generated, and after an edit only the files
+    of changed entries.
+    
+    Args:
+        manifest_path (str): Path of the JSON or YAML manifest
+        out_dir (str, optional): Output folder; overrides the manifest's 'output'
+        workers (int, optional): Worker processes (default: manifest 'workers' or 1)
+        threads (int, optional): Worker threads (default: same as workers)
+        verbose (bool): Print a summary at the end
+    
+    Returns:
+        dict: Counts of generated, skipped and failed files, bytes written and elapsed time
+    """
+    manifest = load_manifest(manifest_path)
+    if out_dir is None:
+        output = manifest.get('output')
+        if output:
+            # Relative output folders are relative to the manifest file
+            out_dir = os.path.join(os.path.dirname(os.path.abspath(manifest_path)), output)
+        else:
+            out_dir = create_generated_folder()
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    
+    workers = workers or manifest.get('workers', 1)
+    threads = threads or workers
+    
+    planned = expand_manifest(manifest, out_dir)
+    completed = read_journal(out_dir)
+    
+    pending = []
+    for relative_path, job in planned:
+        full_path = job.file_path
+        record = completed.get(relative_path)
+        if record is not None and record.get('job') == _job_record(job) and os.path.exists(full_path) \
+                and os.path.getsize(full_path) == record['size_bytes']:
+            continue
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        pending.append((relative_path, job))
+    
+    summary = {'planned': len(planned), 'skipped': len(planned) - len(pending),
+               'generated': 0, 'failed': 0, 'bytes': 0, 'elapsed': 0.0}
+    start = time.perf_counter()
+    
+    with open(os.path.join(out_dir, JOURNAL_NAME), 'a+', encoding='utf-8') as journal:
+        # Start on a fresh line if an earlier run was killed mid-record
+        if journal.tell() > 0:
+            journal.seek(journal.tell() - 1)
+            if journal.read(1) != "\n":
+                journal.write("\n")
+        
+        jobs = [job for _, job in pending]
+        for result in iter_results(jobs, processes=workers, threads=threads):
+            relative_path = pending[result.index][0]
+            if result.error is not None:
+                summary['failed'] += 1
+                print(f"Error generating {relative_path}: {result.error}", file=sys.stderr)
+                continue
+            journal.write(json.dumps({'path': relative_path, 'type': result.job.file_type,
+                                      'size_bytes': result.size_bytes, 'job': _job_record(result.job)}) + "\n")
+            journal.flush()
+            summary['generated'] += 1
+            summary['bytes'] += result.size_bytes
+    
+    summary['elapsed'] = time.perf_counter() - start
+    if verbose:
+        elapsed = max(summary['elapsed'], 1e-9)
+        print(f"Manifest {os.path.basename(manifest_path)}: {summary['generated']} generated, "
+              f"{summary['skipped']} already done, {summary['failed']} failed in {out_dir} "
+              f"({summary['elapsed']:.2f} s, {summary['bytes'] / (1024 * 1024) / elapsed:.1f} MB/s)")
+    return summary
@@ -0,0 +1,162 @@
+import os
+import time
+from collections import namedtuple
+
+from file_generators import GENERATORS
+from file_generators import instrument
+from file_generators import file_cache
+
+
+# File types whose time goes into Python-level work (text synthesis, XML
+# building, compression) run in worker processes to get around the GIL.
+# The remaining types mostly wait on os.urandom and disk writes, which
+# release the GIL, so threads are enough for them.
+PROCESS_TYPES = frozenset({'pdf', 'docx', 'svg'})
+
+# A single generation request. options holds extra generator keyword
+# arguments, e.g. {'padding': 'append'} for images.
+GenerationJob = namedtuple('GenerationJob', ['file_type', 'file_path', 'size_kb', 'options'])
+
+# Outcome of a job: the full path and size on success, or the error
+GenerationResult = namedtuple('GenerationResult', ['index', 'job', 'full_path', 'size_bytes', 'elapsed', 'error'])
+
+
+def make_job(file_type, file_path, size_kb, **options):
+    """
+    Create a GenerationJob, checking that the file type is known.
+    
+    Args:
+        file_type (str): Key of file_generators.GENERATORS, e.g. 'png'
+        file_path (str): Path passed to the generator
+        size_kb (float): Target file size in kilobytes
+        **options: Extra generator keyword arguments
+    
+    Returns:
+        GenerationJob: The job
+    """
+    if file_type not in GENERATORS:
+        raise ValueError(f"Unknown file type '{file_type}', expected one of {', '.join(sorted(GENERATORS))}")
+    return GenerationJob(file_type, file_path, size_kb, options)
+
+
+def run_job(job):
+    """
+    Run one job in the current process and thread.
+    
+    With the file cache switched on (file_cache.configure), seeded files
+    made before are cloned from the cache instead of generated.
+    
+    Args:
+        job (GenerationJob): Job to run
+    
+    Returns:
+        tuple: (full_path, size_bytes, elapsed_seconds, profile_record), where
+            profile_record is None unless profiling is on
+    """
+    generator, _ = GENERATORS[job.file_type]
+    with instrument.file_record(job.file_type, job.file_path) as record:
+        start = time.perf_counter()
+        if file_cache.enabled():
+            full_path, _ = file_cache.generate_cached(job.file_type, job.file_path, job.size_kb, verbose=False,
+                                                      **job.options)
+        else:
+            full_path = generator(job.file_path, job.size_kb, verbose=False, **job.options)
+        instrument.sync_file(full_path)
+        elapsed = time.perf_counter() - start
+    return full_path, os.path.getsize(full_path), elapsed, record
+
+
+def iter_results(jobs, processes=None, threads=None, stop_on_error=False):
+    """
+    Run jobs on a process pool and a thread pool, yielding results in job order.
+    
+    CPU-bound file types (PROCESS_TYPES) go to worker processes and the
+    rest to threads. Results are reported in submission order no matter
+    which job finishes first. With profiling on, each job's record is
+    passed to instrument.collect here, in the calling process. If the
+    consumer stops early, for example on KeyboardInterrupt or because
+    stop_on_error is set, queued jobs are cancelled and the pools wait
+    only for jobs that are already running. With processes=1 and
+    threads=1 the jobs run inline instead. While cProfile or tracemalloc
+    profiling is on, thread jobs run one at a time, since both measure
+    the whole process.
+    
+    Args:
+        jobs (iterable): GenerationJob objects
+        processes (int, optional): Worker processes (default: CPU count)
+        threads (int, optional): Worker threads (default: 2 x CPU count)
+        stop_on_error (bool): Stop after the first failed job
+    
+    Yields:
+        GenerationResult: One result per job, in order
+    """
+    if instrument.serial_threads():
+        threads = 1
+    # With a single worker of each kind there is nothing to overlap, so
+    # run inline and skip the pool hand-off cost
+    if processes == 1 and threads == 1:
+        for index, job in enumerate(jobs):
+            try:
+                full_path, size_bytes, elapsed, record = run_job(job)
+                instrument.collect(record, size_bytes)
+                yield GenerationResult(index, job, full_path, size_bytes, elapsed, None)
+            except Exception as e:
+                yield GenerationResult(index, job, None, 0, 0.0, e)
+                if stop_on_error:
+                    break
+        return
+    
+    # Pools are only needed off the inline path; importing them is not free
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    
+    jobs = list(jobs)
+    cpu_count = os.cpu_count() or 1
+    process_pool = None
+    thread_pool = None
+    futures = []
+    
+    try:
+        # Pools are only started for the kinds of jobs actually present
+        for job in jobs:
+            if job.file_type in PROCESS_TYPES:
+                if process_pool is None:
+                    process_pool = ProcessPoolExecutor(max_workers=processes or cpu_count)
+                futures.append(process_pool.submit(run_job, job))
+            else:
+                if thread_pool is None:
+                    thread_pool = ThreadPoolExecutor(max_workers=threads or 2 * cpu_count)
+                futures.append(thread_pool.submit(run_job, job))
+        
+        for index, (job, future) in enumerate(zip(jobs, futures)):
+            try:
+                full_path, size_bytes, elapsed, record = future.result()
+                # Records of worker processes come back with the result
+                instrument.collect(record, size_bytes)
+                yield GenerationResult(index, job, full_path, size_bytes, elapsed, None)
+            except Exception as e:
+                yield GenerationResult(index, job, None, 0, 0.0, e)
+                if stop_on_error:
+                    break
+    finally:
+        # Cancel whatever has not started yet, then wait for running jobs
+        for future in futures:
+            future.cancel()
+        for pool in (process_pool, thread_pool):
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run_jobs(jobs, processes=None, threads=None, stop_on_error=False):
+    """
+    Run jobs in parallel and collect all results.
+    
+    Args:
+        jobs (iterable): GenerationJob objects
+        processes (int, optional): Worker processes (default: CPU count)
+        threads (int, optional): Worker threads (default: 2 x CPU count)
+        stop_on_error (bool): Stop after the first failed job
+    
+    Returns:
+        list: GenerationResult objects in job order
+    """
+    return list(iter_results(jobs, processes, threads, stop_on_error))
@@ -0,0 +1,374 @@
+import asyncio
+import functools
+import hashlib
+import itertools
+import sys
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl, unquote
+from utils import parse_size, CHUNK_SIZE
+from file_generators import COMPRESSIBLE_TYPES, ARCHIVE_TYPES
+from file_generators.stream import iter_chunks, ITERATORS
+
+
+# Content-Type of each file type
+CONTENT_TYPES = {
+    'txt': 'text/plain',
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'svg': 'image/svg+xml',
+    'zip': 'application/zip',
+    'tar': 'application/x-tar',
+    'tgz': 'application/gzip',
+}
+
+# Query parameters passed on to the generators, and the types that take them
+QUERY_OPTIONS = {
+    'seed': tuple(ITERATORS),
+    'padding': ('png', 'jpg'),
+    'compress_ratio': COMPRESSIBLE_TYPES,
+    'members': ARCHIVE_TYPES,
+}
+
+# Files up to this size, and every DOCX, are generated before the response
+# starts, so Content-Length is exact even below a format's minimum size.
+# Larger files are exactly their target size and stream as they are made.
+BUFFERED_MAX_BYTES = 1024 * 1024
+
+# Largest file served by default. DOCX and pixel-mode images are built
+# whole in memory, and a range still generates every byte before it, so
+# an unbounded size lets one request tie up the server.
+MAX_FILE_BYTES = 1024 * 1024 * 1024
+
+# Largest request line plus headers accepted
+MAX_HEADER_BYTES = 16 * 1024
+
+# Bytes handed from the generator thread to the event loop at a time; the
+# writer is drained after each batch, so a slow client holds about this much
+BATCH_BYTES = CHUNK_SIZE
+
+
+class HTTPError(Exception):
+    """Request that is answered with an error status"""
+    
+    def __init__(self, status, message=None, headers=None):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+        self.headers = headers or {}
+
+
+def parse_target(target):
+    """
+    Parse a request target such as '/png/5MB?seed=42&padding=append&compress_ratio=4'.
+    
+    Without a seed the file is seeded from its type, size and options, so
+    the same URL always serves the same bytes, as a static file would.
+    That keeps Range requests and resumed downloads consistent; add a
+    seed parameter for distinct contents.
+    
+    Args:
+        target (str): Path and query of the request
+    
+    Returns:
+        tuple: (file_type, size_kb, options)
+    
+    Raises:
+        HTTPError: 404 for unknown types or paths, 400 for bad sizes or options
+    """
+    parts = urlsplit(target)
+    segments = [unquote(segment) for segment in parts.path.split('/') if segment]
+    if len(segments) != 2 or segments[0].lower() not in ITERATORS:
+        raise HTTPError(404, f"Expected /TYPE/SIZE with TYPE one of {', '.join(ITERATORS)}")
+    file_type = segments[0].lower()
+    try:
+        size_kb = parse_size(segments[1])
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+    
+    options = {}
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        if file_type not in QUERY_OPTIONS.get(name, ()):
+            raise HTTPError(400, f"Unknown option '{name}' for {file_type.upper()}")
+        options[name] = value
+    if 'compress_ratio' in options:
+        try:
+            options['compress_ratio'] = float(options['compress_ratio'])
+        except ValueError:
+            raise HTTPError(400, f"Invalid compression ratio '{options['compress_ratio']}'")
+    if 'members' in options:
+        try:
+            options['members'] = int(options['members'])
+        except ValueError:
+            raise HTTPError(400, f"Invalid member count '{options['members']}'")
+    if 'seed' not in options:
+        extra = ''.join(f":{name}={options[name]}" for name in sorted(options))
+        options['seed'] = f"url:{file_type}:{int(size_kb * 1024)}{extra}"
+    return file_type, size_kb, options
+
+
+def parse_range(header, length):
+    """
+    Parse a single-range 'Range: bytes=...' header.
+    
+    Args:
+        header (str): Value of the Range header
+        length (int): Size of the file
+    
+    Returns:
+        tuple: (start, end) with end exclusive, or None to serve the whole
+            file (unsupported units and multiple ranges are ignored, as
+            RFC 9110 allows)
+    
+    Raises:
+        HTTPError: 416 when the range lies outside the file
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, dash, last = spec.strip().partition('-')
+    if not dash:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) + 1 if last else length
+        else:
+            start = max(length - int(last), 0)
+            end = length
+    except ValueError:
+        return None
+    end = min(end, length)
+    if start >= end:
+        raise HTTPError(416, headers={'Content-Range': f"bytes */{length}"})
+    return start, end
+
+
+def open_file(file_type, size_kb, options):
+    """
+    Start generating a file.
+    
+    This blocks while small files and DOCX are generated, so it is run
+    in a worker thread. The first chunk of a streamed file is produced
+    here as well, so invalid options fail before the response starts.
+    
+    Args:
+        file_type (str): Key of file_generators.GENERATORS
+        size_kb (float): Target file size in kilobytes
+        options (dict): Generator options
+    
+    Returns:
+        tuple: (length, chunks) where chunks is an iterator of memoryviews
+    
+    Raises:
+        HTTPError: 400 when the generator rejects the options
+    """
+    target_bytes = int(size_kb * 1024)
+    try:
+        chunks = iter_chunks(file_type, size_kb, **options)
+        if file_type == 'docx' or target_bytes <= BUFFERED_MAX_BYTES:
+            data = b"".join(chunks)
+            return len(data), iter((memoryview(data),))
+        first = next(chunks)
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+    return target_bytes, itertools.chain((first,), chunks)
+
+
+def _slice_chunks(chunks, start, end):
+    """Yield the part of a chunk stream between byte offsets start and end"""
+    offset = 0
+    for chunk in chunks:
+        size = len(chunk)
+        if offset + size > start:
+            yield chunk[max(start - offset, 0):min(end - offset, size)]
+        offset += size
+        if offset >= end:
+            return
+
+
+def _next_batch(chunks):
+    """Collect chunks until BATCH_BYTES are ready or the stream ends"""
+    batch = []
+    size = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        size += len(chunk)
+        if size >= BATCH_BYTES:
+            break
+    return batch
+
+
+def _file_etag(file_type, size_kb, options):
+    """Strong validator of a generated file: it only depends on the URL's parameters"""
+    key = repr((file_type, int(size_kb * 1024), sorted(options.items())))
+    return '"' + hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+def _response_head(status, headers):
+    """Encode the status line and headers of a response"""
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+
+async def _read_request(reader):
+    """
+    Read one request head.
+    
+    Returns:
+        tuple: (method, target, version, headers), or None when the client
+            closed the connection
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431)
+    lines = head.decode('latin-1').split("\r\n")
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        name, colon, value = line.partition(':')
+        if colon:
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+async def _send_file(writer, executor, method, target, headers, max_bytes=MAX_FILE_BYTES):
+    """
+    Answer a GET or HEAD request for a generated file.
+    
+    Generation runs in executor threads; the event loop only moves
+    batches of memoryviews to the socket and waits for it to drain.
+    Files larger than max_bytes are refused with 413.
+    """
+    loop = asyncio.get_running_loop()
+    file_type, size_kb, options = parse_target(target)
+    if int(size_kb * 1024) > max_bytes:
+        raise HTTPError(413, f"Files are limited to {max_bytes} bytes")
+    length, chunks = await loop.run_in_executor(executor, open_file, file_type, size_kb, options)
+    etag = _file_etag(file_type, size_kb, options)
+    
+    status = 200
+    start, end = 0, length
+    response_headers = {'Content-Type': CONTENT_TYPES[file_type], 'Accept-Ranges': 'bytes', 'ETag': etag}
+    if 'range' in headers and headers.get('if-range', etag) == etag:
+        byte_range = parse_range(headers['range'], length)
+        if byte_range is not None:
+            status = 206
+            start, end = byte_range
+            response_headers['Content-Range'] = f"bytes {start}-{end - 1}/{length}"
+    response_headers['Content-Length'] = str(end - start)
+    writer.write(_response_head(status, response_headers))
+    if method == 'HEAD':
+        await writer.drain()
+        return status, 0
+    
+    # Bytes before the range still have to be generated, since each file
+    # is one sequential stream; they are dropped in the worker thread
+    if (start, end) != (0, length):
+        chunks = _slice_chunks(chunks, start, end)
+    sent = 0
+    while True:
+        batch = await loop.run_in_executor(executor, _next_batch, chunks)
+        if not batch:
+            break
+        for view in batch:
+            writer.write(view)
+            sent += len(view)
+        await writer.drain()
+    return status, sent
+
+
+async def _handle_connection(reader, writer, executor=None, max_bytes=MAX_FILE_BYTES, verbose=False):
+    """Serve requests on one connection until the client closes it or asks to"""
+    peer = writer.get_extra_info('peername')
+    try:
+        while True:
+            method = target = '-'
+            keep_alive = False
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    return
+                method, target, version, headers = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+                if method not in ('GET', 'HEAD'):
+                    raise HTTPError(405)
+                status, sent = await _send_file(writer, executor, method, target, headers, max_bytes)
+            except HTTPError as e:
+                body = f"{e.status} {HTTPStatus(e.status).phrase}: {e}\n".encode('utf-8')
+                error_headers = {'Content-Type': 'text/plain; charset=utf-8', 'Content-Length': str(len(body))}
+                error_headers.update(e.headers)
+                if e.status == 405:
+                    error_headers['Allow'] = 'GET, HEAD'
+                if not keep_alive:
+                    error_headers['Connection'] = 'close'
+                writer.write(_response_head(e.status, error_headers) + body)
+                await writer.drain()
+                status, sent = e.status, len(body)
+            if verbose:
+                print(f"{peer[0] if peer else '-'} {method} {target} {status} {sent}", file=sys.stderr)
+            if not keep_alive:
+                return
+    except ConnectionError:
+        pass
+    except Exception as e:
+        # Headers may already be out, so the connection is all that can be dropped
+        print(f"Error serving {target}: {e}", file=sys.stderr)
+    finally:
+        writer.close()
+
+
+async def start_server(host='127.0.0.1', port=8000, executor=None, max_bytes=MAX_FILE_BYTES, verbose=False):
+    """
+    Start the file-serving HTTP server on the running event loop.
+    
+    'GET /TYPE/SIZE[?seed=S&padding=P]' streams a file made by the
+    generators; nothing is written to disk. Single byte ranges, HEAD,
+    keep-alive and many concurrent clients are supported.
+    
+    Args:
+        host (str): Address to listen on
+        port (int): Port to listen on, 0 for any free port
+        executor (concurrent.futures.Executor, optional): Runs the
+            generators; the loop's default thread pool if None
+        max_bytes (int): Largest file served; larger requests get 413
+        verbose (bool): Log every request to standard error
+    
+    Returns:
+        asyncio.Server: The listening server
+    """
+    handler = functools.partial(_handle_connection, executor=executor, max_bytes=max_bytes, verbose=verbose)
+    return await asyncio.start_server(handler, host, port, limit=MAX_HEADER_BYTES)
+
+
+def serve(host='127.0.0.1', port=8000, threads=None, max_bytes=MAX_FILE_BYTES, verbose=False):
+    """
+    Run the file-serving HTTP server until interrupted.
+    
+    Args:
+        host (str): Address to listen on
+        port (int): Port to listen on
+        threads (int, optional): Generator threads (default: the event
+            loop's default pool size)
+        max_bytes (int): Largest file served; larger requests get 413
+        verbose (bool): Log every request to standard error
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    async def run():
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='serve') as executor:
+            server = await start_server(host, port, executor, max_bytes, verbose)
+            address = server.sockets[0].getsockname()
+            print(f"Serving generated files on http://{address[0]}:{address[1]}/TYPE/SIZE (Ctrl+C to stop)")
+            async with server:
+                await server.serve_forever()
+    
+    asyncio.run(run())
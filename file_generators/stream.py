@@ -0,0 +1,103 @@
+import importlib
+import os
+from utils import write_stream_auto, check_fill_mode
+
+
+# Chunk iterator of each file type: type -> (module, function). Modules are
+# imported on first use, like the generators in file_generators.GENERATORS.
+ITERATORS = {
+    'txt': ('document_generator', 'iter_txt'),
+    'pdf': ('document_generator', 'iter_pdf'),
+    'docx': ('document_generator', 'iter_docx'),
+    'png': ('image_generator', 'iter_png'),
+    'jpg': ('image_generator', 'iter_jpg'),
+    'svg': ('vector_generator', 'iter_svg'),
+    'zip': ('archive_generator', 'iter_zip'),
+    'tar': ('archive_generator', 'iter_tar'),
+    'tgz': ('archive_generator', 'iter_tgz'),
+}
+
+
+class _SinkWriter:
+    """
+    Binary file-like front for any sink, writing every byte it is given.
+    
+    Raw files, pipes and fds may accept only part of a write, so the rest
+    is written in a loop over slices of one view instead of copies.
+    """
+    
+    def __init__(self, sink):
+        if isinstance(sink, int):
+            self._write = lambda view: os.write(sink, view)
+        elif hasattr(sink, 'sendall'):
+            self._write = lambda view: sink.sendall(view) or len(view)
+        elif hasattr(sink, 'write'):
+            self._write = sink.write
+        else:
+            raise TypeError(f"Cannot write to {type(sink).__name__}: expected a file descriptor, "
+                            f"a socket or an object with a write() method")
+    
+    def write(self, data):
+        with memoryview(data) as view, view.cast('B') as view:
+            size = len(view)
+            offset = 0
+            while offset < size:
+                written = self._write(view[offset:])
+                # Writers that return None are taken to have written everything
+                offset = size if written is None else offset + written
+        return size
+
+
+def iter_chunks(file_type, size_kb, fill='random', **options):
+    """
+    Generate a file in memory and yield its bytes as memoryviews.
+    
+    Nothing touches the disk and nothing is copied: each view wraps a
+    chunk exactly as the generator produced it, and stays valid after
+    the next one is requested. Joined together the chunks are the same
+    bytes the matching generate_* function writes for the same options
+    and seed.
+    
+    Args:
+        file_type (str): Key of file_generators.GENERATORS
+        size_kb (float): Target file size in kilobytes
+        fill (str): Only 'random'; 'sparse' and 'allocate' need a real file,
+            so use the generate_* functions for them
+        **options: Generator options such as seed or padding
+    
+    Returns:
+        iterator: memoryview chunks of the file, in order
+    """
+    if fill != 'random':
+        check_fill_mode(fill)
+        raise ValueError(f"fill='{fill}' needs a file on disk, streams only support 'random'")
+    if file_type not in ITERATORS:
+        raise ValueError(f"Unknown file type '{file_type}', expected one of {', '.join(ITERATORS)}")
+    
+    module_name, function_name = ITERATORS[file_type]
+    module = importlib.import_module(f"file_generators.{module_name}")
+    chunks = getattr(module, function_name)(size_kb, **options)
+    return (memoryview(chunk) for chunk in chunks)
+
+
+def write_to(sink, file_type, size_kb, fill='random', **options):
+    """
+    Generate a file straight into a caller-supplied sink.
+    
+    The sink can be a binary file object, a BytesIO, a pipe, a socket or
+    an already-open file descriptor; blocking writes are assumed. Small
+    chunks are gathered into one reusable buffer and large ones are
+    written through as they are, so a sink sees few, large writes.
+    
+    Args:
+        sink: Writable object, socket or int file descriptor
+        file_type (str): Key of file_generators.GENERATORS
+        size_kb (float): Target file size in kilobytes
+        fill (str): Only 'random', see iter_chunks
+        **options: Generator options such as seed or padding
+    
+    Returns:
+        int: Number of bytes written
+    """
+    chunks = iter_chunks(file_type, size_kb, fill, **options)
+    return write_stream_auto(_SinkWriter(sink), chunks, int(size_kb * 1024))
@@ -0,0 +1,289 @@
+import os
+import random
+import time
+from collections import namedtuple
+from functools import partial
+
+from utils import iter_random_bytes, get_random_source
+from file_generators.manifest import _sample_sizes
+
+
+# Names of the directories and files of a tree. Files are numbered across
+# the whole tree, so every name is unique and sorts in generation order.
+TREE_DIR_NAME = "dir_{index:0{width}d}"
+TREE_FILE_NAME = "file_{index:0{width}d}.{ext}"
+TREE_NAME_DIGITS = 5
+
+# Random data is drawn in batches of about this size and sliced between
+# small files, instead of one source call per file
+TREE_BATCH_BYTES = 1024 * 1024
+
+# Subtrees handed to each worker, so a slow subtree does not leave the
+# other workers idle at the end
+TREE_TASKS_PER_WORKER = 4
+
+# Files are created relative to an open directory fd, which saves the
+# kernel a path lookup per file; other platforms fall back to full paths
+TREE_USE_DIR_FD = os.open in os.supports_dir_fd and os.mkdir in os.supports_dir_fd
+TREE_FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+TREE_DIR_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+# Shape of a tree, shared by every subtree task
+# file_name is TREE_FILE_NAME with the width and extension filled in,
+# and dir_names holds the names of the fanout subdirectories
+TreePlan = namedtuple('TreePlan', ['files', 'depth', 'fanout', 'size_spec', 'seed', 'file_name', 'dir_names'])
+
+
+def _check_count(value, label, minimum):
+    """Reject tree parameters that are not whole numbers of at least minimum"""
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{label} must be a whole number of at least {minimum}, not {value!r}")
+
+
+def _leaf_files(plan, leaf):
+    """
+    Get the files of one leaf directory.
+    
+    Files are spread evenly over the leaves in order, so the first
+    files % leaves leaves hold one file more than the rest.
+    
+    Args:
+        plan (TreePlan): Tree shape
+        leaf (int): Index of the leaf directory across the whole tree
+    
+    Returns:
+        range: Indexes of the leaf's files
+    """
+    per_leaf, extra = divmod(plan.files, plan.fanout ** plan.depth)
+    first = leaf * per_leaf + min(leaf, extra)
+    return range(first, first + per_leaf + (1 if leaf < extra else 0))
+
+
+def _split_level(depth, fanout, workers):
+    """
+    Pick the level whose directories become the parallel subtree tasks.
+    
+    Args:
+        depth (int): Levels of directories below the root
+        fanout (int): Subdirectories per directory
+        workers (int): Worker processes
+    
+    Returns:
+        int: The shallowest level with enough directories to keep every
+            worker busy, or the leaf level if there is none
+    """
+    if workers <= 1:
+        return 0
+    level = 0
+    while level < depth and fanout ** level < TREE_TASKS_PER_WORKER * workers:
+        level += 1
+    return level
+
+
+def _subtree_path(plan, level, index):
+    """Relative path of directory index of a level, e.g. dir_03/dir_07"""
+    parts = []
+    for _ in range(level):
+        index, position = divmod(index, plan.fanout)
+        parts.append(plan.dir_names[position])
+    return os.path.join(*reversed(parts)) if parts else ''
+
+
+def _write_file(directory, name, chunks, dir_fd):
+    """Create or truncate one file and write the chunks into it"""
+    if dir_fd is None:
+        fd = os.open(os.path.join(directory, name), TREE_FILE_FLAGS, 0o644)
+    else:
+        fd = os.open(name, TREE_FILE_FLAGS, 0o644, dir_fd=dir_fd)
+    try:
+        for chunk in chunks:
+            while chunk:
+                chunk = chunk[os.write(fd, chunk):]
+    finally:
+        os.close(fd)
+
+
+def _fill_leaf(plan, directory, dir_fd, leaf):
+    """
+    Write the files of one leaf directory.
+    
+    Sizes and content of a seeded tree are seeded per leaf, so the bytes
+    do not depend on how the tree was split between workers.
+    
+    Args:
+        plan (TreePlan): Tree shape
+        directory (str): Path of the leaf directory
+        dir_fd (int): Open fd of the directory, or None to use full paths
+        leaf (int): Index of the leaf across the whole tree
+    
+    Returns:
+        int: Bytes written
+    """
+    indexes = _leaf_files(plan, leaf)
+    if not indexes:
+        return 0
+    
+    source = os.urandom if plan.seed is None else get_random_source(f"{plan.seed}:{leaf}")
+    # Fixed sizes need no draws, which saves seeding a generator per leaf
+    rng = None
+    if isinstance(plan.size_spec, dict):
+        rng = random.Random() if plan.seed is None else random.Random(f"{plan.seed}:{leaf}")
+    sizes = [round(size_kb * 1024) for size_kb in _sample_sizes(plan.size_spec, len(indexes), rng)]
+    
+    remaining = sum(size for size in sizes if size <= TREE_BATCH_BYTES)
+    batch = memoryview(b'')
+    offset = 0
+    for index, size in zip(indexes, sizes):
+        name = plan.file_name.format(index=index)
+        if size > TREE_BATCH_BYTES:
+            # Large files are streamed in chunks rather than held in memory
+            _write_file(directory, name, iter_random_bytes(size, source=source), dir_fd)
+            continue
+        if offset + size > len(batch):
+            batch = memoryview(source(min(remaining, TREE_BATCH_BYTES)))
+            offset = 0
+        _write_file(directory, name, (batch[offset:offset + size],), dir_fd)
+        offset += size
+        remaining -= size
+    return sum(sizes)
+
+
+def _fill_directory(plan, directory, dir_fd, level, leaf, counts):
+    """
+    Create the subdirectories and files below one directory, depth first.
+    
+    Each directory is opened once and its fd is used to create the
+    entries inside it, so files are created without path lookups.
+    
+    Args:
+        plan (TreePlan): Tree shape
+        directory (str): Path of the directory
+        dir_fd (int): Open fd of the directory, or None to use full paths
+        level (int): Level of the directory (the root is level 0)
+        leaf (int): Index of the first leaf below the directory
+        counts (list): [files, directories, bytes], updated in place
+    """
+    if level == plan.depth:
+        counts[0] += len(_leaf_files(plan, leaf))
+        counts[2] += _fill_leaf(plan, directory, dir_fd, leaf)
+        return
+    
+    leaves_below = plan.fanout ** (plan.depth - level - 1)
+    for position in range(plan.fanout):
+        name = plan.dir_names[position]
+        child = os.path.join(directory, name)
+        try:
+            if dir_fd is None:
+                os.mkdir(child, 0o755)
+            else:
+                os.mkdir(name, 0o755, dir_fd=dir_fd)
+        except FileExistsError:
+            pass
+        counts[1] += 1
+        
+        child_fd = None if dir_fd is None else os.open(name, TREE_DIR_FLAGS, dir_fd=dir_fd)
+        try:
+            _fill_directory(plan, child, child_fd, level + 1, leaf + position * leaves_below, counts)
+        finally:
+            if child_fd is not None:
+                os.close(child_fd)
+
+
+def _write_subtree(plan, root, level, index):
+    """
+    Build the subtree below one directory of the split level.
+    
+    Args:
+        plan (TreePlan): Tree shape
+        root (str): Root folder of the whole tree
+        level (int): Split level
+        index (int): Index of the directory within its level
+    
+    Returns:
+        tuple: (files, directories, bytes) written below the directory
+    """
+    directory = os.path.join(root, _subtree_path(plan, level, index))
+    counts = [0, 0, 0]
+    dir_fd = os.open(directory, TREE_DIR_FLAGS) if TREE_USE_DIR_FD else None
+    try:
+        _fill_directory(plan, directory, dir_fd, level, index * plan.fanout ** (plan.depth - level), counts)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return tuple(counts)
+
+
+def generate_tree(root, files, depth=2, fanout=10, size="4KB", seed=None, workers=None, extension="bin",
+                  verbose=True):
+    """
+    Generate a directory tree of many small random files.
+    
+    The tree has fanout subdirectories per directory, depth levels deep,
+    and the files are spread evenly over the fanout ** depth leaf
+    directories (depth 0 puts them all in root). Subtrees are built by
+    parallel worker processes, and nothing is printed per file.
+    
+    Args:
+        root (str): Folder to build the tree in; created if missing, and
+            existing files of the same names are overwritten
+        files (int): Total number of files
+        depth (int): Levels of directories below root
+        fanout (int): Subdirectories per directory
+        size: File size, as a size string such as "4KB" or a manifest size
+            specification, e.g. {"min": "100B", "max": "64KB",
+            "distribution": "log-uniform"}
+        seed (int or str, optional): Seed for reproducible sizes and content;
+            the result does not depend on the worker count
+        workers (int, optional): Worker processes (default: CPU count)
+        extension (str): Extension of the file names
+        verbose (bool): Print a throughput summary at the end
+    
+    Returns:
+        dict: Counts of files, directories and bytes, and elapsed time
+    """
+    _check_count(files, "File count", 0)
+    _check_count(depth, "Depth", 0)
+    _check_count(fanout, "Fan-out", 1)
+    workers = workers or os.cpu_count() or 1
+    _check_count(workers, "Worker count", 1)
+    # Fail on a bad size before any directory is created
+    _sample_sizes(size, 1, random.Random(0))
+    
+    file_width = max(TREE_NAME_DIGITS, len(str(max(files - 1, 0))))
+    escaped_extension = extension.replace('{', '{{').replace('}', '}}')
+    file_name = TREE_FILE_NAME.replace('{width}', str(file_width)).replace('{ext}', escaped_extension)
+    dir_names = tuple(TREE_DIR_NAME.format(index=position, width=len(str(fanout - 1))) for position in range(fanout))
+    plan = TreePlan(files, depth, fanout, size, seed, file_name, dir_names)
+    start = time.perf_counter()
+    root = os.path.abspath(root)
+    os.makedirs(root, exist_ok=True)
+    
+    # Directories above the split level are few, so they are made here;
+    # each one below it is a task
+    level = _split_level(depth, fanout, workers)
+    for index in range(fanout ** level):
+        os.makedirs(os.path.join(root, _subtree_path(plan, level, index)), exist_ok=True)
+    directories = sum(fanout ** above for above in range(1, level + 1))
+    write_subtree = partial(_write_subtree, plan, root, level)
+    
+    if workers == 1 or level == 0:
+        results = [write_subtree(index) for index in range(fanout ** level)]
+    else:
+        # Only parallel runs need the pool; importing it is not free
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(write_subtree, range(fanout ** level)))
+    
+    summary = {
+        'files': sum(result[0] for result in results),
+        'directories': directories + sum(result[1] for result in results),
+        'bytes': sum(result[2] for result in results),
+        'elapsed': time.perf_counter() - start,
+    }
+    if verbose:
+        rate = max(summary['elapsed'], 1e-9)
+        print(f"Generated {summary['files']} files in {summary['directories']} folders "
+              f"({summary['bytes'] / (1024 * 1024):.2f} MB) in {root} in {summary['elapsed']:.2f} s: "
+              f"{summary['files'] / rate:.0f} files/s, {summary['bytes'] / (1024 * 1024) / rate:.1f} MB/s")
+    return summary
@@ -1,72 +1,107 @@
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import (iter_random_text, get_random_source, write_stream_auto, check_fill_mode, create_generated_folder,
+                   SVG_SAFE_ALPHABET)
+from file_generators import instrument
 
-from utils import generate_random_text, create_generated_folder
 
+# Basic SVG header with minimal valid structure
+SVG_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 100 100">
+  <rect width="100" height="100" fill="white"/>
+'''
+
+# SVG footer
+SVG_FOOTER = '</svg>'
 
-def generate_svg(file_path, size_kb):
+# Framing of the padding comment. SVG_SAFE_ALPHABET has no '-', so the
+# random body can never close the comment early.
+SVG_COMMENT_OPEN = '  <!-- '
+SVG_COMMENT_CLOSE = ' -->\n'
+
+
+def iter_svg(size_kb, seed=None, compress_ratio=None):
+    """
+    Yield the bytes of an SVG file with valid structure and random data padding.
+    
+    All sizes are computed in encoded bytes up front, then the header, a
+    streamed XML comment and the footer are yielded. The comment sits
+    inside the <svg> element, so the result is always well-formed XML of
+    exactly the target size.
+    
+    Args:
+        size_kb (float): Target file size in kilobytes
+        seed (int or str, optional): Seed for reproducible content
+        compress_ratio (float, optional): Make the file compress about
+            this many times with gzip or zstd instead of about 1.3 times
+    
+    Yields:
+        bytes-like: Chunks of the file, in order
+    """
+    # Calculate target size in bytes
+    target_bytes = int(size_kb * 1024)
+    
+    # Everything is measured as encoded UTF-8 bytes, not characters
+    header = SVG_HEADER.encode('utf-8')
+    footer = SVG_FOOTER.encode('utf-8')
+    comment_open = SVG_COMMENT_OPEN.encode('utf-8')
+    comment_close = SVG_COMMENT_CLOSE.encode('utf-8')
+    remaining_bytes = target_bytes - len(header) - len(footer)
+    
+    if remaining_bytes < 0:
+        print(f"Warning: Requested size ({size_kb} KB) is smaller than minimum SVG structure size.")
+        remaining_bytes = 0
+    
+    yield header
+    comment_bytes = remaining_bytes - len(comment_open) - len(comment_close)
+    if comment_bytes >= 0:
+        # Stream the random comment body chunk by chunk
+        yield comment_open
+        body = iter_random_text(comment_bytes, SVG_SAFE_ALPHABET, source=get_random_source(seed),
+                                compress_ratio=compress_ratio)
+        yield from instrument.timed_chunks(body)
+        yield comment_close
+    else:
+        # Too little room for a comment: whitespace is valid here too
+        yield b' ' * remaining_bytes
+    yield footer
+
+
+def generate_svg(file_path, size_kb, seed=None, compress_ratio=None, fill='random', verbose=True):
     """
     Generate an SVG file with valid structure and random data padding.
     
+    The file is written in a single pass from iter_svg.
+    
     Args:
         file_path (str): Path where the file will be saved
         size_kb (int): Target file size in kilobytes
+        seed (int or str, optional): Seed for reproducible content
+        compress_ratio (float, optional): Make the file compress about
+            this many times with gzip or zstd
+        fill (str): Only 'random' is supported; zero bytes are not allowed
+            anywhere in an XML document
+        verbose (bool): Print a line when the file is generated or fails
+    
+    Returns:
+        str: Full path of the generated file
     """
+    if fill != 'random':
+        check_fill_mode(fill)
+        raise ValueError(f"SVG files do not support fill='{fill}', only 'random'")
+    
     # Create generated folder and get full path
     generated_folder = create_generated_folder()
     full_path = os.path.join(generated_folder, file_path)
     
     try:
-        # Basic SVG header with minimal valid structure
-        svg_header = '''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 100 100">
-  <rect width="100" height="100" fill="white"/>
-'''
-        
-        # SVG footer
-        svg_footer = '</svg>'
-        
-        # Calculate target size in bytes
-        target_bytes = size_kb * 1024
-        
-        # Calculate how much random text we need
-        header_size = len(svg_header.encode('utf-8'))
-        footer_size = len(svg_footer.encode('utf-8'))
-        remaining_bytes = target_bytes - header_size - footer_size
-        
-        if remaining_bytes < 0:
-            print(f"Warning: Requested size ({size_kb} KB) is smaller than minimum SVG structure size.")
-            # Just save the minimal SVG
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(svg_header + svg_footer)
-        else:
-            # Generate safe random text (only alphanumeric and basic punctuation)
-            import random
-            import string
-            safe_chars = string.ascii_letters + string.digits + ' .,!?\n '
-            
-            # Calculate how much text we need (rough estimate)
-            # Each character is roughly 1 byte, so we need about remaining_bytes characters
-            text_length = max(remaining_bytes - 100, 100)  # Leave some margin
-            comment_text = ''.join(random.choice(safe_chars) for _ in range(text_length))
-            
-            # Create the SVG with a comment
-            svg_content = svg_header + f"  <!-- {comment_text} -->\n" + svg_footer
-            
-            # Write to file
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(svg_content)
-            
-            # Check actual size and add more padding if needed
-            actual_size = os.path.getsize(full_path)
-            if actual_size < target_bytes * 0.9:  # If we're less than 90% of target
-                with open(full_path, 'a', encoding='utf-8') as f:
-                    extra_padding = ''.join(random.choice(safe_chars) for _ in range(target_bytes - actual_size))
-                    f.write(f"  <!-- {extra_padding} -->")
+        with open(full_path, 'wb') as f:
+            write_stream_auto(instrument.timed_file(f), iter_svg(size_kb, seed, compress_ratio), int(size_kb * 1024))
         
-        print(f"Successfully generated SVG file: {full_path} ({size_kb} KB)")
+        if verbose:
+            print(f"Successfully generated SVG file: {full_path} ({size_kb} KB)")
+        return full_path
         
     except Exception as e:
-        print(f"Error generating SVG file: {e}")
-        raise
\ No newline at end of file
+        if verbose:
+            print(f"Error generating SVG file: {e}")
+        raise
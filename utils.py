@@ -1,8 +1,56 @@
 import os
-import random
+import re
 import string
 
 
+# Size of the chunks produced by the streaming byte source and of the
+# reusable buffer used by the streaming sink (1 MB).
+CHUNK_SIZE = 1024 * 1024
+
+# Buffers in flight in the pipelined writer, and the smallest stream worth
+# starting a writer thread for
+PIPELINE_DEPTH = 4
+PIPELINE_MIN_BYTES = 8 * CHUNK_SIZE
+
+# Character sets for random text. All characters are ASCII, so one
+# character always encodes to exactly one byte.
+TEXT_ALPHABET = string.ascii_letters + string.digits + string.punctuation + ' \t\n'
+SVG_SAFE_ALPHABET = string.ascii_letters + string.digits + ' .,!?\n '
+
+# Kilobytes per size unit accepted by parse_size
+SIZE_UNITS_KB = {'M': 1024, 'G': 1024 ** 2, 'T': 1024 ** 3}
+
+# How generators produce the payload: random bytes, a sparse hole
+# (ftruncate), or allocated zero blocks (posix_fallocate)
+FILL_MODES = ('random', 'sparse', 'allocate')
+
+# Byte translation tables, built lazily per alphabet
+_translation_tables = {}
+
+# Extra bytes drawn per text request, so the bytes deleted to keep the
+# characters uniform rarely need a second draw
+TEXT_DRAW_MARGIN = 64
+
+# Domain prefix of the seeded byte source key, the request size below
+# which it serves from a pooled block, and the size of that block
+SEEDED_SOURCE_PREFIX = b"filegenerator-seeded-source-v1:"
+SEEDED_SMALL_REQUEST = 4096
+SEEDED_POOL_SIZE = 64 * 1024
+
+# Compressible data repeats this period: a random segment followed by
+# filler. It is well inside deflate's 32 KB window (and zstd's and LZMA's
+# larger ones), so every filler run costs one back-reference.
+COMPRESSIBLE_PERIOD = 4096
+
+# Cost model of compressible data in compressed bytes, fitted to zlib
+# level 6 (the gzip default): per filler byte, per bit of a random
+# symbol's entropy, and per period for switching between random data and
+# filler, as (random segment length, cost) points that are interpolated
+REPEAT_BYTE_COST = 0.001
+RANDOM_BIT_COST = 1.003 / 8
+SEGMENT_SWITCH_COSTS = ((1, 2.9), (4, 3.6), (16, 5.6), (64, 9.2), (256, 13.0), (512, 14.3))
+
+
 def create_generated_folder():
     """Create the 'generated' folder if it doesn't exist"""
     generated_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated")
@@ -10,6 +58,56 @@ def create_generated_folder():
     return generated_folder
 
 
+def get_cache_folder(name):
+    """
+    Get a per-user cache folder, creating it if needed.
+    
+    The location is $FILEGEN_CACHE_DIR if set, otherwise
+    $XDG_CACHE_HOME/filegenerator (~/.cache/filegenerator by default).
+    
+    Args:
+        name (str): Sub-folder for a specific cache
+        
+    Returns:
+        str: Absolute path of the cache folder
+    """
+    root = os.environ.get("FILEGEN_CACHE_DIR")
+    if not root:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(xdg_cache, "filegenerator")
+    cache_folder = os.path.join(os.path.abspath(root), name)
+    os.makedirs(cache_folder, exist_ok=True)
+    return cache_folder
+
+
+def get_package_version(import_name, distribution):
+    """
+    Get the installed version of a package without importing it.
+    
+    The version is read from the name of the .dist-info folder next to the
+    package. importlib.metadata gives the same answer, but importing it
+    takes longer than the rest of a small run, so it is the fallback.
+    
+    Args:
+        import_name (str): Top-level module, e.g. 'PIL'
+        distribution (str): Distribution name, e.g. 'Pillow'
+    
+    Returns:
+        str: Version string
+    """
+    import importlib.util
+    spec = importlib.util.find_spec(import_name)
+    if spec is not None and spec.origin:
+        site_dir = os.path.dirname(os.path.dirname(spec.origin))
+        # Folder names use the normalized distribution name, e.g. python_docx-0.8.11
+        prefix = re.sub(r'[-_.]+', '_', distribution).lower() + '-'
+        for name in os.listdir(site_dir):
+            if name.lower().startswith(prefix) and name.endswith('.dist-info'):
+                return name[len(prefix):-len('.dist-info')]
+    from importlib import metadata
+    return metadata.version(distribution)
+
+
 def prompt_for_filename_and_size(default_extension=None):
     """
     Prompt the user for a filename and target size in kilobytes.
@@ -46,12 +144,94 @@ def prompt_for_filename_and_size(default_extension=None):
     return filename, size_kb
 
 
-def generate_random_bytes(size_kb):
+def parse_size(size_text):
+    """
+    Parse a human-readable size such as "5MB", "1.5 GB" or "500kb".
+    
+    A bare number is taken as kilobytes. Units are binary (1 KB = 1024 bytes).
+    
+    Args:
+        size_text (str): Size with an optional B, KB, MB, GB or TB unit
+        
+    Returns:
+        float: Size in kilobytes
+        
+    Raises:
+        ValueError: If the text is not a valid positive size
+    """
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([kmgt]?b?)\s*', size_text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size '{size_text}', expected e.g. 512KB, 5MB or 1.5GB")
+    
+    value = float(match.group(1))
+    unit = match.group(2).upper()
+    if unit in ('', 'K', 'KB'):
+        size_kb = value
+    elif unit == 'B':
+        size_kb = value / 1024
+    else:
+        size_kb = value * SIZE_UNITS_KB[unit[0]]
+    
+    if size_kb <= 0:
+        raise ValueError("Size must be a positive number")
+    return size_kb
+
+
+def get_random_source(seed=None):
+    """
+    Get a function that returns n random bytes per call.
+    
+    Without a seed this is os.urandom. With a seed it is a userspace
+    SHAKE-128 generator in counter mode: each block hashes the seed key
+    and a block counter, so the same seed and the same sequence of
+    requests always give identical bytes. It matches or beats both
+    os.urandom and random.Random.randbytes at every request size the
+    generators use (see benchmarks/bench_random_source.py).
+    
+    Args:
+        seed (int or str, optional): Seed for reproducible output
+    
+    Returns:
+        callable: Function taking a byte count and returning bytes
+    """
+    if seed is None:
+        return os.urandom
+    
+    import hashlib
+    keyed = hashlib.shake_128(SEEDED_SOURCE_PREFIX + str(seed).encode('utf-8'))
+    counter = 0
+    pool = b''
+    pool_offset = 0
+    
+    def block(n):
+        nonlocal counter
+        state = keyed.copy()
+        state.update(counter.to_bytes(8, 'little'))
+        counter += 1
+        return state.digest(n)
+    
+    def seeded_bytes(n):
+        nonlocal pool, pool_offset
+        if n >= SEEDED_SMALL_REQUEST:
+            return block(n)
+        # Small requests are sliced from a pooled block, which saves the
+        # per-call hashing setup
+        if pool_offset + n > len(pool):
+            pool = block(SEEDED_POOL_SIZE)
+            pool_offset = 0
+        pool_offset += n
+        return pool[pool_offset - n:pool_offset]
+    
+    return seeded_bytes
+
+
+def generate_random_bytes(size_kb, source=os.urandom):
     """
     Generate a block of random bytes of the specified size.
     
     Args:
         size_kb (int): Size in kilobytes
+        source (callable): Byte source, see get_random_source
         
     Returns:
         bytes: Random bytes of the specified size
@@ -60,21 +240,446 @@ def generate_random_bytes(size_kb):
     size_bytes = size_kb * 1024
     
     # Generate random bytes
-    random_data = os.urandom(size_bytes)
+    random_data = source(size_bytes)
     
     return random_data
 
 
-def generate_random_text(length):
+def iter_random_bytes(size_bytes, chunk_size=CHUNK_SIZE, source=os.urandom, compress_ratio=None):
+    """
+    Yield random bytes in chunks until the requested size is reached.
+    
+    Only one chunk is alive at a time, so memory use does not depend
+    on the total size.
+    
+    Args:
+        size_bytes (int): Total number of bytes to produce
+        chunk_size (int): Maximum size of each yielded chunk
+        source (callable): Byte source, see get_random_source
+        compress_ratio (float, optional): Make the data compress about
+            this many times with gzip instead of not at all, see
+            _iter_compressible_bytes
+        
+    Yields:
+        bytes-like: Chunks of random bytes
+    """
+    if compress_ratio is not None:
+        yield from _iter_compressible_bytes(size_bytes, compress_ratio, chunk_size, source)
+        return
+    remaining = size_bytes
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        yield source(n)
+        remaining -= n
+
+
+def _period_cost(random_len, random_cost):
+    """Estimate the compressed size of one period with a random segment of random_len bytes"""
+    if random_len == 0:
+        return COMPRESSIBLE_PERIOD * REPEAT_BYTE_COST
+    switch_cost = SEGMENT_SWITCH_COSTS[-1][1]
+    for (low_len, low_cost), (high_len, high_cost) in zip(SEGMENT_SWITCH_COSTS, SEGMENT_SWITCH_COSTS[1:]):
+        if random_len < high_len:
+            switch_cost = low_cost + (high_cost - low_cost) * (random_len - low_len) / (high_len - low_len)
+            break
+    return random_len * random_cost + (COMPRESSIBLE_PERIOD - random_len) * REPEAT_BYTE_COST + switch_cost
+
+
+def _random_segment_length(compress_ratio, entropy_bits=8.0):
+    """
+    Get the random bytes per COMPRESSIBLE_PERIOD that give a compression ratio.
+    
+    Args:
+        compress_ratio (float): Original size divided by compressed size
+        entropy_bits (float): Entropy of one random symbol in bits
+    
+    Returns:
+        int: Length of the random segment, from 0 to COMPRESSIBLE_PERIOD
+    """
+    try:
+        compress_ratio = float(compress_ratio)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid compression ratio '{compress_ratio}'")
+    if not compress_ratio >= 1:
+        raise ValueError(f"Compression ratio must be at least 1, got {compress_ratio}")
+    random_cost = entropy_bits * RANDOM_BIT_COST
+    target_cost = COMPRESSIBLE_PERIOD / compress_ratio
+    
+    # The cost grows with the segment length, so bisect for the first
+    # length that reaches the target, then take the closer neighbour
+    low, high = 0, COMPRESSIBLE_PERIOD
+    while low < high:
+        middle = (low + high) // 2
+        if _period_cost(middle, random_cost) < target_cost:
+            low = middle + 1
+        else:
+            high = middle
+    if low > 0 and (target_cost - _period_cost(low - 1, random_cost)
+                    < _period_cost(low, random_cost) - target_cost):
+        low -= 1
+    return low
+
+
+def _iter_compressible_bytes(size_bytes, compress_ratio, chunk_size=CHUNK_SIZE, source=os.urandom,
+                             entropy_bits=8.0):
+    """
+    Yield data that compresses by about the given ratio.
+    
+    Every COMPRESSIBLE_PERIOD bytes start with a random segment and end
+    with zeros. The random bytes of a chunk are drawn in one call and
+    copied into a zeroed buffer, so this runs at the speed of the byte
+    source. The segment length follows a cost model of zlib; gzip, zstd
+    and LZMA land within a few percent of the ratio. Ratios beyond what
+    the data allows are clamped: all zeros compress about 1000 times,
+    and ratios close to 1 give plain random data.
+    
+    Args:
+        size_bytes (int): Total number of bytes to produce
+        compress_ratio (float): Original size divided by compressed size
+        chunk_size (int): Maximum size of each yielded chunk
+        source (callable): Byte source, see get_random_source
+        entropy_bits (float): Entropy of one random symbol once the caller
+            has mapped the bytes, e.g. onto a text alphabet
+    
+    Yields:
+        bytes-like: Chunks of data
+    """
+    random_len = _random_segment_length(compress_ratio, entropy_bits)
+    if random_len == COMPRESSIBLE_PERIOD:
+        yield from iter_random_bytes(size_bytes, chunk_size, source)
+        return
+    
+    # Whole periods per chunk keep the pattern aligned across chunks
+    if chunk_size >= COMPRESSIBLE_PERIOD:
+        chunk_size -= chunk_size % COMPRESSIBLE_PERIOD
+    remaining = size_bytes
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        chunk = bytearray(n)
+        full, tail = divmod(n, COMPRESSIBLE_PERIOD)
+        data = memoryview(source(full * random_len + min(random_len, tail)))
+        offset = 0
+        for start in range(0, n, COMPRESSIBLE_PERIOD):
+            take = min(random_len, n - start)
+            chunk[start:start + take] = data[offset:offset + take]
+            offset += take
+        yield chunk
+        remaining -= n
+
+
+def write_stream(f, chunks, buffer_size=CHUNK_SIZE):
+    """
+    Write an iterable of byte chunks to a binary file object.
+    
+    Small chunks are collected in a fixed-size buffer that is reused for the
+    whole stream; chunks at least as large as the buffer are written straight
+    through. The buffer is only allocated once a second small chunk arrives,
+    so tiny single-chunk streams stay cheap. Peak memory is bounded by the
+    buffer size plus the largest chunk, regardless of the total amount of data.
+    
+    Args:
+        f: Writable binary file object
+        chunks (iterable): Iterable of bytes-like objects
+        buffer_size (int): Size of the reusable write buffer
+        
+    Returns:
+        int: Total number of bytes written
+    """
+    view = None
+    pending = None
+    filled = 0
+    written = 0
+    
+    for chunk in chunks:
+        n = len(chunk)
+        if n == 0:
+            continue
+        
+        # Large chunk and nothing buffered: skip the copy
+        if filled == 0 and pending is None and n >= buffer_size:
+            f.write(chunk)
+            written += n
+            continue
+        
+        # Hold on to the first small chunk; a stream that is a single
+        # small chunk never needs the buffer
+        if view is None:
+            if pending is None:
+                pending = chunk
+                continue
+            view = memoryview(bytearray(buffer_size))
+            pieces = (pending, chunk)
+            pending = None
+        else:
+            pieces = (chunk,)
+        
+        for piece in pieces:
+            piece_view = memoryview(piece).cast('B')
+            size = len(piece_view)
+            offset = 0
+            while offset < size:
+                take = min(buffer_size - filled, size - offset)
+                view[filled:filled + take] = piece_view[offset:offset + take]
+                filled += take
+                offset += take
+                if filled == buffer_size:
+                    f.write(view)
+                    written += filled
+                    filled = 0
+    
+    if pending is not None:
+        f.write(pending)
+        written += len(pending)
+    if filled:
+        f.write(view[:filled])
+        written += filled
+    
+    return written
+
+
+def write_stream_pipelined(f, chunks, buffer_size=CHUNK_SIZE, depth=PIPELINE_DEPTH):
+    """
+    Write an iterable of byte chunks through a background writer thread.
+    
+    The calling thread produces data into a small pool of reusable buffers
+    while the writer thread writes full ones to the file, so generating the
+    next buffer overlaps with writing the previous one. os.urandom and file
+    writes both release the GIL, so the overlap is real. Memory is bounded
+    by depth * buffer_size.
+    
+    Args:
+        f: Writable binary file object
+        chunks (iterable): Iterable of bytes-like objects
+        buffer_size (int): Size of each pooled buffer
+        depth (int): Number of pooled buffers
+        
+    Returns:
+        int: Total number of bytes written
+    """
+    import queue
+    import threading
+    
+    free_buffers = queue.Queue()
+    full_buffers = queue.Queue()
+    for _ in range(depth):
+        free_buffers.put(bytearray(buffer_size))
+    errors = []
+    
+    def writer():
+        while True:
+            item = full_buffers.get()
+            if item is None:
+                return
+            buffer, length = item
+            try:
+                # After a failure keep draining so the producer never blocks
+                if not errors:
+                    with memoryview(buffer) as view:
+                        f.write(view[:length])
+            except BaseException as e:
+                errors.append(e)
+            free_buffers.put(buffer)
+    
+    thread = threading.Thread(target=writer, name="write_stream_pipelined", daemon=True)
+    thread.start()
+    
+    written = 0
+    buffer = free_buffers.get()
+    filled = 0
+    try:
+        for chunk in chunks:
+            if errors:
+                break
+            with memoryview(chunk) as raw_view, raw_view.cast('B') as chunk_view:
+                size = len(chunk_view)
+                offset = 0
+                while offset < size:
+                    take = min(buffer_size - filled, size - offset)
+                    buffer[filled:filled + take] = chunk_view[offset:offset + take]
+                    filled += take
+                    offset += take
+                    if filled == buffer_size:
+                        full_buffers.put((buffer, filled))
+                        written += filled
+                        buffer = free_buffers.get()
+                        filled = 0
+        
+        if filled and not errors:
+            full_buffers.put((buffer, filled))
+            written += filled
+    finally:
+        full_buffers.put(None)
+        thread.join()
+    
+    if errors:
+        raise errors[0]
+    return written
+
+
+def write_stream_auto(f, chunks, size_hint):
+    """
+    Write chunks with the pipelined writer for large streams on multi-core
+    machines, inline otherwise.
+    
+    Args:
+        f: Writable binary file object
+        chunks (iterable): Iterable of bytes-like objects
+        size_hint (int): Expected total size in bytes
+        
+    Returns:
+        int: Total number of bytes written
+    """
+    # On a single CPU the producer and the writer would only take turns
+    if size_hint >= PIPELINE_MIN_BYTES and (os.cpu_count() or 1) > 1:
+        return write_stream_pipelined(f, chunks)
+    return write_stream(f, chunks)
+
+
+def check_fill_mode(fill, compress_ratio=None):
+    """Raise ValueError unless fill is one of FILL_MODES, and random if a compression ratio is asked for"""
+    if fill not in FILL_MODES:
+        raise ValueError(f"Unknown fill mode '{fill}', expected one of {', '.join(FILL_MODES)}")
+    if compress_ratio is not None and fill != 'random':
+        raise ValueError(f"A compression ratio needs fill='random', not '{fill}'")
+
+
+def extend_file(f, size_bytes, fill='sparse'):
+    """
+    Extend a file by size_bytes of zeros from the current position without
+    writing them.
+    
+    'sparse' moves the end of the file with ftruncate, so the new range is a
+    hole that takes no disk space. 'allocate' reserves real blocks with
+    posix_fallocate, which fails early if the disk is too small; where
+    posix_fallocate is unavailable the range is left sparse. Neither mode
+    passes the zeros through Python.
+    
+    Args:
+        f: Writable binary file object opened for writing from the start
+        size_bytes (int): Number of zero bytes to add
+        fill (str): 'sparse' or 'allocate'
+    """
+    f.flush()
+    fd = f.fileno()
+    offset = f.tell()
+    end = offset + size_bytes
+    
+    if fill == 'allocate' and size_bytes > 0 and hasattr(os, 'posix_fallocate'):
+        os.posix_fallocate(fd, offset, size_bytes)
+    if os.fstat(fd).st_size < end:
+        os.ftruncate(fd, end)
+    f.seek(end)
+
+
+def get_translation_table(alphabet):
+    """
+    Get a table that maps byte values uniformly onto the alphabet.
+    
+    With n characters only the first 256 - 256 % n byte values are mapped,
+    256 // n of them onto each character; the others are rejected and
+    redrawn by _text_source.
+    
+    Args:
+        alphabet (str): ASCII characters the table maps onto
+        
+    Returns:
+        tuple: (table, rejected) for bytes.translate, where rejected holds
+            the byte values to delete and redraw
+    """
+    tables = _translation_tables.get(alphabet)
+    if tables is None:
+        if not alphabet or not alphabet.isascii():
+            raise ValueError("Alphabet must be a non-empty ASCII string")
+        encoded = alphabet.encode('ascii')
+        usable = 256 - 256 % len(encoded)
+        table = bytes(encoded[i % len(encoded)] for i in range(256))
+        tables = (table, bytes(range(usable, 256)))
+        _translation_tables[alphabet] = tables
+    return tables
+
+
+def _text_source(alphabet, source):
+    """
+    Get a function that returns n random characters of the alphabet per call.
+    
+    Bytes are mapped onto the alphabet in bulk with a translation table.
+    Byte values past the last whole multiple of the alphabet size are
+    deleted and redrawn, so every character is equally likely.
+    
+    Args:
+        alphabet (str): ASCII characters to draw from
+        source (callable): Byte source, see get_random_source
+    
+    Returns:
+        callable: Function taking a character count and returning ASCII bytes-like data
+    """
+    table, rejected = get_translation_table(alphabet)
+    if not rejected:
+        return lambda n: source(n).translate(table)
+    accepted = (256 - len(rejected)) / 256
+    
+    def text_bytes(n):
+        # Draw enough that one call usually covers the deleted bytes
+        text = source(int(n / accepted) + TEXT_DRAW_MARGIN).translate(table, rejected)
+        while len(text) < n:
+            text += source(int((n - len(text)) / accepted) + TEXT_DRAW_MARGIN).translate(table, rejected)
+        return memoryview(text)[:n] if len(text) > n else text
+    
+    return text_bytes
+
+
+def _entropy_bits(alphabet):
+    """Get the entropy in bits of one character drawn uniformly from the alphabet"""
+    import math
+    counts = {}
+    for value in alphabet:
+        counts[value] = counts.get(value, 0) + 1
+    return -sum(count / len(alphabet) * math.log2(count / len(alphabet)) for count in counts.values())
+
+
+def iter_random_text(size_bytes, alphabet=TEXT_ALPHABET, chunk_size=CHUNK_SIZE, source=os.urandom,
+                     compress_ratio=None):
+    """
+    Yield random ASCII text in chunks, drawn from the given alphabet.
+    
+    Random bytes are mapped onto the alphabet in bulk with a translation
+    table instead of picking one character at a time.
+    
+    Args:
+        size_bytes (int): Total number of bytes (= characters) to produce
+        alphabet (str): ASCII characters to draw from
+        chunk_size (int): Maximum size of each yielded chunk
+        source (callable): Byte source, see get_random_source
+        compress_ratio (float, optional): Make the text compress about
+            this many times with gzip; the filler between random segments
+            is a run of the alphabet's first character
+        
+    Yields:
+        bytes-like: Chunks of ASCII-encoded random text
+    """
+    text_source = _text_source(alphabet, source)
+    entropy_bits = _entropy_bits(alphabet)
+    # Ratios the plain text already reaches need no filler at all
+    if compress_ratio is None or _random_segment_length(compress_ratio, entropy_bits) == COMPRESSIBLE_PERIOD:
+        yield from iter_random_bytes(size_bytes, chunk_size, text_source)
+        return
+    # The zeros between random segments become the alphabet's first character
+    filler = bytes.maketrans(b'\0', alphabet[:1].encode('ascii'))
+    for chunk in _iter_compressible_bytes(size_bytes, compress_ratio, chunk_size, text_source, entropy_bits):
+        yield chunk.translate(filler)
+
+
+def generate_random_text(length, alphabet=TEXT_ALPHABET, source=os.urandom):
     """
     Generate a random text string of specified length.
     
     Args:
         length (int): Length of the text to generate
+        alphabet (str): ASCII characters to draw from (letters, digits,
+            punctuation and whitespace by default)
+        source (callable): Byte source, see get_random_source
         
     Returns:
         str: Random text string
     """
-    # Generate random text using letters, digits, and punctuation
-    chars = string.ascii_letters + string.digits + string.punctuation + ' \t\n'
-    return ''.join(random.choice(chars) for _ in range(length))
\ No newline at end of file
+    return str(_text_source(alphabet, source)(length), 'ascii')